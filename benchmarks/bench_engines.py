@@ -0,0 +1,122 @@
+"""
+Compare the threaded and asyncio CommandServer engines.
+
+Reports handshake connections/sec and healthCheck latency (p50/p99) while a
+number of idle clients stay connected. Run from the repository root:
+
+    python benchmarks/bench_engines.py --idle 200 --requests 2000
+"""
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from zeus_server_app.hwid_manager import HWIDManager
+from zeus_server_app.config_manager import ConfigManager
+from zeus_server_app.server import CommandServer
+
+BENCH_HWID = "bench-hwid"
+
+
+def free_port():
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def connect(port):
+    """Open a client connection and complete the HWID handshake."""
+    conn = socket.create_connection(("127.0.0.1", port))
+    conn.sendall(BENCH_HWID.encode())
+    reply = conn.recv(1024).decode()
+    if reply != "HWID authorized.":
+        raise RuntimeError(f"Handshake failed: {reply}")
+    return conn
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1)
+    return ordered[max(index, 0)]
+
+
+def bench_connections(port, clients, per_client):
+    """Measure handshakes per second from `clients` concurrent connectors."""
+    def worker():
+        for _ in range(per_client):
+            connect(port).close()
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return clients * per_client / elapsed
+
+
+def bench_health_check(port, idle, requests):
+    """Measure healthCheck round-trip latency while `idle` clients stay connected."""
+    idle_conns = [connect(port) for _ in range(idle)]
+    try:
+        conn = connect(port)
+        samples = []
+        with conn:
+            for _ in range(requests):
+                start = time.perf_counter()
+                conn.sendall(b"healthCheck")
+                conn.recv(1024)
+                samples.append(time.perf_counter() - start)
+        return samples
+    finally:
+        for c in idle_conns:
+            c.close()
+
+
+def run_engine(engine, db_path, args):
+    """Start a server with `engine`, run both measurements and shut it down."""
+    hwid_manager = HWIDManager(db_path)
+    config_manager = ConfigManager(db_path)
+    port = free_port()
+    server = CommandServer(hwid_manager, config_manager, host="127.0.0.1", port=port, engine=engine,
+                           gamepad_backend="null")
+    threading.Thread(target=server.start, daemon=True).start()
+    time.sleep(0.2)
+    try:
+        rate = bench_connections(port, args.clients, args.per_client)
+        samples = bench_health_check(port, args.idle, args.requests)
+    finally:
+        server.shutdown()
+        hwid_manager.close()
+        config_manager.close()
+
+    print(f"{engine:>8}: {rate:8.0f} conn/s  "
+          f"healthCheck p50={percentile(samples, 50) * 1e3:.3f} ms  "
+          f"p99={percentile(samples, 99) * 1e3:.3f} ms  (idle clients: {args.idle})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engines", nargs="+", default=list(CommandServer.ENGINES))
+    parser.add_argument("--clients", type=int, default=16, help="concurrent connectors")
+    parser.add_argument("--per-client", type=int, default=50, help="handshakes per connector")
+    parser.add_argument("--idle", type=int, default=100, help="idle connections held open")
+    parser.add_argument("--requests", type=int, default=1000, help="healthCheck round trips")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        seed = HWIDManager(db_path)
+        seed.add_hwid(BENCH_HWID)
+        seed.close()
+        for engine in args.engines:
+            run_engine(engine, db_path, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure HWID handshake lookup throughput with a large whitelist.
+
+Compares the in-memory snapshot used by HWIDManager.is_hwid_whitelisted with
+a direct SQLite SELECT per lookup on one shared connection (the previous
+behaviour). Run from the repository root:
+
+    python benchmarks/bench_hwid_cache.py --hwids 10000 --threads 8
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from zeus_server_app.hwid_manager import HWIDManager
+
+
+def run_threads(lookup, hwids, threads, lookups):
+    """Run `lookups` lookups on each of `threads` threads; return lookups/sec."""
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(lookups):
+            # Mix of whitelisted and unknown HWIDs, like real handshakes
+            if rng.random() < 0.9:
+                lookup(rng.choice(hwids))
+            else:
+                lookup(f"unknown-{rng.random()}")
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * lookups / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hwids", type=int, default=10000, help="whitelisted HWIDs")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent handshake threads")
+    parser.add_argument("--lookups", type=int, default=20000, help="lookups per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        hwids = [f"hwid-{i:06d}" for i in range(args.hwids)]
+
+        manager = HWIDManager(db_path)
+        manager.add_hwids(hwids)
+
+        # Baseline: one SELECT per lookup on a shared connection, serialized by a lock
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        lock = threading.Lock()
+
+        def sqlite_lookup(hwid):
+            with lock:
+                cursor = conn.execute('SELECT 1 FROM hwids WHERE hwid = ?', (hwid,))
+                return cursor.fetchone() is not None
+
+        sqlite_rate = run_threads(sqlite_lookup, hwids, args.threads, args.lookups)
+        cached_rate = run_threads(manager.is_hwid_whitelisted, hwids, args.threads, args.lookups)
+        conn.close()
+        manager.close()
+
+    print(f"whitelist size: {args.hwids}, threads: {args.threads}")
+    print(f"  sqlite select : {sqlite_rate:12.0f} lookups/s")
+    print(f"  memory cache  : {cached_rate:12.0f} lookups/s ({cached_rate / sqlite_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
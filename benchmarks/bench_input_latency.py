@@ -0,0 +1,79 @@
+"""
+Measure command-to-report latency through the full server path.
+
+Starts CommandServer with the in-memory recording gamepad backend, sends
+press commands over TCP and matches each one to the first driver report
+that shows the button pressed. Runs headless on any OS:
+
+    python benchmarks/bench_input_latency.py --engine asyncio --presses 200
+"""
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from zeus_server_app.hwid_manager import HWIDManager
+from zeus_server_app.config_manager import ConfigManager
+from zeus_server_app.gamepad_backend import RecordingBackend, XUSB_BUTTON
+from zeus_server_app.server import CommandServer
+
+BENCH_HWID = "bench-hwid"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1)
+    return ordered[max(index, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engine", choices=CommandServer.ENGINES, default="threaded")
+    parser.add_argument("--presses", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        hwid_manager = HWIDManager(db_path)
+        hwid_manager.add_hwid(BENCH_HWID)
+        config_manager = ConfigManager(db_path)
+        backend = RecordingBackend()
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        server = CommandServer(hwid_manager, config_manager, host="127.0.0.1", port=port,
+                               engine=args.engine, gamepad_backend=backend)
+        server.gamepad_controller.stop_anti_afk()
+        threading.Thread(target=server.start, daemon=True).start()
+        time.sleep(0.2)
+
+        pad = backend.pads[0]
+        button = int(XUSB_BUTTON.XUSB_GAMEPAD_A)
+        latencies = []
+        try:
+            with socket.create_connection(("127.0.0.1", port)) as conn:
+                conn.sendall(BENCH_HWID.encode())
+                conn.recv(1024)
+                for _ in range(args.presses):
+                    sent = time.perf_counter()
+                    conn.sendall(b"press_a")
+                    conn.recv(1024)
+                    pressed = next(r.timestamp for r in pad.snapshot()
+                                   if r.timestamp >= sent and r.buttons & button)
+                    latencies.append(pressed - sent)
+        finally:
+            server.shutdown()
+            hwid_manager.close()
+
+    print(f"{args.engine}: {len(latencies)} presses, command-to-report latency "
+          f"p50={percentile(latencies, 50) * 1e3:.3f} ms  "
+          f"p99={percentile(latencies, 99) * 1e3:.3f} ms  "
+          f"max={max(latencies) * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
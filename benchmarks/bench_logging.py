@@ -0,0 +1,60 @@
+"""
+Compare logging throughput: synchronous file writes on the caller's thread
+versus the background QueueHandler pipeline, in text and JSON-lines format.
+
+    python benchmarks/bench_logging.py --threads 8 --records 20000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from zeus_server_app.log_pipeline import LogPipeline, JsonFormatter, TEXT_FORMAT
+
+
+def run(label, pipeline, threads, records):
+    """Log `records` INFO lines from each of `threads` threads; report caller-side rate."""
+    pipeline.install(logging.INFO)
+
+    def worker(n):
+        for i in range(records):
+            logging.info(f"Received command: press_a (client {n}, seq {i})")
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    caller_elapsed = time.perf_counter() - start
+    pipeline.stop()
+    total_elapsed = time.perf_counter() - start
+
+    total = threads * records
+    print(f"{label:<14} caller {total / caller_elapsed:10.0f} rec/s   "
+          f"drained {total / total_elapsed:10.0f} rec/s   dropped {pipeline.dropped}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--records", type=int, default=20000, help="records per thread")
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, use_queue, formatter in (
+            ("sync text", False, logging.Formatter(TEXT_FORMAT)),
+            ("queue text", True, logging.Formatter(TEXT_FORMAT)),
+            ("queue json", True, JsonFormatter()),
+        ):
+            handler = logging.FileHandler(os.path.join(tmp, label.replace(" ", "_") + ".log"))
+            handler.setFormatter(formatter)
+            pipeline = LogPipeline(handler, use_queue=use_queue, queue_size=args.queue_size)
+            run(label, pipeline, args.threads, args.records)
+
+
+if __name__ == "__main__":
+    main()
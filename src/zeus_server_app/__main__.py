@@ -1,41 +1,189 @@
+import argparse
+import configparser
+import logging
+import os
 import threading
 import signal
 import sys
 from zeus_server_app.hwid_manager import HWIDManager
 from zeus_server_app.config_manager import ConfigManager
-from zeus_server_app.utils import setup_logging, check_vigem_bus_driver, display_menu
-from zeus_server_app.chrome_manager import ChromeManager
+from zeus_server_app.log_pipeline import setup_logging
 
+# Settings read from the command line or the [server] section of --config, with their types
+SETTINGS = {
+    "host": str,
+    "port": int,
+    "db_path": str,
+    "log_file": str,
+    "engine": str,
+    "max_workers": int,
+    "gamepad_count": int,
+    "metrics_port": int,
+    "drain_timeout": float,
+}
+
+# Used when neither the command line nor the config file sets them
+DEFAULTS = {"host": "0.0.0.0", "port": 9999, "db_path": "hwids.db", "log_file": "server.log"}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="zeus_server_app", description="Zeus gamepad command server.")
+    parser.add_argument("--config", metavar="FILE", help="INI file with a [server] section of the settings below")
+    parser.add_argument("--host", "--bind", dest="host", help="address to listen on (default 0.0.0.0)")
+    parser.add_argument("--port", type=int, help="TCP port for clients (default 9999)")
+    parser.add_argument("--db", dest="db_path", help="SQLite database with HWIDs and config (default hwids.db)")
+    parser.add_argument("--log-file", help="log file path (default server.log)")
+    parser.add_argument("--engine", choices=("threaded", "asyncio"), help="connection engine")
+    parser.add_argument("--workers", dest="max_workers", type=int, help="worker threads of the asyncio engine")
+    parser.add_argument("--gamepads", dest="gamepad_count", type=int, help="virtual gamepads to create")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    parser.add_argument("--drain-timeout", type=float,
+                        help="seconds to let running commands finish on SIGTERM (default 30)")
+    parser.add_argument("--no-menu", "--daemon", dest="no_menu", action="store_true",
+                        help="run headless: serve clients without the interactive menu")
+    return parser
+
+
+def parse_args(argv=None):
+    return build_parser().parse_args(argv)
+
+
+def load_settings(args):
+    """
+    Merge the settings: command line first, then the --config file, then
+    DEFAULTS. Settings left as None fall back to the config table in the database.
+    """
+    settings = dict(DEFAULTS)
+    if args.config:
+        parser = configparser.ConfigParser()
+        if not parser.read(args.config):
+            raise SystemExit(f"Config file '{args.config}' not found.")
+        section = parser["server"] if parser.has_section("server") else {}
+        for key, value in section.items():
+            if key not in SETTINGS:
+                raise SystemExit(f"Unknown setting '{key}' in '{args.config}'. "
+                                 f"Expected one of: {', '.join(SETTINGS)}")
+            try:
+                settings[key] = SETTINGS[key](value)
+            except ValueError:
+                raise SystemExit(f"Invalid value '{value}' for '{key}' in '{args.config}'.")
+    for key in SETTINGS:
+        value = getattr(args, key)
+        if value is not None:
+            settings[key] = value
+    return settings
 
 
 def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    settings = load_settings(args)
+
     # Set up logging
-    setup_logging()
+    pipeline = setup_logging(settings["log_file"])
 
-    if not check_vigem_bus_driver():
+    # Initialize HWID Manager
+    hwid_manager = HWIDManager(settings["db_path"])
+    config_manager = ConfigManager(settings["db_path"])
+
+    # Settings that may come from the database are checked before anything starts
+    try:
+        engine = server_engine(settings, config_manager)
+        gamepads = gamepad_count(settings, config_manager)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # The ViGEmBus driver is only needed for real virtual pads
+    backend = config_manager.get_config('gamepad_backend') or os.environ.get("ZEUS_GAMEPAD_BACKEND") or "vgamepad"
+    if backend == "vgamepad" and not check_driver(interactive=not args.no_menu):
         # If the driver is not installed and the user chooses not to install it, the program will exit.
         return
-    
+
     from zeus_server_app.server import CommandServer
 
+    # Start the server ('threaded' or 'asyncio' engine)
+    options = {key: settings[key] for key in ("max_workers", "metrics_port") if key in settings}
+    server = CommandServer(hwid_manager = hwid_manager, config_manager = config_manager, engine = engine,
+                           host = settings["host"], port = settings["port"], log_file = settings["log_file"],
+                           gamepad_count = gamepads, log_broadcaster = pipeline.broadcaster, **options)
+    server_thread = threading.Thread(target=server.start, daemon=True)
+
+    if args.no_menu:
+        stopped_cleanly = run_headless(server, server_thread, settings.get("drain_timeout"))
+        pipeline.stop()
+        sys.exit(0 if stopped_cleanly else 1)
+
     # Handle signals
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Initialize HWID Manager
-    hwid_manager = HWIDManager()
-    config_manager = ConfigManager()
-    chrome_manager = ChromeManager(config_manager)
+    # The menu and its dependencies are only loaded when it is shown
+    from zeus_server_app.utils import display_menu
+    chrome_manager = server.chrome_manager  # Share one launcher between the menu and clients
+    server_thread.start()
 
+    # Run the menu interface in the main thread
+    display_menu(server, config_manager, chrome_manager)
 
 
-    # Start the server in a separate thread
-    server = CommandServer(hwid_manager = hwid_manager, config_manager = config_manager)
-    server_thread = threading.Thread(target=server.start, daemon=True)
+def server_engine(settings, config_manager):
+    """Return the connection engine from the settings or the database. Raises ValueError if it is unknown."""
+    from zeus_server_app.server import CommandServer
+    engine = settings.get("engine") or config_manager.get_config('server_engine') or "threaded"
+    if engine not in CommandServer.ENGINES:
+        raise ValueError(f"Unknown server engine '{engine}'. Expected one of: {', '.join(CommandServer.ENGINES)}")
+    return engine
+
+
+def gamepad_count(settings, config_manager):
+    """Return the number of pads from the settings or the database. Raises ValueError if out of range."""
+    from zeus_server_app.fleet import GamepadFleet
+    count = settings.get("gamepad_count")
+    if count is None:
+        count = config_manager.get_int('gamepad_count', 1)
+    if not 1 <= count <= GamepadFleet.MAX_PADS:
+        raise ValueError(f"Gamepad count must be between 1 and {GamepadFleet.MAX_PADS}, got {count}.")
+    return count
+
+
+def run_headless(server, server_thread, drain_timeout=None):
+    """
+    Serve until SIGTERM or Ctrl+C, then drain running commands and shut down.
+    A second signal exits immediately. Returns False if the server stopped by itself.
+    """
+    stop_requested = threading.Event()
+
+    def request_stop(sig, frame):
+        if stop_requested.is_set():
+            sys.exit(1)
+        logging.info(f"Received signal {sig}, draining and shutting down.")
+        stop_requested.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
     server_thread.start()
 
-    # Run the menu interface in the main thread
-    display_menu(server, config_manager, chrome_manager)
+    # Wait in short slices so signals are handled promptly on every platform
+    while not stop_requested.wait(0.5):
+        if not server_thread.is_alive():
+            return False  # The server stopped on its own, e.g. the port was in use
+    server.drain(drain_timeout)
+    server_thread.join(timeout=10)
+    return True
+
+
+def check_driver(interactive):
+    """Check the ViGEmBus driver, offering to install it when running with the menu."""
+    if interactive:
+        from zeus_server_app.utils import check_vigem_bus_driver
+        return check_vigem_bus_driver()
+    try:
+        from zeus_server_app.gamepad_backend import VGamepadBackend
+        VGamepadBackend().check()
+        return True
+    except Exception as e:
+        logging.error(f"ViGEmBus driver is not available: {e}")
+        return False
 
 
 def signal_handler(sig, frame):
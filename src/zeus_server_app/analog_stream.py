@@ -0,0 +1,280 @@
+import time
+import logging
+import threading
+from collections import deque
+
+# Analog axes: stick axes range from -1.0 to 1.0, triggers from 0.0 to 1.0
+STICK_AXES = ("lx", "ly", "rx", "ry")
+TRIGGER_AXES = ("lt", "rt")
+AXES = STICK_AXES + TRIGGER_AXES
+
+
+def _axis_value(axis, value):
+    """Validate one axis value from a client. Raises ValueError."""
+    if axis not in AXES:
+        raise ValueError(f"unknown axis '{axis}'. Axes: {', '.join(AXES)}")
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid value for '{axis}': {value!r}")
+    low = 0.0 if axis in TRIGGER_AXES else -1.0
+    if not low <= value <= 1.0:
+        raise ValueError(f"'{axis}' must be between {low:g} and 1, got {value:g}")
+    return value
+
+
+def _milliseconds(text):
+    try:
+        ms = float(text)
+    except ValueError:
+        raise ValueError(f"invalid time: {text!r}")
+    if ms < 0:
+        raise ValueError(f"time must not be negative: {text!r}")
+    return ms / 1000.0
+
+
+def parse_samples(text):
+    """
+    Parse timestamped samples such as `0:lx=0.5,ly=-1 16:lx=0.6 33:rt=1`:
+    each token is `<ms since stream start>:<axis>=<value>[,...]`.
+    Returns [(seconds, {axis: value})]. Raises ValueError on malformed input.
+    """
+    samples = []
+    for token in text.split():
+        ms, separator, values = token.partition(":")
+        if not separator or not values:
+            raise ValueError(f"invalid sample: {token!r}")
+        sample = {}
+        for pair in values.split(","):
+            axis, separator, value = pair.partition("=")
+            if not separator:
+                raise ValueError(f"invalid sample value: {pair!r}")
+            sample[axis] = _axis_value(axis, value)
+        samples.append((_milliseconds(ms), sample))
+    if not samples:
+        raise ValueError("no samples")
+    return samples
+
+
+def parse_curve(text):
+    """
+    Parse a curve such as `lx=0@0,1@250,0@500 rt=0@0,1@100`: for each axis,
+    keyframes `<value>@<ms from now>` that are interpolated linearly.
+    Returns {axis: [(seconds, value)]} with the keyframes in time order.
+    Raises ValueError on malformed input.
+    """
+    curve = {}
+    for token in text.split():
+        axis, separator, keyframes = token.partition("=")
+        if not separator or not keyframes:
+            raise ValueError(f"invalid curve: {token!r}")
+        points = []
+        for keyframe in keyframes.split(","):
+            value, separator, ms = keyframe.partition("@")
+            if not separator:
+                raise ValueError(f"invalid keyframe for '{axis}': {keyframe!r}")
+            points.append((_milliseconds(ms), _axis_value(axis, value)))
+        curve[axis] = sorted(points, key=lambda point: point[0])
+    if not curve:
+        raise ValueError("curve has no axes")
+    return curve
+
+
+class AnalogStream:
+    """
+    Plays client-supplied stick and trigger motion on one pad at a fixed tick.
+
+    Samples are timestamped relative to the start of the stream (the first
+    push after creation or stop()) and held until the next sample of the same
+    axis; curve keyframes are interpolated linearly between them. Each tick
+    applies the value due on every axis to the PadState, so a burst of samples
+    costs one report per tick rather than one per sample. The tick only runs
+    while keyframes are buffered.
+
+    At most `max_buffered` keyframes are queued; samples that do not fit, or
+    that arrive older than an already queued sample of the same axis, are
+    dropped. Samples that arrive more than one tick after their time are
+    counted as late but still applied, unless a newer one is already due.
+    Counters count axis values, so a sample setting both stick axes counts twice.
+    """
+
+    MIN_TICK = 0.001  # seconds
+
+    def __init__(self, pad, scheduler, tick=0.01, max_buffered=2048):
+        self.pad = pad
+        self.scheduler = scheduler
+        self.tick = tick
+        self.max_buffered = max_buffered
+        self._lock = threading.Lock()
+        self._keyframes = {axis: deque() for axis in AXES}  # [time, value, interpolate, applied]
+        self._buffered = 0
+        self._epoch = None
+        self._tick_event = None
+
+        # Counters since the pad was created
+        self.samples_received = 0
+        self.samples_applied = 0
+        self.samples_late = 0
+        self.samples_dropped = 0
+        self.samples_skipped = 0  # Superseded by a newer sample before a tick applied them
+        self.ticks = 0
+        self.ticks_missed = 0
+
+    @property
+    def active(self):
+        return self._epoch is not None
+
+    def push(self, samples):
+        """
+        Queue [(seconds since stream start, {axis: value})] samples, held until
+        the next sample. Returns the counts of this push and the stream clock.
+        """
+        with self._lock:
+            now = self._start_locked()
+            received, late, dropped = sum(len(values) for at, values in samples), 0, 0
+            for at, values in samples:
+                queues = [(self._keyframes[axis], axis) for axis in values]
+                if (self._buffered + len(values) > self.max_buffered
+                        or any(queue and queue[-1][0] > at for queue, axis in queues)):
+                    dropped += len(values)
+                    continue
+                if at + self.tick < now:
+                    late += len(values)
+                for queue, axis in queues:
+                    if queue and queue[-1][0] == at:
+                        queue[-1][1] = values[axis]
+                    else:
+                        queue.append([at, values[axis], False, False])
+                        self._buffered += 1
+            return self._pushed_locked(now, received, late, dropped)
+
+    def curve(self, curve):
+        """
+        Replace the queued motion of each axis in `curve` ({axis: [(seconds
+        from now, value)]}) with keyframes interpolated linearly.
+        """
+        with self._lock:
+            now = self._start_locked()
+            received = sum(len(points) for points in curve.values())
+            replaced = sum(len(self._keyframes[axis]) for axis in curve)
+            if self._buffered - replaced + received > self.max_buffered:
+                return self._pushed_locked(now, received, 0, received)
+            for axis, points in curve.items():
+                queue = self._keyframes[axis]
+                queue.clear()
+                queue.extend([now + offset, value, True, False] for offset, value in points)
+            self._buffered += received - replaced
+            return self._pushed_locked(now, received, 0, 0)
+
+    def stop(self):
+        """End the stream: discard queued keyframes and center the sticks and triggers."""
+        with self._lock:
+            if self._tick_event is not None:
+                self._tick_event.cancel()
+                self._tick_event = None
+            for queue in self._keyframes.values():
+                queue.clear()
+            self._buffered = 0
+            was_active, self._epoch = self.active, None
+        if was_active:
+            self.pad.set_left_stick(0.0, 0.0)
+            self.pad.set_right_stick(0.0, 0.0)
+            self.pad.set_left_trigger(0)
+            self.pad.set_right_trigger(0)
+            logging.info("Analog stream stopped.")
+
+    def _start_locked(self):
+        """Return the stream clock in seconds, starting the stream if needed (lock held)."""
+        now = time.monotonic()
+        if self._epoch is None:
+            self._epoch = now
+            logging.info("Analog stream started.")
+        return now - self._epoch
+
+    def _pushed_locked(self, now, received, late, dropped):
+        self.samples_received += received
+        self.samples_late += late
+        self.samples_dropped += dropped
+        if self._buffered and self._tick_event is None:
+            deadline = time.monotonic()
+            self._tick_event = self.scheduler.call_at(deadline, self._tick, deadline)
+        return {
+            "accepted": received - dropped,
+            "late": late,
+            "dropped": dropped,
+            "buffered": self._buffered,
+            "stream_ms": round(now * 1000, 1),
+        }
+
+    def _tick(self, deadline):
+        """Apply the values due on every axis, then schedule the next tick while keyframes remain."""
+        with self._lock:
+            if self._epoch is None:
+                return
+            now = time.monotonic()
+            stream_now = now - self._epoch
+            values = {}
+            for axis, queue in self._keyframes.items():
+                if not queue or queue[0][0] > stream_now:
+                    continue
+                while len(queue) > 1 and queue[1][0] <= stream_now:
+                    if not queue.popleft()[3]:
+                        self.samples_skipped += 1
+                    self._buffered -= 1
+                keyframe = queue[0]
+                if keyframe[2] and len(queue) > 1:
+                    # Between two curve keyframes: interpolate and keep the segment
+                    at, value = queue[1][0], queue[1][1]
+                    fraction = (stream_now - keyframe[0]) / (at - keyframe[0])
+                    values[axis] = keyframe[1] + (value - keyframe[1]) * fraction
+                else:
+                    values[axis] = keyframe[1]
+                    queue.popleft()
+                    self._buffered -= 1
+                if not keyframe[3]:
+                    keyframe[3] = True
+                    self.samples_applied += 1
+            self.ticks += 1
+
+            if self._buffered:
+                deadline += self.tick
+                if deadline < now:
+                    # Fell behind: skip to the next tick rather than bursting
+                    missed = int((now - deadline) / self.tick) + 1
+                    self.ticks_missed += missed
+                    deadline += missed * self.tick
+                self._tick_event = self.scheduler.call_at(deadline, self._tick, deadline)
+            else:
+                self._tick_event = None
+            self._apply(values)
+
+    def _apply(self, values):
+        """Set the due values on the pad (lock held, so stop() cannot be overtaken)."""
+        pad = self.pad
+        if "lx" in values or "ly" in values:
+            x, y = pad.left_stick
+            pad.set_left_stick(values.get("lx", x), values.get("ly", y))
+        if "rx" in values or "ry" in values:
+            x, y = pad.right_stick
+            pad.set_right_stick(values.get("rx", x), values.get("ry", y))
+        if "lt" in values:
+            pad.set_left_trigger(int(round(values["lt"] * 255)))
+        if "rt" in values:
+            pad.set_right_trigger(int(round(values["rt"] * 255)))
+
+    def stats(self):
+        """Return stream state and sample counters."""
+        with self._lock:
+            return {
+                "active": self.active,
+                "stream_ms": round((time.monotonic() - self._epoch) * 1000, 1) if self.active else None,
+                "buffered": self._buffered,
+                "tick_ms": round(self.tick * 1000, 3),
+                "received": self.samples_received,
+                "applied": self.samples_applied,
+                "late": self.samples_late,
+                "dropped": self.samples_dropped,
+                "skipped": self.samples_skipped,
+                "ticks": self.ticks,
+                "ticks_missed": self.ticks_missed,
+            }
@@ -0,0 +1,470 @@
+"""
+End-to-end load generator for the command protocol.
+
+Starts CommandServer in a child process on the headless 'null' gamepad
+backend, connects many concurrent clients that perform the HWID handshake
+and replay a weighted command mix over the framed protocol for a fixed time.
+Reports throughput, latency percentiles and the server's CPU time and RSS,
+and can write the results as JSON and compare them against a baseline:
+
+    python -m zeus_server_app.bench --engine asyncio --clients 50 --duration 10 \\
+        --mix healthCheck=70,press_*=20,start_movement=5,tail_logs=5 --output bench.json
+    python -m zeus_server_app.bench --baseline bench.json
+    python -m zeus_server_app.bench --protocol both --mix healthCheck=80,press_*=20
+
+With --startup it instead measures how quickly fresh server processes come
+up: module import time, server construction time and the time from process
+spawn until the listening socket accepts a connection.
+
+    python -m zeus_server_app.bench --startup 10 --output startup.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from zeus_server_app.protocol import (
+    FrameDecoder, encode_frame, BINARY_HANDSHAKE, BINARY_ENABLED_REPLY, BinaryReplyDecoder, encode_binary_request,
+    COMMAND_OPCODES, OP_TEXT, STATUS_ERROR,
+)
+from zeus_server_app.gamepad_controller import GamepadController
+
+BENCH_HWID = "bench-hwid"
+DEFAULT_MIX = "healthCheck=70,press_*=20,start_movement=4,stop_movement=4,tail_logs=2"
+
+# Regression check: relative change allowed before a metric counts as worse
+DEFAULT_TOLERANCE = 0.10
+
+
+def parse_mix(text):
+    """
+    Parse 'command=weight,...' into [(command, weight)]. A command ending in
+    '*' picks a random gamepad command with that prefix on every request.
+    """
+    mix = []
+    for item in text.split(","):
+        command, _, weight = item.strip().partition("=")
+        if not command:
+            continue
+        try:
+            weight = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Invalid weight in command mix: '{item}'")
+        if weight <= 0:
+            continue
+        if command.endswith("*") and not expand_command(command):
+            raise ValueError(f"No gamepad command matches '{command}'")
+        mix.append((command, weight))
+    if not mix:
+        raise ValueError("Command mix is empty")
+    return mix
+
+
+def expand_command(command):
+    """Return the gamepad commands matching a 'prefix*' pattern."""
+    prefix = command[:-1]
+    return sorted(c for c in GamepadController.GAMEPAD_COMMANDS if c.startswith(prefix))
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list of samples."""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(round(pct / 100.0 * len(samples) + 0.5)) - 1)
+    return samples[max(index, 0)]
+
+
+def latency_summary(samples):
+    """Summarise latency samples (seconds) in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "p999_ms": round(percentile(ordered, 99.9) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def rss_bytes():
+    """Resident set size of this process, or None if it cannot be measured."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def serve(db_path, log_file, engine, port, control):
+    """Child process: run a CommandServer and report its resource usage when asked."""
+    from zeus_server_app.log_pipeline import setup_logging
+    from zeus_server_app.hwid_manager import HWIDManager
+    from zeus_server_app.config_manager import ConfigManager
+    from zeus_server_app.server import CommandServer
+
+    # Log to the file only, not to handlers inherited from a forked parent
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    pipeline = setup_logging(log_file)
+    hwid_manager = HWIDManager(db_path)
+    config_manager = ConfigManager(db_path)
+    server = CommandServer(hwid_manager, config_manager, host="127.0.0.1", port=port, engine=engine,
+                           gamepad_backend="null", log_file=log_file, log_broadcaster=pipeline.broadcaster)
+    server_thread = threading.Thread(target=server.start, daemon=True)
+    server_thread.start()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    while True:
+        message = control.recv()
+        if message == "start":
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+        elif message == "stats":
+            control.send({
+                "cpu_seconds": round(time.process_time() - cpu_start, 3),
+                "wall_seconds": round(time.perf_counter() - wall_start, 3),
+                "rss_bytes": rss_bytes(),
+                "threads": threading.active_count(),
+            })
+        else:
+            break
+    server.shutdown()
+    server_thread.join(timeout=5)
+    pipeline.stop()
+
+
+class BenchClient(threading.Thread):
+    """One closed-loop client: sends a command, waits for its reply, repeats."""
+
+    def __init__(self, port, mix, deadline, seed, protocol="text"):
+        super().__init__(daemon=True)
+        self.port = port
+        self.protocol = protocol
+        self.commands = [command for command, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.expanded = {command: expand_command(command) for command in self.commands if command.endswith("*")}
+        self.deadline = deadline
+        self.random = random.Random(seed)
+        self.samples = {}
+        self.errors = 0
+        self.error = None
+
+    def run(self):
+        try:
+            with socket.create_connection(("127.0.0.1", self.port)) as conn:
+                conn.sendall(BENCH_HWID.encode())
+                reply = conn.recv(1024).decode()
+                if reply != "HWID authorized.":
+                    raise RuntimeError(f"Handshake failed: {reply}")
+                if self.protocol == "binary":
+                    conn.sendall(BINARY_HANDSHAKE.encode())
+                    reply = conn.recv(1024).decode()
+                    if reply != BINARY_ENABLED_REPLY:
+                        raise RuntimeError(f"Binary protocol refused: {reply}")
+                    self._replay_binary(conn)
+                else:
+                    self._replay(conn)
+        except Exception as e:
+            self.error = e
+
+    def _next_command(self):
+        """Pick the next command from the mix. Returns (mix entry, command)."""
+        name = self.random.choices(self.commands, self.weights)[0]
+        choices = self.expanded.get(name)
+        return name, self.random.choice(choices) if choices else name
+
+    def _replay(self, conn):
+        decoder = FrameDecoder()
+        request_id = 0
+        while time.perf_counter() < self.deadline:
+            name, command = self._next_command()
+            request_id += 1
+            start = time.perf_counter()
+            conn.sendall(encode_frame(f"{request_id} {command}"))
+            frames = []
+            while not frames:
+                data = conn.recv(65536)
+                if not data:
+                    raise ConnectionError("Server closed the connection")
+                frames = decoder.feed(data)
+            elapsed = time.perf_counter() - start
+            if not frames[0].startswith(f"{request_id} ".encode()):
+                self.errors += 1
+            self.samples.setdefault(name, []).append(elapsed)
+
+    def _replay_binary(self, conn):
+        decoder = BinaryReplyDecoder()
+        request_id = 0
+        while time.perf_counter() < self.deadline:
+            name, command = self._next_command()
+            request_id = (request_id + 1) & 0xFFFF
+            opcode = COMMAND_OPCODES.get(command, OP_TEXT)
+            start = time.perf_counter()
+            conn.sendall(encode_binary_request(opcode, request_id, text=command))
+            replies = []
+            while not replies:
+                data = conn.recv(65536)
+                if not data:
+                    raise ConnectionError("Server closed the connection")
+                replies = decoder.feed(data)
+            elapsed = time.perf_counter() - start
+            if replies[0][0] != request_id or replies[0][1] == STATUS_ERROR:
+                self.errors += 1
+            self.samples.setdefault(name, []).append(elapsed)
+
+
+# Run in a fresh interpreter by measure_startup(); imports nothing before the clock starts
+STARTUP_PROBE = """
+import json, sys, threading, time
+started = time.perf_counter()
+from zeus_server_app.log_pipeline import setup_logging
+from zeus_server_app.hwid_manager import HWIDManager
+from zeus_server_app.config_manager import ConfigManager
+from zeus_server_app.server import CommandServer
+imported = time.perf_counter()
+db_path, log_file, port = sys.argv[1], sys.argv[2], int(sys.argv[3])
+pipeline = setup_logging(log_file)
+server = CommandServer(HWIDManager(db_path), ConfigManager(db_path), host="127.0.0.1", port=port,
+                       gamepad_backend="null", log_file=log_file, log_broadcaster=pipeline.broadcaster)
+constructed = time.perf_counter()
+thread = threading.Thread(target=server.start, daemon=True)
+thread.start()
+print(json.dumps({"import_ms": (imported - started) * 1000, "init_ms": (constructed - imported) * 1000}), flush=True)
+sys.stdin.readline()
+server.shutdown()
+thread.join(timeout=5)
+pipeline.stop()
+"""
+
+
+def measure_startup(runs=5):
+    """Start `runs` fresh server processes and return median startup timings."""
+    samples = {"import_ms": [], "init_ms": [], "listen_ms": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        for _ in range(runs):
+            port = free_port()
+            spawned = time.perf_counter()
+            child = subprocess.Popen(
+                [sys.executable, "-c", STARTUP_PROBE, db_path, os.path.join(tmp, "server.log"), str(port)],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+            try:
+                wait_for_server(port, poll_interval=0.001)
+                samples["listen_ms"].append((time.perf_counter() - spawned) * 1000)
+                timings = json.loads(child.stdout.readline())
+                samples["import_ms"].append(timings["import_ms"])
+                samples["init_ms"].append(timings["init_ms"])
+            finally:
+                child.communicate(b"\n", timeout=10)
+
+    return {
+        "runs": runs,
+        "startup": {key: round(sorted(values)[len(values) // 2], 1) for key, values in samples.items()},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def wait_for_server(port, timeout=10.0, poll_interval=0.05):
+    """Block until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1.0).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server did not start on port {port}")
+            time.sleep(poll_interval)
+
+
+def free_port():
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run(engine="threaded", clients=20, duration=5.0, mix=DEFAULT_MIX, seed=0, protocol="text"):
+    """Run one benchmark and return the results as a dict."""
+    parsed_mix = parse_mix(mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        from zeus_server_app.hwid_manager import HWIDManager
+        seed_manager = HWIDManager(db_path)
+        seed_manager.add_hwid(BENCH_HWID)
+        seed_manager.close()
+
+        port = free_port()
+        control, child_control = multiprocessing.Pipe()
+        server = multiprocessing.Process(
+            target=serve, args=(db_path, os.path.join(tmp, "server.log"), engine, port, child_control))
+        server.start()
+        try:
+            wait_for_server(port)
+            control.send("start")
+            started = time.perf_counter()
+            deadline = started + duration
+            threads = [BenchClient(port, parsed_mix, deadline, seed + i, protocol) for i in range(clients)]
+            for t in threads:
+                t.start()
+            # Sample the server while every client is still connected
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            control.send("stats")
+            server_stats = control.recv()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            control.send("stop")
+            server.join(timeout=10)
+            if server.is_alive():
+                server.terminate()
+
+    failed = [t.error for t in threads if t.error is not None]
+    if failed:
+        logging.warning(f"{len(failed)} client(s) failed, first error: {failed[0]}")
+
+    per_command = {}
+    for t in threads:
+        for name, samples in t.samples.items():
+            per_command.setdefault(name, []).extend(samples)
+    all_samples = [s for samples in per_command.values() for s in samples]
+
+    cpu = server_stats["cpu_seconds"]
+    wall = server_stats["wall_seconds"] or elapsed
+    return {
+        "engine": engine,
+        "protocol": protocol,
+        "clients": clients,
+        "duration_s": round(elapsed, 3),
+        "mix": mix,
+        "requests": len(all_samples),
+        "errors": sum(t.errors for t in threads) + len(failed),
+        "throughput_rps": round(len(all_samples) / elapsed, 1),
+        "latency": latency_summary(all_samples),
+        "commands": {name: latency_summary(samples) for name, samples in sorted(per_command.items())},
+        "server": {
+            "cpu_seconds": cpu,
+            "cpu_percent": round(cpu / wall * 100, 1) if wall else 0.0,
+            "rss_bytes": server_stats["rss_bytes"],
+            "threads": server_stats["threads"],
+        },
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(result, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return a list of regressions of `result` against a `baseline` result."""
+    regressions = []
+    if "startup" in result:
+        for key, new in result["startup"].items():
+            old = baseline.get("startup", {}).get(key)
+            if old and new > old * (1 + tolerance):
+                regressions.append(f"startup {key} {new} > baseline {old}")
+        return regressions
+    old, new = baseline["throughput_rps"], result["throughput_rps"]
+    if old and new < old * (1 - tolerance):
+        regressions.append(f"throughput {new} req/s < baseline {old} req/s")
+    for key in ("p50_ms", "p99_ms", "p999_ms"):
+        old, new = baseline["latency"][key], result["latency"][key]
+        if old and new > old * (1 + tolerance):
+            regressions.append(f"latency {key} {new} > baseline {old}")
+    return regressions
+
+
+def format_result(result):
+    if "startup" in result:
+        startup = result["startup"]
+        return (f"startup, median of {result['runs']} runs: import={startup['import_ms']} ms "
+                f"init={startup['init_ms']} ms listening after {startup['listen_ms']} ms")
+    latency = result["latency"]
+    server = result["server"]
+    rss = f"{server['rss_bytes'] / 1048576:.1f} MiB" if server["rss_bytes"] else "n/a"
+    lines = [
+        f"{result['engine']} engine, {result.get('protocol', 'text')} protocol, {result['clients']} clients, {result['duration_s']} s: "
+        f"{result['requests']} requests, {result['throughput_rps']} req/s, {result['errors']} errors",
+        f"  latency p50={latency['p50_ms']} ms p99={latency['p99_ms']} ms "
+        f"p999={latency['p999_ms']} ms max={latency['max_ms']} ms",
+        f"  server cpu={server['cpu_seconds']} s ({server['cpu_percent']}%) rss={rss} threads={server['threads']}",
+    ]
+    for name, summary in result["commands"].items():
+        lines.append(f"  {name:>16}: n={summary['count']} p50={summary['p50_ms']} ms p99={summary['p99_ms']} ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engine", choices=("threaded", "asyncio"), default="threaded")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted command mix, e.g. healthCheck=70,press_*=30")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative regression")
+    parser.add_argument("--protocol", choices=("text", "binary", "both"), default="text",
+                        help="framed text commands, the binary opcode protocol, or both one after the other")
+    parser.add_argument("--startup", type=int, metavar="RUNS",
+                        help="measure server startup over RUNS fresh processes instead of load")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    try:
+        if args.startup:
+            result = measure_startup(args.startup)
+        elif args.protocol == "both":
+            if args.baseline:
+                parser.error("--baseline needs a single --protocol")
+            result = {protocol: run(args.engine, args.clients, args.duration, args.mix, args.seed, protocol)
+                      for protocol in ("text", "binary")}
+        else:
+            result = run(args.engine, args.clients, args.duration, args.mix, args.seed, args.protocol)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.protocol == "both" and not args.startup:
+        print(format_result(result["text"]))
+        print(format_result(result["binary"]))
+        text, binary = result["text"], result["binary"]
+        if text["throughput_rps"]:
+            print(f"binary/text: throughput x{binary['throughput_rps'] / text['throughput_rps']:.2f}, "
+                  f"p50 {binary['latency']['p50_ms']} vs {text['latency']['p50_ms']} ms")
+    else:
+        print(format_result(result))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
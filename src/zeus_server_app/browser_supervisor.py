@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import logging
+import threading
+import subprocess
+
+USER_DATA_DIR_FLAG = "--user-data-dir="
+# Family of the browsers started without --user-data-dir, in the default profile folder
+DEFAULT_FAMILY = ""
+
+
+def split_command_line(command_line):
+    """
+    Split a Windows command line into arguments the way CommandLineToArgvW
+    does: double quotes group spaces, and backslashes are literal unless
+    they precede a quote.
+    """
+    arguments = []
+    current = []
+    in_argument = in_quotes = False
+    backslashes = 0
+    for char in command_line or "":
+        if char == "\\":
+            backslashes += 1
+            in_argument = True
+            continue
+        if char == '"':
+            current.append("\\" * (backslashes // 2))
+            if backslashes % 2:
+                current.append('"')  # Escaped quote
+            else:
+                in_quotes = not in_quotes
+            backslashes = 0
+            in_argument = True
+            continue
+        current.append("\\" * backslashes)
+        backslashes = 0
+        if char in " \t" and not in_quotes:
+            if in_argument:
+                arguments.append("".join(current))
+                current = []
+                in_argument = False
+        else:
+            current.append(char)
+            in_argument = True
+    current.append("\\" * backslashes)
+    if in_argument:
+        arguments.append("".join(current))
+    return arguments
+
+
+def process_family(argv):
+    """
+    Return the normalised --user-data-dir of a browser argument list, or
+    DEFAULT_FAMILY without one. Chrome runs every profile of a user data dir
+    in one browser process whose command line names only the first profile,
+    so profiles are matched to processes by this family alone.
+    """
+    for argument in argv:
+        if argument.startswith(USER_DATA_DIR_FLAG):
+            user_data_dir = argument[len(USER_DATA_DIR_FLAG):].strip('"').rstrip("\\/")
+            return os.path.normcase(user_data_dir) if user_data_dir else DEFAULT_FAMILY
+    return DEFAULT_FAMILY
+
+
+def list_processes(image_name="chrome"):
+    """
+    Return [(pid, argv, rss_bytes)] for every process whose name contains
+    `image_name`, gathered in a single system query: psutil when installed,
+    /proc on Linux, or one CIM query through PowerShell on Windows.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        processes = []
+        for process in psutil.process_iter(['pid', 'name', 'cmdline', 'memory_info']):
+            info = process.info
+            if image_name in (info['name'] or '').lower():
+                rss = info['memory_info'].rss if info['memory_info'] else 0
+                processes.append((info['pid'], list(info['cmdline'] or []), rss))
+        return processes
+
+    if os.path.isdir('/proc'):
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        processes = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/comm') as f:
+                    if image_name not in f.read().lower():
+                        continue
+                with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                    argv = f.read().decode(errors='replace').split('\0')[:-1]
+                with open(f'/proc/{entry}/statm') as f:
+                    rss = int(f.read().split()[1]) * page_size
+            except (OSError, ValueError, IndexError):
+                continue  # Exited while we were reading it
+            processes.append((int(entry), argv, rss))
+        return processes
+
+    query = (f"Get-CimInstance Win32_Process -Filter \"Name LIKE '%{image_name}%'\" | "
+             "Select-Object ProcessId,CommandLine,WorkingSetSize | ConvertTo-Json -Compress")
+    output = subprocess.run(['powershell', '-NoProfile', '-Command', query],
+                            capture_output=True, text=True, timeout=30).stdout.strip()
+    if not output:
+        return []
+    rows = json.loads(output)
+    if isinstance(rows, dict):
+        rows = [rows]
+    return [(row['ProcessId'], split_command_line(row.get('CommandLine')), row.get('WorkingSetSize') or 0)
+            for row in rows]
+
+
+class SupervisedProfile:
+    """Health record of one launched profile."""
+
+    __slots__ = ("name", "family", "status", "pid", "rss", "restarts", "failures",
+                 "launched_at", "running_since", "next_restart")
+
+    def __init__(self, name, family):
+        self.name = name
+        self.family = family
+        self.status = "starting"
+        self.pid = None
+        self.rss = 0
+        self.restarts = 0
+        self.failures = 0  # Consecutive crashes, drives the backoff
+        self.launched_at = time.monotonic()
+        self.running_since = None
+        self.next_restart = None
+
+    def to_dict(self, now):
+        return {
+            "status": self.status,
+            "pid": self.pid,
+            "rss_mb": round(self.rss / 1048576, 1),
+            "restarts": self.restarts,
+            "restart_in_s": round(max(0.0, self.next_restart - now), 1) if self.next_restart else None,
+        }
+
+
+class BrowserSupervisor:
+    """
+    Watches the Chrome profiles the server launched and restarts the ones
+    that die. Every `interval` seconds one batched process listing is matched
+    against all watched profiles, so the cost of a pass does not grow with
+    one system call per profile.
+
+    Profiles sharing a --user-data-dir run in one browser process, which
+    names only the first of them, so they are watched as one family: all
+    are running while any process of the family is, and all are relaunched
+    once the family is gone. Closing one window of a family that keeps
+    running is not detected. Crashed profiles are relaunched through
+    `restart(name)` with exponential backoff; a profile that stays up for
+    `stable_after` seconds has its backoff reset.
+    """
+
+    def __init__(self, restart, interval=15.0, start_grace=60.0, backoff_base=5.0, backoff_max=300.0,
+                 stable_after=120.0, list_processes=list_processes):
+        self.restart = restart
+        self.interval = interval
+        self.start_grace = start_grace
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.list_processes = list_processes
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.running = False
+        self.last_poll_ms = None
+
+    def watch(self, name, arguments):
+        """Track a profile that was just launched with the shortcut `arguments` (a command line string)."""
+        family = process_family(split_command_line(arguments))
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = SupervisedProfile(name, family)
+            profile.family = family
+            profile.status = "starting"
+            profile.launched_at = time.monotonic()
+            profile.next_restart = None
+            if not self.running:
+                self.running = True
+                self._thread = threading.Thread(target=self._run, name="browser-supervisor", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, name):
+        """Stop supervising a profile. Returns False if it was not watched."""
+        with self._lock:
+            return self._profiles.pop(name, None) is not None
+
+    def status(self):
+        """Return {profile name: health} for every watched profile."""
+        now = time.monotonic()
+        with self._lock:
+            return {name: profile.to_dict(now) for name, profile in sorted(self._profiles.items())}
+
+    def stop(self):
+        self.running = False
+        self._wakeup.set()
+
+    def _run(self):
+        logging.info("Browser supervisor started.")
+        while self.running:
+            try:
+                self.poll()
+            except Exception as e:
+                logging.error(f"Browser supervisor poll failed: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def poll(self):
+        """Run one supervision pass: list processes once, update every profile, restart the dead."""
+        started = time.perf_counter()
+        index = {}
+        for pid, argv, rss in self.list_processes():
+            family = process_family(argv)
+            entry = index.get(family)
+            # The lowest PID is the browser; renderers and helpers add to its memory
+            index[family] = (min(pid, entry[0]), entry[1] + rss) if entry else (pid, rss)
+        self.last_poll_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        now = time.monotonic()
+        to_restart = []
+        with self._lock:
+            for profile in self._profiles.values():
+                found = index.get(profile.family)
+                # A crashed profile's window is gone even if its family was relaunched meanwhile
+                if found is not None and profile.status != "crashed":
+                    if profile.status != "running":
+                        profile.running_since = now
+                    profile.status = "running"
+                    profile.pid, profile.rss = found
+                    if profile.failures and now - profile.running_since >= self.stable_after:
+                        profile.failures = 0
+                    continue
+
+                profile.pid, profile.rss = None, 0
+                launching = profile.status in ("starting", "restarting")
+                if launching and now - profile.launched_at < self.start_grace:
+                    continue
+                if profile.status == "running" or launching:
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** profile.failures)
+                    profile.failures += 1
+                    profile.status = "crashed"
+                    profile.next_restart = now + delay
+                    logging.warning(f"Chrome profile '{profile.name}' is not running; restarting in {delay:.0f} s.")
+                elif profile.status == "crashed" and now >= profile.next_restart:
+                    profile.status = "restarting"
+                    profile.launched_at = now
+                    profile.next_restart = None
+                    profile.restarts += 1
+                    to_restart.append(profile.name)
+
+        for name in to_restart:
+            logging.info(f"Restarting Chrome profile '{name}'.")
+            try:
+                self.restart(name)
+            except Exception as e:
+                logging.error(f"Failed to restart Chrome profile '{name}': {e}")
@@ -0,0 +1,229 @@
+import itertools
+import logging
+import queue
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from zeus_server_app.browser_supervisor import list_processes, process_family
+
+# Chrome starts its renderer, GPU and utility processes with this flag
+CHILD_PROCESS_FLAG = "--type="
+
+class LaunchJob:
+    """A batch of browser launches run by ChromeLauncher, tracked by ID."""
+
+    def __init__(self, job_id, description, launches, concurrency, stagger, on_result=None, browser_family=None):
+        self.id = job_id
+        self.description = description
+        self.launches = launches  # [(profile name, command)]
+        self.concurrency = concurrency
+        self.stagger = stagger
+        self.on_result = on_result  # Called with (profile name, ok) as each launch settles
+        self.browser_family = browser_family  # Profile name -> user data dir family to wait for, or None
+        self.status = "queued"
+        self.results = []
+        self.created = time.time()
+        self.finished = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "description": self.description,
+            "status": self.status,
+            "profiles": len(self.launches),
+            "launched": sum(1 for r in self.results if r["ok"]),
+            "failed": sum(1 for r in self.results if not r["ok"]),
+            "results": list(self.results),
+        }
+
+
+class ChromeLauncher:
+    """
+    Runs Chrome launch jobs one at a time on a background thread. Within a job,
+    profiles start in waves of at most `concurrency` processes, `stagger`
+    seconds apart, and the next wave waits until every browser in the current
+    one is ready.
+
+    A launch command that exits cleanly has handed off to a browser, and one
+    still running after `ready_timeout` is the browser itself. For profiles
+    the job's `browser_family` knows, the launch is only ready once a Chrome
+    child process (renderer, GPU, ...) of that user data dir appears that was
+    not in the listing taken before the launch, checked every LIST_INTERVAL
+    seconds for up to `browser_timeout`. A new window needs a new renderer
+    even when the profile opens in an already running browser, which is the
+    usual case for --profile-directory profiles of the default user data dir.
+    Launches of the same user data dir started before the next listing can
+    be credited with each other's processes; the stagger still paces them.
+    Other launches are ready at the hand-off, so their launch_ms only
+    measures the spawn.
+    """
+
+    # Finished jobs kept for status queries
+    MAX_JOBS_KEPT = 50
+    POLL_INTERVAL = 0.05  # seconds
+    LIST_INTERVAL = 0.5  # seconds between process listings while waiting for browsers
+
+    def __init__(self, concurrency=4, stagger=1.0, ready_timeout=3.0, browser_timeout=30.0,
+                 popen=subprocess.Popen, list_processes=list_processes):
+        self.concurrency = concurrency
+        self.stagger = stagger
+        self.ready_timeout = ready_timeout
+        self.browser_timeout = browser_timeout
+        self.popen = popen
+        self.list_processes = list_processes
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        # Child process IDs per user data dir in the latest listing (launcher thread only)
+        self._children = {}
+
+    def submit(self, description, launches, concurrency=None, stagger=None, on_result=None, browser_family=None):
+        """Queue a job of [(profile name, command)] launches and return its LaunchJob."""
+        job = LaunchJob(next(self._ids), description, launches,
+                        max(1, concurrency or self.concurrency),
+                        self.stagger if stagger is None else max(0.0, stagger), on_result, browser_family)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.MAX_JOBS_KEPT:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.done.is_set():
+                    break
+                self._jobs.popitem(last=False)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chrome-launcher", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        logging.info(f"Queued launch job {job.id}: {description} ({len(launches)} profiles)")
+        return job
+
+    def get(self, job_id):
+        """Return the job with `job_id`, or None if unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """Return the tracked jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run_job(job)
+                job.status = "done"
+            except Exception as e:
+                logging.error(f"Launch job {job.id} failed: {e}")
+                job.status = "failed"
+            finally:
+                job.finished = time.time()
+                job.done.set()
+
+    def _run_job(self, job):
+        job.status = "running"
+        started = time.perf_counter()
+        if job.browser_family is not None:
+            self._list_children(job)  # What already runs, so only new processes count
+        for wave_start in range(0, len(job.launches), job.concurrency):
+            pending = []
+            for offset, (name, command) in enumerate(job.launches[wave_start:wave_start + job.concurrency]):
+                if offset:
+                    # Keep timing the launches already started while staggering
+                    next_launch = time.perf_counter() + job.stagger
+                    pending = self._wait_ready(job, pending, until=next_launch)
+                    time.sleep(max(0.0, next_launch - time.perf_counter()))
+                family = job.browser_family(name) if job.browser_family is not None else None
+                known = None if family is None else self._children.get(family, frozenset())
+                launched_at = time.perf_counter()
+                try:
+                    process = self.popen(command)
+                except Exception as e:
+                    self._record(job, name, launched_at, f"Failed to start: {e}")
+                    continue
+                pending.append((name, process, launched_at, (family, known)))
+            self._wait_ready(job, pending)
+        logging.info(f"Launch job {job.id} finished in {time.perf_counter() - started:.1f} s: "
+                     f"{sum(1 for r in job.results if r['ok'])}/{len(job.launches)} profiles ready")
+
+    def _wait_ready(self, job, pending, until=None):
+        """
+        Poll launched processes, then the process listing, until each launch
+        is ready or failed, or until the perf_counter() deadline `until`.
+        Returns those still pending; a process of None is waiting for its browser.
+        """
+        next_listing = 0.0
+        while pending:
+            now = time.perf_counter()
+            still_pending = []
+            for name, process, launched_at, browser in pending:
+                if process is not None:
+                    returncode = process.poll()
+                    if returncode is None and now - launched_at < self.ready_timeout:
+                        still_pending.append((name, process, launched_at, browser))
+                        continue
+                    if returncode not in (None, 0):
+                        self._record(job, name, launched_at, f"Exited with code {returncode}")
+                        continue
+                    if browser[1] is None:
+                        self._record(job, name, launched_at)
+                        continue
+                still_pending.append((name, None, launched_at, browser))
+            pending = still_pending
+            if any(process is None for _, process, _, _ in pending) and now >= next_listing:
+                pending = self._check_browsers(job, pending, now)
+                next_listing = now + self.LIST_INTERVAL
+            if pending:
+                if until is not None and time.perf_counter() >= until:
+                    break
+                time.sleep(self.POLL_INTERVAL)
+        return pending
+
+    def _list_children(self, job):
+        """
+        Refresh the child process IDs per user data dir from one process
+        listing. Returns False, and forgets them, if the listing failed.
+        """
+        try:
+            processes = self.list_processes()
+        except Exception as e:
+            logging.warning(f"Job {job.id}: cannot list browser processes, not waiting for them: {e}")
+            self._children = {}
+            return False
+        children = {}
+        for pid, argv, rss in processes:
+            if any(argument.startswith(CHILD_PROCESS_FLAG) for argument in argv):
+                children.setdefault(process_family(argv), set()).add(pid)
+        self._children = children
+        return True
+
+    def _check_browsers(self, job, pending, now):
+        """Record the launches with a new child process in one listing. Returns the rest."""
+        listed = self._list_children(job)
+        still_pending = []
+        for name, process, launched_at, (family, known) in pending:
+            if process is not None:
+                still_pending.append((name, process, launched_at, (family, known)))
+            elif not listed or self._children.get(family, set()) - known:
+                self._record(job, name, launched_at)
+            elif now - launched_at >= self.browser_timeout:
+                self._record(job, name, launched_at, f"No new browser process after {self.browser_timeout:g} s")
+            else:
+                still_pending.append((name, process, launched_at, (family, known)))
+        return still_pending
+
+    def _record(self, job, name, launched_at, error=None):
+        launch_ms = round((time.perf_counter() - launched_at) * 1000, 1)
+        job.results.append({"profile": name, "ok": error is None, "launch_ms": launch_ms, "error": error})
+        if error is None:
+            logging.info(f"Job {job.id}: Chrome profile '{name}' ready in {launch_ms} ms")
+        else:
+            logging.error(f"Job {job.id}: Chrome profile '{name}' failed after {launch_ms} ms: {error}")
+        if job.on_result is not None:
+            try:
+                job.on_result(name, error is None)
+            except Exception as e:
+                logging.error(f"Job {job.id}: result callback failed for '{name}': {e}")
@@ -1,190 +1,163 @@
 import os
-import subprocess
 import logging
+from zeus_server_app.chrome_launcher import ChromeLauncher
+from zeus_server_app.profile_catalog import ProfileCatalog
+from zeus_server_app.browser_supervisor import BrowserSupervisor, process_family, split_command_line
 
 class ChromeManager:
     """Manages Chrome profiles and related actions."""
 
-    def __init__(self, config_manager):
+    # Launch pacing defaults, overridable with the config keys of the same name in lowercase
+    CHROME_LAUNCH_CONCURRENCY = 4
+    CHROME_LAUNCH_STAGGER = 1.0  # seconds between launches within a wave
+    BROWSER_SUPERVISOR_INTERVAL = 15.0  # seconds between health checks of launched profiles
+
+    def __init__(self, config_manager, launcher=None):
         """Initialize with a ConfigManager instance."""
         self.config_manager = config_manager
+        self.launcher = launcher or ChromeLauncher()
+        self.catalog = ProfileCatalog(config_manager)
+        self.supervisor = BrowserSupervisor(
+            restart=self._restart_profile,
+            interval=config_manager.get_float('browser_supervisor_interval', self.BROWSER_SUPERVISOR_INTERVAL),
+        )
         self.bo6_url = "https://www.xbox.com/en-US/play/launch/call-of-duty-black-ops-6---cross-gen-bundle/9PF528M6CRHQ"
 
-
-    def open_all_chrome_profiles(self):
-        """Open all Chrome profiles using shortcuts in the specified directory."""
+    def _list_profiles(self, action):
+        """Return the cataloged profiles, or None after logging why `action` cannot run."""
         shortcuts_path = self.config_manager.get_config('chrome_shortcuts_path')
         if not shortcuts_path:
-            print("Chrome shortcuts path is not set. Cannot open profiles.")
+            logging.warning(f"Chrome shortcuts path is not set. Cannot {action}.")
+            return None
+
+        profiles = self.catalog.profiles()
+        if not profiles:
+            if not os.path.isdir(shortcuts_path):
+                logging.warning(f"The path '{shortcuts_path}' does not exist or is not a directory.")
+            else:
+                logging.warning(f"No shortcut files (.lnk) found in '{shortcuts_path}'.")
+            return None
+        return profiles
+
+    def _shortcut_launches(self, profiles, url):
+        """Build one `cmd /c start` launch per profile shortcut that opens `url`."""
+        return [
+            (profile.name, [
+                'cmd', '/c', 'start', '',  # Use cmd /c start to open the shortcut
+                profile.shortcut_path,
+                url,
+                '--window-size=500,500',  # Set window size (adjust as needed)
+            ])
+            for profile in profiles
+        ]
+
+    def _submit(self, description, launches, supervise=False):
+        """Hand launches to the background launcher and return the LaunchJob."""
+        on_result = None
+        if supervise and self.config_manager.get_bool('browser_supervisor', False):
+            on_result = self._watch_launched
+        return self.launcher.submit(
+            description, launches,
+            concurrency=self.config_manager.get_int('chrome_launch_concurrency', self.CHROME_LAUNCH_CONCURRENCY),
+            stagger=self.config_manager.get_float('chrome_launch_stagger', self.CHROME_LAUNCH_STAGGER),
+            on_result=on_result,
+            browser_family=self._browser_family,
+        )
+
+    def _browser_family(self, name):
+        """Launcher callback: the user data dir family a profile's browser runs in, or None if unknown."""
+        profile = self.catalog.get(name)
+        return process_family(split_command_line(profile.arguments)) if profile else None
+
+    def _watch_launched(self, name, ok):
+        """Launcher callback: hand successfully opened profiles to the supervisor."""
+        profile = self.catalog.get(name)
+        if ok and profile is not None:
+            self.supervisor.watch(name, profile.arguments)
+
+    def _restart_profile(self, name):
+        """Supervisor callback: relaunch one crashed profile."""
+        job, unmatched = self.open_profiles([name])
+        if job is None:
+            # Shortcut removed; stop supervising it
+            self.supervisor.unwatch(name)
+
+    def open_all_chrome_profiles(self):
+        """Open all Chrome profiles using shortcuts in the specified directory. Returns the LaunchJob or None."""
+        profiles = self._list_profiles("open profiles")
+        if not profiles:
+            return None
+
+        logging.info(f"Found {len(profiles)} Chrome profile shortcuts. Opening all profiles...")
+        return self._submit("Open all Chrome profiles", self._shortcut_launches(profiles, self.bo6_url), supervise=True)
+
+    def open_profiles(self, selectors, url=None):
+        """
+        Open only the profiles matching `selectors` (names, indexes or glob
+        patterns such as 'bot0*'). Returns (LaunchJob or None, unmatched selectors).
+        """
+        if not self.config_manager.get_config('chrome_shortcuts_path'):
             logging.warning("Chrome shortcuts path is not set. Cannot open profiles.")
-            return
-
-        if not os.path.isdir(shortcuts_path):
-            print(f"The path '{shortcuts_path}' does not exist or is not a directory")
-            logging.warning(f"The path '{shortcuts_path}' does not exist or is not a directory.")
-            return
-
-        # List all .lnk files in the directory
-        shortcuts = [f for f in os.listdir(shortcuts_path) if f.endswith('.lnk')]
-        if not shortcuts:
-            logging.warning(f"No shortcut files (.lnk) found in '{shortcuts_path}'.")
-            return
-
-        print(f"Found {len(shortcuts)} Chrome profile shortcuts. Opening all profiles...")
-        logging.info(f"Found {len(shortcuts)} Chrome profile shortcuts. Opening all profiles...")
-
-        for shortcut in shortcuts:
-            shortcut_path = os.path.join(shortcuts_path, shortcut)
-            try:
-                # Build the command to open the shortcut
-                cmd = [
-                    'cmd', '/c', 'start', '',
-                    shortcut_path,
-                    self.bo6_url,  # The URL to open
-                    '--window-size=500,500',  # Set window size (adjust as needed)
-                ]
-
-                subprocess.Popen(cmd, shell=False)
-                print(f"Opened Chrome profile using shortcut '{shortcut}'.")
-                logging.info(f"Opened Chrome profile using shortcut '{shortcut}'.")
-            except Exception as e:
-                print(f"Failed to open shortcut '{shortcut}': {e}")
-                logging.error(f"Failed to open shortcut '{shortcut}': {e}")
+            return None, list(selectors)
 
+        profiles, unmatched = self.catalog.select(selectors)
+        if unmatched:
+            logging.warning(f"No Chrome profile matches: {', '.join(unmatched)}")
+        if not profiles:
+            return None, unmatched
 
-    def install_tampermonkey_script_in_all_profiles(self, script_url):
-        """Open the user script URL in all profiles to prompt Tampermonkey installation."""
-        shortcuts_path = self.config_manager.get_config('chrome_shortcuts_path')
-        if not shortcuts_path:
-            logging.warning("Chrome shortcuts path is not set. Cannot install script.")
-            return
-
-        if not os.path.isdir(shortcuts_path):
-            logging.warning(f"The path '{shortcuts_path}' does not exist or is not a directory.")
-            return
-
-        # List all .lnk files in the directory
-        shortcuts = [f for f in os.listdir(shortcuts_path) if f.endswith('.lnk')]
-        if not shortcuts:
-            logging.warning(f"No shortcut files (.lnk) found in '{shortcuts_path}'.")
-            return
-
-        logging.info(f"Opening script URL '{script_url}' in {len(shortcuts)} Chrome profiles.")
-
-        for shortcut in shortcuts:
-            shortcut_path = os.path.join(shortcuts_path, shortcut)
-            try:
-                # Build the command to open the shortcut with the script URL
-                cmd = [
-                    'cmd', '/c', 'start', '',  # Use cmd /c start to open the shortcut
-                    shortcut_path,
-                    script_url,
-                    '--window-size=500,500',  # Set window size (adjust as needed)
-                ]
-
-                subprocess.Popen(cmd, shell=False)
-                logging.info(f"Opened script URL in Chrome profile using shortcut '{shortcut}'.")
-            except Exception as e:
-                logging.error(f"Failed to open script URL with shortcut '{shortcut}': {e}")
-
-        logging.info("Please confirm the script installation in each opened browser window.")
-        """Open the Chrome extensions page with developer mode instructions."""
-        try:
-            import win32com.client
-        except ImportError:
-            logging.error("Required module 'pywin32' not installed. Please install it using 'pip install pywin32'.")
-            return
+        names = ", ".join(profile.name for profile in profiles)
+        logging.info(f"Opening {len(profiles)} Chrome profiles: {names}")
+        job = self._submit(f"Open Chrome profiles: {names}", self._shortcut_launches(profiles, url or self.bo6_url),
+                           supervise=True)
+        return job, unmatched
 
-        shortcuts_path = self.config_manager.get_config('chrome_shortcuts_path')
-        if not shortcuts_path:
-            logging.warning("Chrome shortcuts path is not set. Cannot open developer options.")
-            return
-
-        if not os.path.isdir(shortcuts_path):
-            logging.warning(f"The path '{shortcuts_path}' does not exist or is not a directory.")
-            return
-
-        # List all .lnk files in the directory
-        shortcuts = [f for f in os.listdir(shortcuts_path) if f.endswith('.lnk')]
-        if not shortcuts:
-            logging.warning(f"No shortcut files (.lnk) found in '{shortcuts_path}'.")
-            return
-
-        logging.info(f"Opening developer options in {len(shortcuts)} Chrome profiles.")
-
-        shell = win32com.client.Dispatch("WScript.Shell")
-
-        for shortcut in shortcuts:
-            shortcut_path = os.path.join(shortcuts_path, shortcut)
-            try:
-                sc = shell.CreateShortCut(shortcut_path)
-                # Extract the profile directory from the shortcut's arguments
-                arguments = sc.Arguments
-                profile_dir = None
-                if arguments:
-                    import re
-                    match = re.search(r'--profile-directory=("[^"]+"|\S+)', arguments)
-                    if match:
-                        profile_dir = match.group(1).strip('"')
-                if not profile_dir:
-                    logging.warning(f"Could not determine profile directory from shortcut '{shortcut}'. Skipping.")
-                    continue
-
-                # Path to Chrome executable
-                chrome_exe_path = sc.Targetpath
-
-                if not os.path.isfile(chrome_exe_path):
-                    logging.error(f"Chrome executable not found at '{chrome_exe_path}'.")
-                    continue
-
-                cmd = [
-                    chrome_exe_path,
-                    f'--profile-directory="{profile_dir}"',
-                    'chrome://extensions/',
-                    '--window-size=500,500',  # Set window size (adjust as needed)
-                ]
-                subprocess.Popen(cmd)
-                logging.info(f"Opened developer options in Chrome profile '{profile_dir}'.")
-            except Exception as e:
-                logging.error(f"Failed to open developer options with shortcut '{shortcut}': {e}")
-
-        logging.info("Please enable 'Developer mode' in each opened browser window.")
+    def install_tampermonkey_script_in_all_profiles(self, script_url):
+        """
+        Open the user script URL in all profiles to prompt Tampermonkey installation,
+        followed by the extensions page for enabling developer mode.
+        Returns the LaunchJob or None.
+        """
+        profiles = self._list_profiles("install script")
+        if not profiles:
+            return None
+
+        logging.info(f"Opening script URL '{script_url}' in {len(profiles)} Chrome profiles.")
+        launches = self._shortcut_launches(profiles, script_url)
+        launches += self._developer_options_launches(profiles)
+        job = self._submit("Install Tampermonkey script", launches)
+
+        logging.info("Please confirm the script installation and enable 'Developer mode' in each opened browser window.")
+        return job
+
+    def _developer_options_launches(self, profiles):
+        """Build launches that open chrome://extensions/ in each profile, from the catalog's parsed shortcuts."""
+        launches = []
+        for profile in profiles:
+            if not profile.profile_dir:
+                logging.warning(f"Could not determine profile directory from shortcut '{profile.name}'. Skipping.")
+                continue
+
+            if not profile.exe_path or not os.path.isfile(profile.exe_path):
+                logging.error(f"Chrome executable not found at '{profile.exe_path}'.")
+                continue
+
+            launches.append((f"{profile.profile_dir} (developer options)", [
+                profile.exe_path,
+                f'--profile-directory="{profile.profile_dir}"',
+                'chrome://extensions/',
+                '--window-size=500,500',  # Set window size (adjust as needed)
+            ]))
+        return launches
 
+    def install_extension_on_all_profiles(self, extension_url):
+        """Open the Chrome Web Store page of an extension in all profiles. Returns the LaunchJob or None."""
+        profiles = self._list_profiles("install extension")
+        if not profiles:
+            return None
 
+        logging.info(f"Opening extension page '{extension_url}' in {len(profiles)} Chrome profiles.")
+        job = self._submit("Install extension", self._shortcut_launches(profiles, extension_url))
 
-    def install_extension_on_all_profiles(self, extension_url):
-        """Open the Chrome Web Store page of an extension in all profiles."""
-        shortcuts_path = self.config_manager.get_config('chrome_shortcuts_path')
-        if not shortcuts_path:
-            logging.warning("Chrome shortcuts path is not set. Cannot install extension.")
-            return
-
-        if not os.path.isdir(shortcuts_path):
-            logging.warning(f"The path '{shortcuts_path}' does not exist or is not a directory.")
-            return
-
-        # List all .lnk files in the directory
-        shortcuts = [f for f in os.listdir(shortcuts_path) if f.endswith('.lnk')]
-        if not shortcuts:
-            logging.warning(f"No shortcut files (.lnk) found in '{shortcuts_path}'.")
-            return
-
-        logging.info(f"Opening extension page '{extension_url}' in {len(shortcuts)} Chrome profiles.")
-
-        for shortcut in shortcuts:
-            shortcut_path = os.path.join(shortcuts_path, shortcut)
-            try:
-                # Build the command to open the shortcut with the extension URL
-                cmd = [
-                    'cmd', '/c', 'start', '',  # Use cmd /c start to open the shortcut
-                    shortcut_path,
-                    extension_url,
-                    '--window-size=500,500',  # Set window size (adjust as needed)
-                ]
-
-                subprocess.Popen(cmd, shell=False)
-                logging.info(f"Opened extension page in Chrome profile using shortcut '{shortcut}'.")
-            except Exception as e:
-                logging.error(f"Failed to open extension page with shortcut '{shortcut}': {e}")
-
-        logging.info("Please manually install the extension in each opened browser window.")
\ No newline at end of file
+        logging.info("Please manually install the extension in each opened browser window.")
+        return job
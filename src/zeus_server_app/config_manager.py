@@ -1,43 +1,128 @@
-import sqlite3
+import time
 import logging
+import threading
+from zeus_server_app.storage import Database
 
 class ConfigManager:
     """Manages configuration settings using SQLite database."""
 
+    # Values treated as True by get_bool
+    TRUE_VALUES = frozenset(["1", "true", "yes", "on"])
+
+    # Seconds a key missing from the database is remembered before it is read again
+    MISS_TTL = 1.0
+
     def __init__(self, db_path="hwids.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db = Database.for_path(db_path)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._misses = {}  # key -> monotonic time until which the miss is trusted
+        self._subscribers = []
         self.create_config_table()
+        self.reload()
 
     def create_config_table(self):
         """Create the config table if it doesn't exist."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self.db.execute('''
             CREATE TABLE IF NOT EXISTS config (
                 key TEXT PRIMARY KEY,
                 value TEXT
             )
         ''')
-        self.conn.commit()
 
-    def get_config(self, key):
+    def reload(self):
+        """Load every configuration value into the in-memory view."""
+        rows = self.db.query_all('SELECT key, value FROM config')
+        with self._lock:
+            self._cache = dict(rows)
+            self._misses = {}
+
+    def get_config(self, key, default=None):
         """Retrieve a configuration value by key."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
-        result = cursor.fetchone()
-        return result[0] if result else None
+        try:
+            value = self._cache[key]
+        except KeyError:
+            if self._misses.get(key, 0.0) > time.monotonic():
+                return default
+            # Read through: the key may have been written by another process, so
+            # a miss is only remembered for MISS_TTL seconds
+            result = self.db.query_one('SELECT value FROM config WHERE key = ?', (key,))
+            with self._lock:
+                if result and result[0] is not None:
+                    value = self._cache.setdefault(key, result[0])
+                else:
+                    value = None
+                    self._misses[key] = time.monotonic() + self.MISS_TTL
+        return default if value is None else value
+
+    def get_int(self, key, default=None):
+        """Retrieve a configuration value as an int, or `default` if unset or invalid."""
+        return self._get_typed(key, int, default)
+
+    def get_float(self, key, default=None):
+        """Retrieve a configuration value as a float, or `default` if unset or invalid."""
+        return self._get_typed(key, float, default)
+
+    def get_bool(self, key, default=None):
+        """Retrieve a configuration value as a bool, or `default` if unset."""
+        value = self.get_config(key)
+        if value is None:
+            return default
+        return str(value).strip().lower() in self.TRUE_VALUES
+
+    def _get_typed(self, key, cast, default):
+        value = self.get_config(key)
+        if value is None:
+            return default
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            logging.warning(f"Configuration '{key}' has invalid value '{value}', using default {default!r}.")
+            return default
 
     def set_config(self, key, value):
         """Set or update a configuration value."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self.set_configs({key: value})
+
+    def set_configs(self, values):
+        """Set or update several configuration values with a single commit."""
+        self.db.executemany('''
             INSERT INTO config (key, value)
             VALUES (?, ?)
             ON CONFLICT(key) DO UPDATE SET value = excluded.value
-        ''', (key, value))
-        self.conn.commit()
-        logging.info(f"Configuration '{key}' set to '{value}'.")
+        ''', list(values.items()))
+        with self._lock:
+            self._cache.update(values)
+            for key in values:
+                self._misses.pop(key, None)
+        for key, value in values.items():
+            logging.info(f"Configuration '{key}' set to '{value}'.")
+            self._notify(key, value)
+
+    def subscribe(self, callback, keys=None):
+        """
+        Call `callback(key, value)` whenever one of `keys` is set.
+        With `keys=None` the callback receives every change.
+        """
+        keys = frozenset(keys) if keys is not None else None
+        with self._lock:
+            self._subscribers = self._subscribers + [(callback, keys)]
+
+    def unsubscribe(self, callback):
+        """Remove a callback registered with subscribe."""
+        with self._lock:
+            self._subscribers = [(cb, keys) for cb, keys in self._subscribers if cb != callback]
+
+    def _notify(self, key, value):
+        for callback, keys in self._subscribers:
+            if keys is not None and key not in keys:
+                continue
+            try:
+                callback(key, value)
+            except Exception as e:
+                logging.error(f"Config subscriber failed for '{key}': {e}")
 
     def close(self):
         """Close the database connection."""
-        self.conn.close()
+        self.db.close()
@@ -0,0 +1,53 @@
+import logging
+from zeus_server_app.gamepad_controller import GamepadController
+from zeus_server_app.scheduler import InputScheduler
+from zeus_server_app.gamepad_backend import get_backend
+
+class GamepadFleet:
+    """
+    Pool of virtual controllers in one process, addressed by pad ID
+    (0 to size - 1). All pads share a single InputScheduler thread.
+    With autostart=False the pads stay idle until start() is called.
+    """
+
+    # Upper bound on pads per process; ViGEmBus itself tops out around here
+    MAX_PADS = 64
+
+    def __init__(self, size=1, scheduler=None, backend=None, autostart=True):
+        if not 1 <= size <= self.MAX_PADS:
+            raise ValueError(f"Gamepad count must be between 1 and {self.MAX_PADS}, got {size}")
+        self.backend = backend or get_backend()
+        self.scheduler = scheduler or InputScheduler()
+        self.scheduler.start()
+        self.controllers = [GamepadController(scheduler=self.scheduler, backend=self.backend, autostart=autostart)
+                            for _ in range(size)]
+        logging.info(f"Gamepad fleet started with {size} pad(s).")
+
+    def __len__(self):
+        return len(self.controllers)
+
+    def get(self, pad_id):
+        """Return the controller for `pad_id`. Raises KeyError for unknown pads."""
+        if not 0 <= pad_id < len(self.controllers):
+            raise KeyError(pad_id)
+        return self.controllers[pad_id]
+
+    def start(self):
+        """Start the default Anti-AFK cycle on every pad."""
+        for controller in self.controllers:
+            controller.start()
+
+    def apply_config(self, key, value):
+        """Apply a config change to every pad (ConfigManager subscription callback)."""
+        for controller in self.controllers:
+            controller.apply_config(key, value)
+
+    def status(self):
+        """Return {pad_id: mode} for every pad."""
+        return {pad_id: controller.mode for pad_id, controller in enumerate(self.controllers)}
+
+    def shutdown(self):
+        """Stop every pad, then the shared scheduler."""
+        for controller in self.controllers:
+            controller.shutdown()
+        self.scheduler.stop()
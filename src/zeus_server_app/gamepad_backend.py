@@ -0,0 +1,149 @@
+import os
+import time
+import logging
+import threading
+from collections import deque, namedtuple
+from enum import IntFlag
+
+class XUSB_BUTTON(IntFlag):
+    """XInput button bits, identical to vgamepad.XUSB_BUTTON."""
+    XUSB_GAMEPAD_DPAD_UP = 0x0001
+    XUSB_GAMEPAD_DPAD_DOWN = 0x0002
+    XUSB_GAMEPAD_DPAD_LEFT = 0x0004
+    XUSB_GAMEPAD_DPAD_RIGHT = 0x0008
+    XUSB_GAMEPAD_START = 0x0010
+    XUSB_GAMEPAD_BACK = 0x0020
+    XUSB_GAMEPAD_LEFT_THUMB = 0x0040
+    XUSB_GAMEPAD_RIGHT_THUMB = 0x0080
+    XUSB_GAMEPAD_LEFT_SHOULDER = 0x0100
+    XUSB_GAMEPAD_RIGHT_SHOULDER = 0x0200
+    XUSB_GAMEPAD_GUIDE = 0x0400
+    XUSB_GAMEPAD_A = 0x1000
+    XUSB_GAMEPAD_B = 0x2000
+    XUSB_GAMEPAD_X = 0x4000
+    XUSB_GAMEPAD_Y = 0x8000
+
+
+# One report sent to a recording pad. `timestamp` is time.perf_counter().
+Report = namedtuple("Report", [
+    "timestamp", "buttons", "left_trigger", "right_trigger",
+    "left_x", "left_y", "right_x", "right_y",
+])
+
+
+class VGamepadBackend:
+    """Virtual Xbox 360 pads through the ViGEmBus driver (Windows only)."""
+
+    name = "vgamepad"
+
+    def check(self):
+        """Import vgamepad, raising if the package or the ViGEmBus driver is unavailable."""
+        import vgamepad  # noqa: F401
+
+    def create_pad(self):
+        import vgamepad as vg
+        return vg.VX360Gamepad()
+
+
+class RecordingPad:
+    """In-memory pad with the VX360Gamepad interface that records every report."""
+
+    def __init__(self, max_reports=100000):
+        self._lock = threading.Lock()
+        self.buttons = 0
+        self.left_trigger_value = 0
+        self.right_trigger_value = 0
+        self.left_stick = (0.0, 0.0)
+        self.right_stick = (0.0, 0.0)
+        self.reports = deque(maxlen=max_reports)
+
+    def press_button(self, button):
+        self.buttons |= int(button)
+
+    def release_button(self, button):
+        self.buttons &= ~int(button)
+
+    def left_trigger(self, value):
+        self.left_trigger_value = value
+
+    def right_trigger(self, value):
+        self.right_trigger_value = value
+
+    def left_trigger_float(self, value_float):
+        self.left_trigger_value = int(round(value_float * 255))
+
+    def right_trigger_float(self, value_float):
+        self.right_trigger_value = int(round(value_float * 255))
+
+    def left_joystick_float(self, x_value_float, y_value_float):
+        self.left_stick = (x_value_float, y_value_float)
+
+    def right_joystick_float(self, x_value_float, y_value_float):
+        self.right_stick = (x_value_float, y_value_float)
+
+    def reset(self):
+        self.buttons = 0
+        self.left_trigger_value = self.right_trigger_value = 0
+        self.left_stick = self.right_stick = (0.0, 0.0)
+
+    def update(self):
+        report = Report(
+            time.perf_counter(), self.buttons, self.left_trigger_value, self.right_trigger_value,
+            self.left_stick[0], self.left_stick[1], self.right_stick[0], self.right_stick[1],
+        )
+        with self._lock:
+            self.reports.append(report)
+
+    def snapshot(self):
+        """Return a list copy of the recorded reports."""
+        with self._lock:
+            return list(self.reports)
+
+
+class RecordingBackend:
+    """Headless backend whose pads record timestamped reports; for tests and benchmarks on any OS."""
+
+    name = "recording"
+
+    def __init__(self, max_reports=100000):
+        self.max_reports = max_reports
+        self.pads = []
+
+    def check(self):
+        pass
+
+    def create_pad(self):
+        pad = RecordingPad(self.max_reports)
+        self.pads.append(pad)
+        return pad
+
+
+class NullBackend(RecordingBackend):
+    """Headless backend that keeps no report history."""
+
+    name = "null"
+
+    def __init__(self):
+        super().__init__(max_reports=0)
+
+
+BACKENDS = {
+    VGamepadBackend.name: VGamepadBackend,
+    RecordingBackend.name: RecordingBackend,
+    NullBackend.name: NullBackend,
+}
+
+
+def get_backend(name=None):
+    """
+    Create a gamepad backend by name. Defaults to the ZEUS_GAMEPAD_BACKEND
+    environment variable, then to 'vgamepad'.
+    """
+    name = name or os.environ.get("ZEUS_GAMEPAD_BACKEND") or VGamepadBackend.name
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown gamepad backend '{name}'. Expected one of: {', '.join(BACKENDS)}")
+    if name != VGamepadBackend.name:
+        logging.info(f"Using '{name}' gamepad backend.")
+    return backend_class()
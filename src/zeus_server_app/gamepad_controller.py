@@ -1,24 +1,96 @@
 import time
+import json
 import random
 import threading
-import vgamepad as vg
+from collections import namedtuple
+from concurrent.futures import Future
 import logging
+from zeus_server_app.scheduler import InputScheduler
+from zeus_server_app.gamepad_backend import XUSB_BUTTON, get_backend
+from zeus_server_app.pad_state import PadState
+from zeus_server_app.analog_stream import AnalogStream
+
+# One step of a macro: `name` is a button/trigger name or None for a pure wait.
+# `hold` and `gap` are in seconds.
+MacroStep = namedtuple("MacroStep", ["name", "hold", "gap"])
+
 
 class GamepadController:
-    def __init__(self):
+    # Buttons and triggers addressable from macros
+    MACRO_BUTTONS = {
+        "a": XUSB_BUTTON.XUSB_GAMEPAD_A,
+        "b": XUSB_BUTTON.XUSB_GAMEPAD_B,
+        "x": XUSB_BUTTON.XUSB_GAMEPAD_X,
+        "y": XUSB_BUTTON.XUSB_GAMEPAD_Y,
+        "lb": XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER,
+        "rb": XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER,
+        "start": XUSB_BUTTON.XUSB_GAMEPAD_START,
+        "back": XUSB_BUTTON.XUSB_GAMEPAD_BACK,
+        "ls": XUSB_BUTTON.XUSB_GAMEPAD_LEFT_THUMB,
+        "rs": XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_THUMB,
+        "dpad_up": XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP,
+        "dpad_down": XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN,
+        "dpad_left": XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT,
+        "dpad_right": XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT,
+    }
+    MACRO_TRIGGERS = ("lt", "rt")
+
+    # Macro defaults and limits
+    MACRO_DEFAULT_HOLD = 0.1  # seconds, same as a short press
+    MACRO_DEFAULT_GAP = 0.1   # seconds between steps
+    MACRO_MAX_STEPS = 256
+    MACRO_MAX_DURATION = 60.0  # seconds
+
+    # Config keys (ConfigManager) that override the timing attributes of the same name
+    CONFIG_KEYS = (
+        "anti_afk_interval", "right_bumper_duration", "left_bumper_duration", "delay_between_buttons",
+        "min_movement_duration", "max_movement_duration", "min_break_duration", "max_break_duration",
+        "analog_tick",
+    )
+
+    # Commands handled by execute_gamepad_command
+    GAMEPAD_COMMANDS = frozenset([
+        "press_a", "press_b", "press_x", "press_y",
+        "press_lb", "press_rb", "press_lt", "press_rt",
+        "press_dpad_up", "press_dpad_down", "press_dpad_left", "press_dpad_right",
+        "press_start", "press_back", "press_ls", "press_rs",
+    ])
+
+    # Short press duration for face buttons and the D-Pad
+    SHORT_PRESS_DURATION = 0.1  # seconds
+    # Joystick update interval while movement is active
+    MOVEMENT_TICK = 0.1  # seconds
+    # Analog streaming: interval between applied samples, and keyframes queued per pad
+    ANALOG_TICK = 0.01  # seconds
+    ANALOG_MAX_BUFFERED = 2048
+
+    def __init__(self, scheduler=None, backend=None, autostart=True):
         self.running = True
         self.anti_afk_enabled = True    # Anti-AFK enabled by default
         self.movement_enabled = False
-        self.gamepad = vg.VX360Gamepad()
-        self.lock = threading.Lock()
-
-        # Events for stopping loops promptly
-        self.anti_afk_stop_event = threading.Event()
-        self.movement_stop_event = threading.Event()
-
-        # Threads for loops
-        self._anti_afk_thread = None
-        self._movement_thread = None
+        self.backend = backend or get_backend()
+        self.gamepad = self.backend.create_pad()
+
+        # All presses, releases and loop steps run as timed events on one scheduler thread
+        # A scheduler passed in (e.g. by GamepadFleet) is shared and stopped by its owner
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or InputScheduler()
+        self.scheduler.start()
+
+        # Inputs change the pad model; the scheduler sends at most one report per tick
+        self.pad = PadState(self.gamepad, self.scheduler)
+        # Client-streamed stick and trigger motion, applied at a fixed tick
+        self.analog = AnalogStream(self.pad, self.scheduler, self.ANALOG_TICK, self.ANALOG_MAX_BUFFERED)
+
+        # Next pending event of each loop, cancelled to stop the loop promptly.
+        # The lock guards the enabled flags and these handles between the
+        # start/stop callers and the loop steps on the scheduler thread; each
+        # start bumps the loop's run number so steps of an earlier run end.
+        self._loops_lock = threading.Lock()
+        self._anti_afk_event = None
+        self._movement_event = None
+        self._anti_afk_run = 0
+        self._movement_run = 0
 
         # Default configuration values
         # Anti-AFK settings
@@ -33,8 +105,14 @@ class GamepadController:
         self.min_break_duration = 3.0     # seconds
         self.max_break_duration = 7.0     # seconds
 
-        # Start anti-afk by default
-        self.start_anti_afk()
+        # Start anti-afk by default, unless the owner starts it later with start()
+        if autostart:
+            self.start()
+
+    def start(self):
+        """Begin the default Anti-AFK cycle."""
+        if self.anti_afk_enabled:
+            self.start_anti_afk()
 
     # Configuration Setters
     def set_anti_afk_settings(self, interval=None, right_bumper_duration=None, left_bumper_duration=None, delay_between_buttons=None):
@@ -67,100 +145,253 @@ class GamepadController:
             self.max_break_duration = max_break_duration
             logging.info(f"Maximum break duration set to {max_break_duration} seconds")
 
+    def apply_config(self, key, value):
+        """Apply a ConfigManager value (e.g. from a change subscription) to the matching setting."""
+        if key not in self.CONFIG_KEYS or value is None:
+            return
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            logging.warning(f"Ignoring invalid gamepad setting '{key}': {value!r}")
+            return
+        setattr(self, key, value)
+        logging.info(f"Gamepad setting '{key}' set to {value} seconds")
+
+    @property
+    def analog_tick(self):
+        """Seconds between applied analog stream samples."""
+        return self.analog.tick
+
+    @analog_tick.setter
+    def analog_tick(self, value):
+        self.analog.tick = max(AnalogStream.MIN_TICK, value)
+
+    @property
+    def mode(self):
+        """Current pad state: 'stopped', 'movement', 'anti_afk' or 'idle'."""
+        if not self.running:
+            return "stopped"
+        if self.movement_enabled:
+            return "movement"
+        if self._anti_afk_event is not None:
+            return "anti_afk"
+        return "idle"
+
     def get_supported_commands(self):
-        """Return a list of supported gamepad commands."""
-        return [
-            "press_a", "press_b", "press_x", "press_y",
-            "press_lb", "press_rb", "press_lt", "press_rt",
-            "press_dpad_up", "press_dpad_down", "press_dpad_left", "press_dpad_right",
-            "press_start", "press_back", "press_ls", "press_rs"
-        ]
+        """Return the supported gamepad commands."""
+        return self.GAMEPAD_COMMANDS
 
     def execute_gamepad_command(self, command):
-        """Execute the corresponding gamepad command."""
+        """
+        Schedule the corresponding gamepad command. Returns a Future that
+        completes when the button is released (None if the command failed).
+        """
         try:
             method = getattr(self, command)
-            method()
-            logging.info(f"Executed gamepad command: {command}")
+            future = method()
+            logging.debug(f"Executed gamepad command: {command}")
+            return future
         except AttributeError:
             logging.error(f"Unsupported gamepad command: {command}")
         except Exception as e:
             logging.error(f"Failed to execute gamepad command '{command}': {e}")
+        return None
+
+    def parse_macro(self, text):
+        """
+        Parse a macro description into a list of MacroStep.
+
+        Accepts either a JSON list such as
+        `[{"button": "dpad_down", "hold_ms": 100, "gap_ms": 50, "repeat": 3}, {"wait_ms": 500}, {"button": "a"}]`
+        or the compact form `dpad_down:100:50*3 wait:500 a`, where each token is
+        `<button>[:hold_ms[:gap_ms]][*repeat]` or `wait:<ms>`.
+        Raises ValueError on malformed input.
+        """
+        text = text.strip()
+        if not text:
+            raise ValueError("macro has no steps")
+
+        if text.startswith("["):
+            try:
+                entries = json.loads(text)
+            except ValueError as e:
+                raise ValueError(f"invalid JSON: {e}")
+            if not isinstance(entries, list):
+                raise ValueError("JSON macro must be a list of steps")
+            raw_steps = []
+            for entry in entries:
+                if not isinstance(entry, dict):
+                    raise ValueError(f"invalid step: {entry!r}")
+                if "wait_ms" in entry:
+                    raw_steps.append((None, entry["wait_ms"], 0, 1))
+                elif "button" not in entry:
+                    raise ValueError(f"step needs 'button' or 'wait_ms': {entry!r}")
+                else:
+                    raw_steps.append((entry.get("button"), entry.get("hold_ms"), entry.get("gap_ms"), entry.get("repeat", 1)))
+        else:
+            raw_steps = []
+            for token in text.replace(",", " ").split():
+                token, _, repeat = token.partition("*")
+                parts = token.split(":")
+                if parts[0] == "wait":
+                    if len(parts) != 2:
+                        raise ValueError(f"invalid wait step: {token!r}")
+                    raw_steps.append((None, parts[1], 0, repeat or 1))
+                else:
+                    if len(parts) > 3:
+                        raise ValueError(f"invalid step: {token!r}")
+                    hold = parts[1] if len(parts) > 1 else None
+                    gap = parts[2] if len(parts) > 2 else None
+                    raw_steps.append((parts[0], hold, gap, repeat or 1))
+
+        steps = []
+        for name, hold_ms, gap_ms, repeat in raw_steps:
+            if name is not None:
+                name = str(name).lower()
+                if name.startswith("press_"):
+                    name = name[len("press_"):]
+                if name not in self.MACRO_BUTTONS and name not in self.MACRO_TRIGGERS:
+                    raise ValueError(f"unknown button '{name}'")
+            try:
+                hold = self.MACRO_DEFAULT_HOLD if hold_ms is None else float(hold_ms) / 1000.0
+                gap = (0.0 if name is None else self.MACRO_DEFAULT_GAP) if gap_ms is None else float(gap_ms) / 1000.0
+                repeat = int(repeat)
+            except (TypeError, ValueError):
+                raise ValueError(f"invalid timing for step '{name or 'wait'}'")
+            if hold < 0 or gap < 0 or repeat < 1:
+                raise ValueError(f"timings must not be negative and repeat must be at least 1 for step '{name or 'wait'}'")
+            # Checked before expanding, so a huge repeat count is never allocated
+            if len(steps) + repeat > self.MACRO_MAX_STEPS:
+                raise ValueError(f"macro has more than {self.MACRO_MAX_STEPS} steps")
+            steps.extend([MacroStep(name, hold, gap)] * repeat)
+
+        total = sum(step.hold + step.gap for step in steps)
+        if total > self.MACRO_MAX_DURATION:
+            raise ValueError(f"macro lasts {total:.1f}s, limit is {self.MACRO_MAX_DURATION:.0f}s")
+        return steps
+
+    def run_macro(self, steps):
+        """
+        Schedule every macro step against absolute deadlines in one pass.
+        Returns a Future resolving to the measured per-step timings in milliseconds.
+        """
+        future = Future()
+        timings = []
+        now = time.monotonic()
+        start = now + 0.001  # Small lead so the first press is not already late
+        deadline = start
+        for index, step in enumerate(steps):
+            timings.append({"step": step.name or "wait"})
+            self.scheduler.call_at(deadline, self._macro_event, step.name, True, timings[index], start)
+            deadline += step.hold
+            self.scheduler.call_at(deadline, self._macro_event, step.name, False, timings[index], start)
+            deadline += step.gap
+        self.scheduler.call_at(deadline, self._finish_macro, future, timings, start)
+        return future
+
+    def _macro_event(self, name, pressed, timing, start):
+        """Press or release one macro step and record when it happened."""
+        self._macro_input(name, pressed)
+        elapsed_ms = round((time.monotonic() - start) * 1000, 2)
+        if pressed:
+            timing["start_ms"] = elapsed_ms
+        else:
+            timing["held_ms"] = round(elapsed_ms - timing["start_ms"], 2)
+
+    def _finish_macro(self, future, timings, start):
+        total_ms = (time.monotonic() - start) * 1000
+        logging.info(f"Executed macro with {len(timings)} steps in {total_ms:.1f} ms")
+        future.set_result({"steps": timings, "total_ms": round(total_ms, 2)})
+
+    def _macro_input(self, name, pressed):
+        """Press or release a macro button/trigger. Wait steps (name None) do nothing."""
+        if name is None:
+            return
+        if name == "lt":
+            self.pad.set_left_trigger(255 if pressed else 0)
+        elif name == "rt":
+            self.pad.set_right_trigger(255 if pressed else 0)
+        elif pressed:
+            self.pad.press_button(self.MACRO_BUTTONS[name])
+        else:
+            self.pad.release_button(self.MACRO_BUTTONS[name])
+
+    def stream_analog(self, samples=None, curve=None):
+        """
+        Queue timestamped analog samples or a curve on this pad's stream.
+        Random movement would fight the stream for the left stick, so it is stopped.
+        Returns the counts of the push.
+        """
+        if self.movement_enabled:
+            self.stop_movement()
+        if curve is not None:
+            return self.analog.curve(curve)
+        return self.analog.push(samples)
 
-    # Thread start/stop methods for Anti-AFK
+    # Start/stop methods for Anti-AFK
     def start_anti_afk(self):
-        """Start the anti-AFK loop in a separate thread if not already running."""
+        """Start the anti-AFK cycle on the scheduler if not already running."""
         # If movement is running, stop it first to avoid conflicts
         if self.movement_enabled:
             self.stop_movement()
 
-        if self._anti_afk_thread and self._anti_afk_thread.is_alive():
-            logging.info("Anti-AFK thread is already running.")
-            return
-
-        if not self.anti_afk_enabled:
-            # Anti-AFK not enabled, enable it first
+        with self._loops_lock:
+            if self._anti_afk_event is not None and not self._anti_afk_event.cancelled:
+                logging.info("Anti-AFK is already running.")
+                return
             self.anti_afk_enabled = True
-
-        self.anti_afk_stop_event.clear()
-        self._anti_afk_thread = threading.Thread(target=self.anti_afk_loop, daemon=True)
-        self._anti_afk_thread.start()
-        logging.info("Anti-AFK thread started.")
+            self._anti_afk_run += 1
+            self._anti_afk_event = self.scheduler.call_soon(self._anti_afk_cycle, self._anti_afk_run)
+        logging.info("Anti-AFK started.")
 
     def stop_anti_afk(self):
-        """Stop the anti-AFK loop."""
-        if not self.anti_afk_enabled:
-            logging.info("Anti-AFK is not running.")
-            return
-
-        self.anti_afk_enabled = False
-        self.anti_afk_stop_event.set()
-
-        if self._anti_afk_thread is not None:
-            self._anti_afk_thread.join(timeout=10)
-            if self._anti_afk_thread.is_alive():
-                logging.warning("Anti-AFK thread did not terminate within timeout.")
-            else:
-                logging.info("Anti-AFK thread stopped.")
-            self._anti_afk_thread = None
+        """Stop the anti-AFK cycle."""
+        with self._loops_lock:
+            if not self.anti_afk_enabled:
+                logging.info("Anti-AFK is not running.")
+                return
+            self.anti_afk_enabled = False
+            event, self._anti_afk_event = self._anti_afk_event, None
+        if event is not None:
+            event.cancel()
+            logging.info("Anti-AFK stopped.")
 
         self._reset_gamepad()
 
-    # Thread start/stop methods for Movement
+    # Start/stop methods for Movement
     def start_movement(self):
-        """Start the movement loop in a separate thread. Also stops anti-afk if running."""
-        if self._movement_thread and self._movement_thread.is_alive():
-            logging.info("Movement thread is already running.")
+        """Start the movement cycle on the scheduler. Also stops anti-afk and any analog stream."""
+        with self._loops_lock:
+            running = self._movement_event is not None and not self._movement_event.cancelled
+        if running:
+            logging.info("Movement is already running.")
             return
 
         # Stop Anti-AFK if it's running
         if self.anti_afk_enabled:
             self.stop_anti_afk()
+        self.analog.stop()
 
-        self.movement_enabled = True
-        self.movement_stop_event.clear()
-        self._movement_thread = threading.Thread(target=self.movement_loop, daemon=True)
-        self._movement_thread.start()
-        logging.info("Movement thread started.")
+        with self._loops_lock:
+            self.movement_enabled = True
+            self._movement_run += 1
+            self._movement_event = self.scheduler.call_soon(self._movement_phase, self._movement_run)
+        logging.info("Movement started.")
 
     def stop_movement(self):
-        """Stop the movement loop. Also re-start anti-afk if it was originally enabled."""
-        if not self.movement_enabled:
+        """Stop the movement cycle. Also re-start anti-afk if it was originally enabled."""
+        with self._loops_lock:
+            was_enabled = self.movement_enabled
+            self.movement_enabled = False
+            event, self._movement_event = self._movement_event, None
+        if event is not None:
+            event.cancel()
+        if not was_enabled:
             logging.info("Movement is not running.")
             # Even if not running, reset the gamepad to ensure neutral state
             self._reset_gamepad()
             return
-
-        self.movement_enabled = False
-        self.movement_stop_event.set()
-
-        if self._movement_thread is not None:
-            self._movement_thread.join(timeout=10)
-            if self._movement_thread.is_alive():
-                logging.warning("Movement thread did not terminate within timeout.")
-            else:
-                logging.info("Movement thread stopped.")
-            self._movement_thread = None
+        logging.info("Movement stopped.")
 
         self._reset_gamepad()
 
@@ -168,130 +399,169 @@ class GamepadController:
         if self.running and self.anti_afk_enabled:
             self.start_anti_afk()
 
-    def anti_afk_loop(self):
-        """Anti-AFK loop that periodically presses RB and LB."""
-        logging.info("Anti-AFK loop started")
-        try:
-            while self.running:
-                if not self.anti_afk_enabled:
-                    time.sleep(0.1)
-                    continue
-
-                with self.lock:
-                    self._press_button_for_duration(vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER, "RB", self.right_bumper_duration)
-                    time.sleep(self.delay_between_buttons)
-                    self._press_button_for_duration(vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER, "LB", self.left_bumper_duration)
-
-                logging.info(f"Anti-AFK: Waiting {self.anti_afk_interval} seconds")
-                if self._wait_or_stop(self.anti_afk_stop_event, self.anti_afk_interval):
-                    break
-        except Exception as e:
-            logging.error(f"Exception in anti_afk_loop: {e}")
-        finally:
-            logging.info("Anti-AFK loop ended")
-
-    def movement_loop(self):
-        """Movement loop that simulates random joystick movements."""
-        logging.info("Movement loop started")
-        try:
-            while self.running:
-                if not self.movement_enabled:
-                    time.sleep(0.1)
-                    continue
-
-                logging.info("Simulating movement...")
-                duration = random.uniform(self.min_movement_duration, self.max_movement_duration)
-                start_time = time.time()
-
-                while self.movement_enabled and (time.time() - start_time) < duration and self.running:
-                    move_x = random.uniform(-1, 1)
-                    move_y = random.uniform(-1, 1)
-                    with self.lock:
-                        self.gamepad.left_joystick_float(x_value_float=move_x, y_value_float=move_y)
-                        self.gamepad.update()
-                    time.sleep(0.1)
-
-                if not self.movement_enabled or not self.running:
-                    break
-
-                logging.info(f"Movement phase complete. Breaking for {duration:.2f} seconds.")
-                if self._wait_or_stop(self.movement_stop_event, random.uniform(self.min_break_duration, self.max_break_duration)):
-                    break
-        except Exception as e:
-            logging.error(f"Exception in movement_loop: {e}")
-        finally:
-            logging.info("Movement loop ended")
+    def _loop_current(self, enabled, run, current_run):
+        """Whether a loop step of `run` should continue (loops lock held)."""
+        return self.running and enabled and run == current_run
+
+    def _anti_afk_cycle(self, run):
+        """One anti-AFK round: hold RB, pause, hold LB, then schedule the next round."""
+        with self._loops_lock:
+            if not self._loop_current(self.anti_afk_enabled, run, self._anti_afk_run):
+                return
+        rb = XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER
+        lb = XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER
+        now = time.monotonic()
+        lb_press = now + self.right_bumper_duration + self.delay_between_buttons
+        self._press_button_for_duration(rb, "RB", self.right_bumper_duration)
+        self.scheduler.call_at(lb_press, self._anti_afk_second_press, lb)
+
+        logging.info(f"Anti-AFK: Waiting {self.anti_afk_interval} seconds")
+        next_cycle = lb_press + self.left_bumper_duration + self.anti_afk_interval
+        with self._loops_lock:
+            # Not rescheduled if the loop was stopped or restarted meanwhile
+            if self._loop_current(self.anti_afk_enabled, run, self._anti_afk_run):
+                self._anti_afk_event = self.scheduler.call_at(next_cycle, self._anti_afk_cycle, run)
+
+    def _anti_afk_second_press(self, button):
+        if self.running and self.anti_afk_enabled:
+            self._press_button_for_duration(button, "LB", self.left_bumper_duration)
+
+    def _movement_phase(self, run):
+        """Start a movement phase of random length, followed by a random break."""
+        with self._loops_lock:
+            if not self._loop_current(self.movement_enabled, run, self._movement_run):
+                return
+        logging.info("Simulating movement...")
+        duration = random.uniform(self.min_movement_duration, self.max_movement_duration)
+        now = time.monotonic()
+        self._movement_tick(now, now + duration, run)
+
+    def _movement_tick(self, deadline, phase_end, run):
+        """Push one random joystick sample and schedule the next tick or the break."""
+        with self._loops_lock:
+            if not self._loop_current(self.movement_enabled, run, self._movement_run):
+                return
+        if deadline < phase_end:
+            move_x = random.uniform(-1, 1)
+            move_y = random.uniform(-1, 1)
+            self.pad.set_left_stick(move_x, move_y)
+            next_tick = deadline + self.MOVEMENT_TICK
+            step = (next_tick, self._movement_tick, next_tick, phase_end, run)
+        else:
+            break_duration = random.uniform(self.min_break_duration, self.max_break_duration)
+            logging.info(f"Movement phase complete. Breaking for {break_duration:.2f} seconds.")
+            step = (phase_end + break_duration, self._movement_phase, run)
+
+        with self._loops_lock:
+            # Not rescheduled if the loop was stopped or restarted meanwhile
+            if self._loop_current(self.movement_enabled, run, self._movement_run):
+                self._movement_event = self.scheduler.call_at(*step)
 
     # Individual Button and Control Methods
     def press_a(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_A, "A")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_A, "A")
 
     def press_b(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_B, "B")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_B, "B")
 
     def press_x(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_X, "X")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_X, "X")
 
     def press_y(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_Y, "Y")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_Y, "Y")
 
     def press_lb(self):
-        self._press_button_for_duration(vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER, "LB", self.left_bumper_duration)
+        return self._press_button_for_duration(XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER, "LB", self.left_bumper_duration)
 
     def press_rb(self):
-        self._press_button_for_duration(vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER, "RB", self.right_bumper_duration)
+        return self._press_button_for_duration(XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER, "RB", self.right_bumper_duration)
 
     def press_start(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_START, "START")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_START, "START")
 
     def press_back(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK, "BACK")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_BACK, "BACK")
 
     def press_ls(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_THUMB, "Left Stick Click")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_LEFT_THUMB, "Left Stick Click")
 
     def press_rs(self):
-        self._press_button(vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_THUMB, "Right Stick Click")
+        return self._press_button(XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_THUMB, "Right Stick Click")
 
     def press_dpad_up(self):
-        self._press_dpad(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP, "DPAD UP")
+        return self._press_dpad(XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP, "DPAD UP")
 
     def press_dpad_down(self):
-        self._press_dpad(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN, "DPAD DOWN")
+        return self._press_dpad(XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN, "DPAD DOWN")
 
     def press_dpad_left(self):
-        self._press_dpad(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT, "DPAD LEFT")
+        return self._press_dpad(XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT, "DPAD LEFT")
 
     def press_dpad_right(self):
-        self._press_dpad(vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT, "DPAD RIGHT")
+        return self._press_dpad(XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT, "DPAD RIGHT")
+
+    def press_lt(self):
+        return self._press_trigger("lt")
+
+    def press_rt(self):
+        return self._press_trigger("rt")
 
     # Helper Methods for Actions
     def _press_button(self, button, name):
         """Press and release a button quickly."""
-        logging.info(f"Pressing '{name}' button (short press)")
-        self.gamepad.press_button(button)
-        self.gamepad.update()
-        time.sleep(0.1)
-        self.gamepad.release_button(button)
-        self.gamepad.update()
+        logging.debug(f"Pressing '{name}' button (short press)")
+        return self._schedule_press(button, self.SHORT_PRESS_DURATION)
 
     def _press_button_for_duration(self, button, name, duration):
         """Press and hold a button for a specified duration."""
-        logging.info(f"Pressing '{name}' button for {duration:.2f} seconds")
-        self.gamepad.press_button(button)
-        self.gamepad.update()
-        time.sleep(duration)
-        self.gamepad.release_button(button)
-        self.gamepad.update()
+        logging.debug(f"Pressing '{name}' button for {duration:.2f} seconds")
+        return self._schedule_press(button, duration)
 
     def _press_dpad(self, button, name):
         """Tap a D-Pad direction briefly."""
-        logging.info(f"Pressing '{name}' (D-Pad)")
-        self.gamepad.press_button(button)
-        self.gamepad.update()
-        time.sleep(0.1)
-        self.gamepad.release_button(button)
-        self.gamepad.update()
+        logging.debug(f"Pressing '{name}' (D-Pad)")
+        return self._schedule_press(button, self.SHORT_PRESS_DURATION)
+
+    def _schedule_press(self, button, duration):
+        """
+        Queue a press now and a release after `duration`. Returns a Future that
+        completes once the button has been released.
+        """
+        future = Future()
+        press_at = time.monotonic()
+        self.scheduler.call_at(press_at, self._set_button, button, True, None)
+        self.scheduler.call_at(press_at + duration, self._set_button, button, False, future)
+        return future
+
+    def _set_button(self, button, pressed, future):
+        try:
+            if pressed:
+                self.pad.press_button(button)
+            else:
+                self.pad.release_button(button)
+        finally:
+            # Never leave a waiting client hanging, even if the driver call failed
+            if future is not None:
+                future.set_result(None)
+
+    def _press_trigger(self, name):
+        """
+        Pull a trigger fully and let go after a short press. Returns a Future
+        that completes once the trigger has been released.
+        """
+        logging.debug(f"Pressing '{name.upper()}' trigger (short press)")
+        future = Future()
+        press_at = time.monotonic()
+        self.scheduler.call_at(press_at, self._set_trigger, name, True, None)
+        self.scheduler.call_at(press_at + self.SHORT_PRESS_DURATION, self._set_trigger, name, False, future)
+        return future
+
+    def _set_trigger(self, name, pressed, future):
+        try:
+            self._macro_input(name, pressed)
+        finally:
+            if future is not None:
+                future.set_result(None)
 
     def toggle_mode(self, mode):
         """Switch between Anti-AFK and Movement mode."""
@@ -308,45 +578,20 @@ class GamepadController:
             self.start_movement()
             logging.info("Switched to Movement mode")
 
-    def _wait_or_stop(self, stop_event, duration):
-        """
-        Wait for `duration` seconds or until `stop_event` is set.
-        Returns True if stopped early (event set), False if waited full duration.
-        """
-        return stop_event.wait(duration)
-
     def _reset_gamepad(self):
         """Reset the gamepad state to neutral."""
-        with self.lock:
-            # Release all buttons
-            for button in [
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_A,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_B,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_X,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_Y,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_SHOULDER,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_SHOULDER,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_START,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_BACK,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_LEFT_THUMB,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_RIGHT_THUMB,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT,
-                vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT
-            ]:
-                self.gamepad.release_button(button)
-
-            # Reset triggers
-            self.gamepad.left_trigger(value=0)
-            self.gamepad.right_trigger(value=0)
-
-            # Center joysticks
-            self.gamepad.left_joystick_float(x_value_float=0.0, y_value_float=0.0)
-            self.gamepad.right_joystick_float(x_value_float=0.0, y_value_float=0.0)
-
-            self.gamepad.update()
-
+        self.pad.reset()
         logging.info("Gamepad reset to neutral state.")
 
-
+    def shutdown(self):
+        """Stop all loops, and the scheduler thread if this controller owns it."""
+        self.running = False
+        if self.anti_afk_enabled:
+            self.stop_anti_afk()
+        if self.movement_enabled:
+            self.stop_movement()
+        self.analog.stop()
+        if self._owns_scheduler:
+            self.scheduler.stop()
+        # Send the final neutral state right away rather than on the next tick
+        self.pad.flush()
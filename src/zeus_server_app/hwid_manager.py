@@ -1,56 +1,102 @@
+import os
+import time
 import sqlite3
 import logging
+import threading
+from zeus_server_app.storage import Database
 
 class HWIDManager:
     """Manages whitelisted HWIDs using SQLite database."""
 
+    # How often (seconds) lookups check whether the DB file changed on disk
+    WHITELIST_REFRESH_INTERVAL = 2.0
+
     def __init__(self, db_path="hwids.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db = Database.for_path(db_path)
+        self._reload_lock = threading.Lock()
+
+        # Immutable snapshot of the whitelist; replaced wholesale on change
+        self._whitelist = frozenset()
+        self._db_signature = None
+        self._next_refresh = 0.0
+
         self.create_hwid_table()
+        self.reload_whitelist()
 
     def create_hwid_table(self):
         """Create HWID table if it doesn't exist."""
-        cursor = self.conn.cursor()
-        cursor.execute('''
+        self.db.execute('''
             CREATE TABLE IF NOT EXISTS hwids (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 hwid TEXT UNIQUE NOT NULL
             )
         ''')
-        self.conn.commit()
+
+    def _file_signature(self):
+        """Return the (mtime, size) of the DB and its WAL file; None for missing files."""
+        signature = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def reload_whitelist(self):
+        """Rebuild the in-memory whitelist snapshot from the database."""
+        with self._reload_lock:
+            signature = self._file_signature()
+            rows = self.db.query_all('SELECT hwid FROM hwids')
+            self._whitelist = frozenset(row[0] for row in rows)
+            self._db_signature = signature
+        logging.info(f"HWID whitelist loaded ({len(self._whitelist)} entries).")
+
+    def _refresh_if_changed(self):
+        """Reload the snapshot if the DB file was modified by someone else."""
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return
+        self._next_refresh = now + self.WHITELIST_REFRESH_INTERVAL
+        if self._file_signature() != self._db_signature:
+            self.reload_whitelist()
 
     def is_hwid_whitelisted(self, hwid):
         """Check if the provided HWID is in the whitelist."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT 1 FROM hwids WHERE hwid = ?', (hwid,))
-        return cursor.fetchone() is not None
+        self._refresh_if_changed()
+        return hwid in self._whitelist
 
     def add_hwid(self, hwid):
         """Add a new HWID to the whitelist."""
-        cursor = self.conn.cursor()
         try:
-            cursor.execute('INSERT INTO hwids (hwid) VALUES (?)', (hwid,))
-            self.conn.commit()
-            logging.info(f"HWID '{hwid}' added to whitelist.")
-            return True
+            self.db.execute('INSERT INTO hwids (hwid) VALUES (?)', (hwid,))
         except sqlite3.IntegrityError:
             logging.warning(f"HWID '{hwid}' is already in the whitelist.")
             return False
+        self.reload_whitelist()
+        logging.info(f"HWID '{hwid}' added to whitelist.")
+        return True
+
+    def add_hwids(self, hwids):
+        """Add many HWIDs in one transaction, skipping ones already whitelisted. Returns the number added."""
+        with self.db.transaction() as conn:
+            cursor = conn.executemany('INSERT OR IGNORE INTO hwids (hwid) VALUES (?)', [(h,) for h in hwids])
+            added = cursor.rowcount
+        self.reload_whitelist()
+        logging.info(f"Added {added} HWIDs to whitelist.")
+        return added
 
     def get_all_hwids(self):
         """Retrieve all HWIDs from the database."""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT hwid FROM hwids ORDER BY id')
-        hwid_list = [row[0] for row in cursor.fetchall()]
-        return hwid_list
+        rows = self.db.query_all('SELECT hwid FROM hwids ORDER BY id')
+        return [row[0] for row in rows]
 
     def delete_hwid(self, hwid):
         """Delete an HWID from the whitelist."""
-        cursor = self.conn.cursor()
-        cursor.execute('DELETE FROM hwids WHERE hwid = ?', (hwid,))
-        self.conn.commit()
+        cursor = self.db.execute('DELETE FROM hwids WHERE hwid = ?', (hwid,))
         if cursor.rowcount > 0:
+            self.reload_whitelist()
             logging.info(f"HWID '{hwid}' deleted from whitelist.")
             return True
         else:
@@ -59,4 +105,4 @@ class HWIDManager:
 
     def close(self):
         """Close the database connection."""
-        self.conn.close()
+        self.db.close()
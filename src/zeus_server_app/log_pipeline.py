@@ -0,0 +1,246 @@
+import os
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+from collections import deque
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler with bounded memory. Once the queue passes `high_water`,
+    records below WARNING are sampled (1 in `sample_every` kept); when it is
+    full, new records are dropped. Dropped records are counted, never blocked on.
+    """
+
+    def __init__(self, log_queue, high_water=None, sample_every=10):
+        super().__init__(log_queue)
+        maxsize = log_queue.maxsize or 0
+        self.high_water = high_water if high_water is not None else int(maxsize * 0.8)
+        self.sample_every = max(1, sample_every)
+        self.dropped = 0
+        self._sampled = 0
+
+    def enqueue(self, record):
+        if self.high_water and record.levelno < logging.WARNING and self.queue.qsize() >= self.high_water:
+            self._sampled += 1
+            if self._sampled % self.sample_every:
+                self.dropped += 1
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Format the message here, but leave exc_info for the listener thread to render
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full queue instead of raising."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class JsonFormatter(logging.Formatter):
+    """Compact JSON-lines formatter: one object per record."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"))
+
+
+class LogSubscription:
+    """
+    One live log follower. Records are buffered up to `max_pending`; a slow
+    reader loses its oldest records (counted in `dropped`) instead of
+    slowing down the broadcaster.
+    """
+
+    def __init__(self, broadcaster, max_pending=1000, on_ready=None):
+        self.broadcaster = broadcaster
+        self.max_pending = max_pending
+        self.on_ready = on_ready
+        self.dropped = 0
+        self._pending = deque()
+        self._condition = threading.Condition()
+
+    def push(self, line):
+        with self._condition:
+            was_empty = not self._pending
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(line)
+            self._condition.notify()
+        # Wake event-loop readers only on the empty -> non-empty transition
+        if was_empty and self.on_ready is not None:
+            self.on_ready()
+
+    def drain(self):
+        """Return (lines, dropped) buffered since the last call, without blocking."""
+        with self._condition:
+            lines = list(self._pending)
+            self._pending.clear()
+            dropped, self.dropped = self.dropped, 0
+        return lines, dropped
+
+    def wait(self, timeout=None):
+        """Block until records are buffered or `timeout` passes, then drain()."""
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+        return self.drain()
+
+    def close(self):
+        self.broadcaster.unsubscribe(self)
+
+
+class LogBroadcaster(logging.Handler):
+    """
+    Handler that keeps the most recent formatted records in a ring buffer and
+    pushes new ones to live subscribers (follow_logs, the menu's log view).
+    """
+
+    def __init__(self, capacity=1000, level=logging.INFO):
+        super().__init__(level)
+        self.setFormatter(logging.Formatter(TEXT_FORMAT))
+        self._ring = deque(maxlen=capacity)
+        self._subscribers = ()
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        # Handler.handle() already holds self.lock here
+        self._ring.append(line)
+        for subscription in self._subscribers:
+            subscription.push(line)
+
+    def recent(self, count):
+        """Return up to `count` of the most recent lines, oldest first."""
+        with self.lock:
+            lines = list(self._ring)
+        return lines[-count:] if count > 0 else []
+
+    def subscribe(self, backlog=0, max_pending=1000, on_ready=None):
+        """Start following new records, primed with the last `backlog` lines."""
+        subscription = LogSubscription(self, max_pending=max_pending, on_ready=on_ready)
+        with self.lock:
+            for line in list(self._ring)[-backlog:] if backlog > 0 else []:
+                subscription.push(line)
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    @property
+    def capacity(self):
+        return self._ring.maxlen
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+class LogPipeline:
+    """Root-logger setup that writes records from a background thread."""
+
+    def __init__(self, handler, use_queue=True, queue_size=10000, broadcaster=None):
+        self.handler = handler
+        self.broadcaster = broadcaster
+        self.listener = None
+        self.queue_handler = None
+        self._handlers = [handler] + ([broadcaster] if broadcaster is not None else [])
+        self._stop_lock = threading.Lock()
+        self._stopped = False
+        if use_queue:
+            log_queue = queue.Queue(maxsize=queue_size)
+            self.queue_handler = BoundedQueueHandler(log_queue)
+            self.listener = DrainingQueueListener(log_queue, *self._handlers, respect_handler_level=True)
+
+    @property
+    def dropped(self):
+        """Number of records dropped or sampled away under load."""
+        return self.queue_handler.dropped if self.queue_handler else 0
+
+    def install(self, level=logging.INFO):
+        """Attach the pipeline to the root logger and start the writer thread."""
+        root = logging.getLogger()
+        root.setLevel(level)
+        if self.queue_handler:
+            root.addHandler(self.queue_handler)
+        else:
+            for handler in self._handlers:
+                root.addHandler(handler)
+        if self.listener:
+            self.listener.start()
+        return self
+
+    def stop(self):
+        """
+        Flush queued records to disk and detach from the root logger.
+        Safe to call more than once, e.g. explicitly and again from atexit.
+        """
+        with self._stop_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        root = logging.getLogger()
+        for handler in [self.queue_handler] + self._handlers:
+            root.removeHandler(handler)
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        if self.dropped:
+            self.handler.handle(root.makeRecord(
+                root.name, logging.WARNING, __file__, 0,
+                f"Logging dropped {self.dropped} records under load.", None, None))
+        self.handler.close()
+
+
+def setup_logging(log_file='server.log', level=logging.INFO, use_queue=True, json_format=None, queue_size=10000,
+                  max_bytes=10 * 1024 * 1024, backup_count=5, rotate_when=None):
+    """
+    Set up logging. Records are written to `log_file` by a background thread
+    (QueueHandler/QueueListener) so hot paths never wait on disk I/O.
+    The file rotates at `max_bytes`, or on a schedule if `rotate_when` is set
+    (e.g. 'midnight'), keeping `backup_count` old segments.
+    `json_format` defaults to the ZEUS_LOG_FORMAT=json environment variable.
+    Returns the LogPipeline; call its stop() to flush on exit.
+    """
+    if json_format is None:
+        json_format = os.environ.get("ZEUS_LOG_FORMAT", "").lower() == "json"
+
+    if rotate_when:
+        handler = logging.handlers.TimedRotatingFileHandler(log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8')
+    else:
+        handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+
+    # Recent records are also kept in memory for follow_logs and the menu's log view
+    broadcaster = LogBroadcaster(level=level)
+    broadcaster.setFormatter(handler.formatter)
+
+    pipeline = LogPipeline(handler, use_queue=use_queue, queue_size=queue_size, broadcaster=broadcaster).install(level)
+    atexit.register(pipeline.stop)
+    return pipeline
@@ -0,0 +1,137 @@
+import os
+import glob
+import logging
+import threading
+
+class _SegmentIndex:
+    """Sparse line index of one log file: the byte offset of every `stride`-th line."""
+
+    __slots__ = ("offsets", "lines", "size", "ends_with_newline")
+
+    def __init__(self):
+        self.offsets = [0]   # offsets[i] is where line i * stride starts
+        self.lines = 0       # complete (newline-terminated) lines indexed
+        self.size = 0        # bytes indexed so far
+        self.ends_with_newline = True
+
+
+class LogTailer:
+    """
+    Tails a rotating log across its segments (server.log, server.log.1, ...
+    or dated suffixes). Each segment keeps a sparse line-offset index that is
+    extended incrementally as the file grows, so returning the last N lines
+    reads only about N lines regardless of file size. Indexes are keyed by
+    inode, so they survive the rename done by rotation. Use for_path() to
+    share one tailer, and its indexes, between callers of the same log.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, log_file='server.log', stride=256, chunk_size=65536):
+        self.log_file = log_file
+        self.stride = stride
+        self.chunk_size = chunk_size
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, log_file='server.log'):
+        """Return the shared LogTailer for `log_file`, creating it on first use."""
+        key = os.path.abspath(log_file)
+        with cls._instances_lock:
+            tailer = cls._instances.get(key)
+            if tailer is None:
+                tailer = cls._instances[key] = cls(log_file)
+            return tailer
+
+    def segments(self):
+        """Return the existing log segments, newest first."""
+        rotated = [p for p in glob.glob(glob.escape(self.log_file) + ".*") if os.path.isfile(p)]
+        # Newest first by mtime; ties (coarse timestamps) fall back to the suffix
+        rotated.sort(key=self._suffix_order)
+        rotated.sort(key=os.path.getmtime, reverse=True)
+        if os.path.isfile(self.log_file):
+            rotated.insert(0, self.log_file)
+        return rotated
+
+    def _suffix_order(self, path):
+        """Sort key putting newer segments first: server.log.1 before .2, later dates first."""
+        suffix = path[len(self.log_file) + 1:]
+        if suffix.isdigit():
+            return (0, int(suffix))
+        return (1, tuple(-ord(c) for c in suffix))
+
+    def tail(self, num_lines=100):
+        """Return the last `num_lines` lines across all segments as one string."""
+        if num_lines <= 0:
+            return ""
+        chunks = []
+        remaining = num_lines
+        with self._lock:
+            live_keys = set()
+            for path in self.segments():
+                try:
+                    with open(path, 'rb') as f:
+                        key, index = self._update_index(f)
+                        live_keys.add(key)
+                        lines = self._read_last(f, index, remaining)
+                except OSError as e:
+                    logging.warning(f"Failed to read log segment '{path}': {e}")
+                    continue
+                chunks.append(lines)
+                remaining -= len(lines)
+                if remaining <= 0:
+                    break
+            else:
+                # Every segment was visited; forget indexes of deleted segments
+                for key in list(self._indexes):
+                    if key not in live_keys:
+                        del self._indexes[key]
+
+        ordered = [line for lines in reversed(chunks) for line in lines]
+        if not ordered:
+            return ""
+        return '\n'.join(ordered) + '\n'
+
+    def _update_index(self, f):
+        """Extend (or rebuild) the index of an open segment up to its current size."""
+        st = os.fstat(f.fileno())
+        key = (st.st_dev, st.st_ino)
+        index = self._indexes.get(key)
+        if index is None or st.st_size < index.size:
+            # New file, or truncated/replaced under the same inode
+            index = self._indexes[key] = _SegmentIndex()
+
+        stride = self.stride
+        f.seek(index.size)
+        position = index.size
+        while position < st.st_size:
+            chunk = f.read(min(self.chunk_size, st.st_size - position))
+            if not chunk:
+                break
+            start = 0
+            while True:
+                newline = chunk.find(b'\n', start)
+                if newline < 0:
+                    break
+                index.lines += 1
+                if index.lines % stride == 0:
+                    index.offsets.append(position + newline + 1)
+                start = newline + 1
+            position += len(chunk)
+            index.ends_with_newline = chunk.endswith(b'\n')
+        index.size = position
+        return key, index
+
+    def _read_last(self, f, index, count):
+        """Return up to `count` last lines of an indexed segment, oldest first."""
+        total = index.lines + (0 if index.ends_with_newline else 1)
+        first = max(0, total - count)
+        checkpoint = min(first // self.stride, len(index.offsets) - 1)
+        f.seek(index.offsets[checkpoint])
+        data = f.read(index.size - index.offsets[checkpoint])
+        lines = data.decode('utf-8', errors='replace').split('\n')
+        if index.ends_with_newline:
+            lines.pop()  # Empty string after the final newline
+        return [line.rstrip('\r') for line in lines[first - checkpoint * self.stride:]]
@@ -0,0 +1,226 @@
+import bisect
+import json
+import logging
+import threading
+
+# Upper bounds of the command latency buckets, in seconds (+Inf is implicit).
+# They reach past the 60 s macro limit, so every command lands in a finite bucket.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                   30.0, 60.0, 120.0)
+
+
+def escape_label(value):
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. observe() takes no lock and allocates nothing;
+    concurrent updates may very rarely lose an increment, which is fine for
+    monitoring.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Approximate the q-quantile as the upper bound of the bucket containing
+        it, clamped to the last finite bound so it stays valid JSON.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def cumulative(self):
+        """Return [(upper_bound, cumulative_count)] including +Inf, for exposition."""
+        result = []
+        total = 0
+        for bound, bucket_count in zip(self.bounds + (float("inf"),), self.counts):
+            total += bucket_count
+            result.append((bound, total))
+        return result
+
+
+class ServerMetrics:
+    """Counters and per-command latency histograms for one CommandServer."""
+
+    # Distinct command names tracked before new ones are folded into "other"
+    MAX_COMMANDS = 64
+
+    def __init__(self):
+        self.commands = {}
+        self.connections_active = 0
+        self.connections_total = 0
+        self.connections_rejected = 0
+        self.handshakes_accepted = 0
+        self.handshakes_rejected = 0
+        self._lock = threading.Lock()  # Only taken when a new command name appears
+
+    def observe_command(self, name, seconds):
+        histogram = self.commands.get(name)
+        if histogram is None:
+            with self._lock:
+                if name not in self.commands and len(self.commands) >= self.MAX_COMMANDS:
+                    name = "other"
+                histogram = self.commands.setdefault(name, Histogram())
+        histogram.observe(seconds)
+
+    def connection_opened(self):
+        self.connections_active += 1
+        self.connections_total += 1
+
+    def connection_closed(self):
+        self.connections_active -= 1
+
+    def connection_rejected(self):
+        self.connections_rejected += 1
+
+    def handshake(self, accepted):
+        if accepted:
+            self.handshakes_accepted += 1
+        else:
+            self.handshakes_rejected += 1
+
+    def snapshot(self, server):
+        """Collect every metric of `server` into a JSON-serialisable dict."""
+        pads = [controller.pad.stats() for controller in server.fleet.controllers]
+        reports_sent = sum(stats["reports_sent"] for stats in pads)
+        streams = [controller.analog.stats() for controller in server.fleet.controllers]
+
+        return {
+            "connections_active": self.connections_active,
+            "connections_total": self.connections_total,
+            "connections_rejected": self.connections_rejected,
+            "connections_max": server.max_connections,
+            "handshakes_accepted": self.handshakes_accepted,
+            "handshakes_rejected": self.handshakes_rejected,
+            "threads": threading.active_count(),
+            "log_followers": server.log_broadcaster.subscriber_count,
+            "pads": len(pads),
+            "pad_changes_requested": sum(stats["changes_requested"] for stats in pads),
+            "pad_reports_sent": reports_sent,
+            "analog": {
+                key: sum(stats[key] for stats in streams)
+                for key in ("received", "applied", "late", "dropped", "skipped", "ticks_missed")
+            },
+            "scheduler": server.fleet.scheduler.stats(),
+            "commands": {
+                name: {
+                    "count": histogram.count,
+                    "mean_ms": round(histogram.sum / histogram.count * 1000, 3) if histogram.count else 0.0,
+                    "p50_ms": histogram.quantile(0.5) * 1000,
+                    "p99_ms": histogram.quantile(0.99) * 1000,
+                }
+                for name, histogram in list(self.commands.items())
+            },
+        }
+
+    def render_json(self, server):
+        return json.dumps(self.snapshot(server))
+
+    def render_prometheus(self, server):
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot(server)
+        scheduler = snapshot["scheduler"]
+        lines = []
+
+        def metric(name, kind, value, help_text):
+            lines.append(f"# HELP zeus_{name} {help_text}")
+            lines.append(f"# TYPE zeus_{name} {kind}")
+            lines.append(f"zeus_{name} {value}")
+
+        metric("connections_active", "gauge", snapshot["connections_active"], "Open client connections.")
+        metric("connections_total", "counter", snapshot["connections_total"], "Client connections accepted.")
+        metric("connections_rejected_total", "counter", snapshot["connections_rejected"],
+               "Client connections refused at capacity.")
+        metric("connections_max", "gauge", snapshot["connections_max"], "Client connection limit.")
+        metric("handshakes_accepted_total", "counter", snapshot["handshakes_accepted"], "Authorized HWID handshakes.")
+        metric("handshakes_rejected_total", "counter", snapshot["handshakes_rejected"], "Rejected HWID handshakes.")
+        metric("threads", "gauge", snapshot["threads"], "Live threads in the server process.")
+        metric("log_followers", "gauge", snapshot["log_followers"], "Clients following the log.")
+        metric("pad_changes_requested_total", "counter", snapshot["pad_changes_requested"], "Gamepad input changes requested.")
+        metric("pad_reports_sent_total", "counter", snapshot["pad_reports_sent"], "Gamepad reports sent to the driver.")
+        for key, help_text in (("received", "Analog stream values received."),
+                               ("applied", "Analog stream values applied to a pad."),
+                               ("late", "Analog stream values received after their time."),
+                               ("dropped", "Analog stream values dropped: buffer full or out of order."),
+                               ("skipped", "Analog stream values superseded before a tick applied them.")):
+            metric(f"analog_{key}_total", "counter", snapshot["analog"][key], help_text)
+        metric("scheduler_events_total", "counter", scheduler["events"], "Input scheduler events run.")
+        metric("scheduler_pending", "gauge", scheduler["pending"], "Input scheduler events waiting.")
+        metric("scheduler_lag_mean_seconds", "gauge", scheduler["mean_lag_ms"] / 1000, "Mean input scheduler lag.")
+        metric("scheduler_lag_max_seconds", "gauge", scheduler["max_lag_ms"] / 1000, "Maximum input scheduler lag.")
+
+        lines.append("# HELP zeus_command_duration_seconds Command execution time.")
+        lines.append("# TYPE zeus_command_duration_seconds histogram")
+        for name, histogram in list(self.commands.items()):
+            label = escape_label(name)
+            for bound, total in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'zeus_command_duration_seconds_bucket{{command="{label}",le="{le}"}} {total}')
+            lines.append(f'zeus_command_duration_seconds_sum{{command="{label}"}} {histogram.sum}')
+            lines.append(f'zeus_command_duration_seconds_count{{command="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+class MetricsHTTPServer:
+    """Serves GET /metrics in the Prometheus text format from a background thread."""
+
+    def __init__(self, server, host="0.0.0.0", port=9100):
+        # Imported here so servers without a metrics port never load the HTTP stack
+        import socketserver
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        command_server = server
+
+        class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = command_server.metrics.render_prometheus(command_server).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Metrics request from {self.client_address[0]}: {format % args}")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        logging.info(f"Metrics listener on port {self.port}")
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
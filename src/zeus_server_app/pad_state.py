@@ -0,0 +1,150 @@
+import time
+import threading
+
+class PadState:
+    """
+    Model of one virtual pad's report. Input changes only update the model
+    and mark it dirty; the scheduler flushes the model to the driver with at
+    most one update() per tick, however many sources changed the pad.
+    """
+
+    # Minimum spacing between two driver reports
+    DEFAULT_TICK = 0.004  # seconds
+
+    def __init__(self, gamepad, scheduler, tick=DEFAULT_TICK):
+        self.gamepad = gamepad
+        self.scheduler = scheduler
+        self.tick = tick
+        self._lock = threading.Lock()
+
+        # Desired state
+        self.buttons = 0  # Bitmask of pressed XUSB buttons
+        self.left_trigger = 0
+        self.right_trigger = 0
+        self.left_stick = (0.0, 0.0)
+        self.right_stick = (0.0, 0.0)
+
+        # Buttons as last sent to the driver, to press/release only the difference
+        self._sent_buttons = 0
+        self._dirty = set()
+        self._flush_pending = False
+        self._last_flush = 0.0
+
+        # Counters: change requests made vs. reports actually sent to the driver
+        self.changes_requested = 0
+        self.reports_sent = 0
+
+    def press_button(self, button):
+        button = int(button)
+        with self._lock:
+            self.changes_requested += 1
+            if not self.buttons & button:
+                if self._sent_buttons & button:
+                    # The release has not reached the driver yet; send it so the gap is not lost
+                    self._flush_locked()
+                self.buttons |= button
+                self._mark_dirty("buttons")
+
+    def release_button(self, button):
+        button = int(button)
+        with self._lock:
+            self.changes_requested += 1
+            if self.buttons & button:
+                if not self._sent_buttons & button:
+                    # The press has not reached the driver yet; send it so the tap is not lost
+                    self._flush_locked()
+                self.buttons &= ~button
+                self._mark_dirty("buttons")
+
+    def set_left_trigger(self, value):
+        """Set the left trigger (0-255)."""
+        with self._lock:
+            self.changes_requested += 1
+            if self.left_trigger != value:
+                self.left_trigger = value
+                self._mark_dirty("left_trigger")
+
+    def set_right_trigger(self, value):
+        """Set the right trigger (0-255)."""
+        with self._lock:
+            self.changes_requested += 1
+            if self.right_trigger != value:
+                self.right_trigger = value
+                self._mark_dirty("right_trigger")
+
+    def set_left_stick(self, x, y):
+        """Set the left stick position (-1.0 to 1.0 on each axis)."""
+        with self._lock:
+            self.changes_requested += 1
+            if self.left_stick != (x, y):
+                self.left_stick = (x, y)
+                self._mark_dirty("left_stick")
+
+    def set_right_stick(self, x, y):
+        """Set the right stick position (-1.0 to 1.0 on each axis)."""
+        with self._lock:
+            self.changes_requested += 1
+            if self.right_stick != (x, y):
+                self.right_stick = (x, y)
+                self._mark_dirty("right_stick")
+
+    def reset(self):
+        """Release every button, zero the triggers and center both sticks."""
+        with self._lock:
+            self.changes_requested += 1
+            if self.buttons:
+                self.buttons = 0
+                self._mark_dirty("buttons")
+            for field, neutral in (("left_trigger", 0), ("right_trigger", 0),
+                                   ("left_stick", (0.0, 0.0)), ("right_stick", (0.0, 0.0))):
+                if getattr(self, field) != neutral:
+                    setattr(self, field, neutral)
+                    self._mark_dirty(field)
+
+    def _mark_dirty(self, field):
+        """Record a changed field and make sure a flush is queued (lock held)."""
+        self._dirty.add(field)
+        if not self._flush_pending:
+            self._flush_pending = True
+            flush_at = max(time.monotonic(), self._last_flush + self.tick)
+            self.scheduler.call_at(flush_at, self.flush)
+
+    def flush(self):
+        """Send the dirty fields to the driver with a single update()."""
+        with self._lock:
+            self._flush_pending = False
+            self._flush_locked()
+
+    def _flush_locked(self):
+        dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return
+        gamepad = self.gamepad
+        if "buttons" in dirty:
+            changed = self.buttons ^ self._sent_buttons
+            while changed:
+                bit = changed & -changed
+                if self.buttons & bit:
+                    gamepad.press_button(button=bit)
+                else:
+                    gamepad.release_button(button=bit)
+                changed ^= bit
+            self._sent_buttons = self.buttons
+        if "left_trigger" in dirty:
+            gamepad.left_trigger(value=self.left_trigger)
+        if "right_trigger" in dirty:
+            gamepad.right_trigger(value=self.right_trigger)
+        if "left_stick" in dirty:
+            gamepad.left_joystick_float(x_value_float=self.left_stick[0], y_value_float=self.left_stick[1])
+        if "right_stick" in dirty:
+            gamepad.right_joystick_float(x_value_float=self.right_stick[0], y_value_float=self.right_stick[1])
+        gamepad.update()
+        self.reports_sent += 1
+        self._last_flush = time.monotonic()
+
+    def stats(self):
+        """Return report coalescing counters."""
+        return {
+            "changes_requested": self.changes_requested,
+            "reports_sent": self.reports_sent,
+        }
@@ -0,0 +1,233 @@
+import os
+import re
+import fnmatch
+import struct
+import logging
+import threading
+
+# Shell Link (.lnk) format, see [MS-SHLLINK]
+LNK_HEADER_SIZE = 0x4C
+LNK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+HAS_LINK_TARGET_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_NAME = 0x04
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x01
+
+PROFILE_DIRECTORY_RE = re.compile(r'--profile-directory=("[^"]+"|\S+)')
+
+
+def _read_c_string(data, offset, unicode=False):
+    """Read a NUL-terminated string from `data` at `offset`."""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\x00\x00":
+            end += 2
+        return data[offset:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\x00", offset)
+    return data[offset:end if end >= 0 else len(data)].decode("cp1252", errors="replace")
+
+
+def parse_lnk(data):
+    """
+    Parse the bytes of a Windows shortcut. Returns a dict with 'target',
+    'arguments', 'working_dir' and 'relative_path' (None when absent).
+    Raises ValueError if `data` is not a shell link. Pure Python, so it runs
+    on any OS and needs no COM.
+    """
+    if len(data) < LNK_HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != LNK_HEADER_SIZE \
+            or data[4:20] != LNK_CLSID:
+        raise ValueError("Not a shell link file")
+    (flags,) = struct.unpack_from("<I", data, 0x14)
+    offset = LNK_HEADER_SIZE
+
+    try:
+        if flags & HAS_LINK_TARGET_ID_LIST:
+            (id_list_size,) = struct.unpack_from("<H", data, offset)
+            offset += 2 + id_list_size
+
+        target = None
+        if flags & HAS_LINK_INFO:
+            (info_size, header_size, info_flags) = struct.unpack_from("<III", data, offset)
+            if info_flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+                (base_offset,) = struct.unpack_from("<I", data, offset + 16)
+                (suffix_offset,) = struct.unpack_from("<I", data, offset + 24)
+                if header_size >= 0x24:
+                    # Unicode variants of both paths follow the fixed header
+                    base_offset_w, suffix_offset_w = struct.unpack_from("<II", data, offset + 28)
+                    target = (_read_c_string(data, offset + base_offset_w, unicode=True)
+                              + _read_c_string(data, offset + suffix_offset_w, unicode=True))
+                else:
+                    target = (_read_c_string(data, offset + base_offset)
+                              + _read_c_string(data, offset + suffix_offset))
+            offset += info_size
+
+        strings = {}
+        for flag, key in ((HAS_NAME, "name"), (HAS_RELATIVE_PATH, "relative_path"),
+                          (HAS_WORKING_DIR, "working_dir"), (HAS_ARGUMENTS, "arguments"),
+                          (HAS_ICON_LOCATION, "icon_location")):
+            if flags & flag:
+                (count,) = struct.unpack_from("<H", data, offset)
+                offset += 2
+                size = count * 2 if flags & IS_UNICODE else count
+                if offset + size > len(data):
+                    raise struct.error("string runs past the end of the file")
+                if flags & IS_UNICODE:
+                    strings[key] = data[offset:offset + size].decode("utf-16-le", errors="replace")
+                else:
+                    strings[key] = data[offset:offset + size].decode("cp1252", errors="replace")
+                offset += size
+    except struct.error:
+        raise ValueError("Truncated shell link file")
+
+    return {
+        "target": target or None,
+        "arguments": strings.get("arguments", ""),
+        "working_dir": strings.get("working_dir"),
+        "relative_path": strings.get("relative_path"),
+    }
+
+
+def profile_dir_from_arguments(arguments):
+    """Return the --profile-directory value of a Chrome command line, or None."""
+    match = PROFILE_DIRECTORY_RE.search(arguments or "")
+    return match.group(1).strip('"') if match else None
+
+
+class ChromeProfile:
+    """One Chrome profile shortcut, resolved once when the catalog is built."""
+
+    __slots__ = ("index", "name", "shortcut_path", "exe_path", "profile_dir", "arguments")
+
+    def __init__(self, index, name, shortcut_path, exe_path, profile_dir, arguments):
+        self.index = index
+        self.name = name
+        self.shortcut_path = shortcut_path
+        self.exe_path = exe_path
+        self.profile_dir = profile_dir
+        self.arguments = arguments
+
+    def to_dict(self):
+        return {"index": self.index, "name": self.name, "profile_dir": self.profile_dir, "exe_path": self.exe_path}
+
+
+class ProfileCatalog:
+    """
+    Index of the Chrome profile shortcuts in the configured directory.
+    Built once and rebuilt only when the path or the directory's mtime
+    changes; unchanged shortcuts are not parsed again on a rebuild.
+    Profiles are sorted by name and addressable by name or 0-based index.
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self._lock = threading.Lock()
+        self._signature = None
+        self._profiles = []
+        self._by_name = {}
+        self._parsed = {}  # shortcut path -> ((mtime_ns, size), parsed fields)
+
+    def profiles(self):
+        """Return the current list of ChromeProfile, rebuilding the index if the directory changed."""
+        shortcuts_path = self.config_manager.get_config('chrome_shortcuts_path')
+        try:
+            signature = (shortcuts_path, os.stat(shortcuts_path).st_mtime_ns) if shortcuts_path else None
+        except OSError:
+            signature = (shortcuts_path, None)
+        with self._lock:
+            if signature != self._signature:
+                self._rebuild(shortcuts_path, signature)
+            return self._profiles
+
+    def get(self, key):
+        """Return the profile with this name (case-insensitive, '.lnk' optional) or index, or None."""
+        profiles = self.profiles()
+        return self._lookup(profiles, self._by_name, key)
+
+    def select(self, selectors):
+        """
+        Resolve names, indexes and glob patterns (e.g. 'bot0*') to profiles.
+        Returns (profiles in catalog order without duplicates, selectors that matched nothing).
+        Names and indexes are dictionary lookups; only patterns scan the names.
+        """
+        profiles = self.profiles()
+        by_name = self._by_name
+        chosen = {}
+        unmatched = []
+        for selector in selectors:
+            if any(c in selector for c in "*?["):
+                pattern = selector.lower()
+                if pattern.endswith(".lnk"):
+                    pattern = pattern[:-4]
+                matches = [p for p in profiles if fnmatch.fnmatchcase(p.name.lower(), pattern)]
+            else:
+                profile = self._lookup(profiles, by_name, selector)
+                matches = [profile] if profile else []
+            if not matches:
+                unmatched.append(selector)
+            for profile in matches:
+                chosen[profile.index] = profile
+        return [chosen[index] for index in sorted(chosen)], unmatched
+
+    @staticmethod
+    def _lookup(profiles, by_name, key):
+        if isinstance(key, int) or (key.isdigit() and key.lower() not in by_name):
+            index = int(key)
+            return profiles[index] if 0 <= index < len(profiles) else None
+        key = key.lower()
+        if key.endswith(".lnk"):
+            key = key[:-4]
+        return by_name.get(key)
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup."""
+        with self._lock:
+            self._signature = None
+
+    def _rebuild(self, shortcuts_path, signature):
+        self._signature = signature
+        if not shortcuts_path or signature[1] is None or not os.path.isdir(shortcuts_path):
+            self._profiles, self._by_name, self._parsed = [], {}, {}
+            return
+
+        names = sorted((f for f in os.listdir(shortcuts_path) if f.lower().endswith('.lnk')), key=str.lower)
+        profiles = []
+        for index, file_name in enumerate(names):
+            path = os.path.join(shortcuts_path, file_name)
+            fields = self._parse_cached(path)
+            profiles.append(ChromeProfile(
+                index, file_name[:-4], path, fields.get("target"),
+                profile_dir_from_arguments(fields.get("arguments")), fields.get("arguments", ""),
+            ))
+
+        # Drop parse results of shortcuts that no longer exist
+        live = set(profile.shortcut_path for profile in profiles)
+        self._parsed = {path: entry for path, entry in self._parsed.items() if path in live}
+        self._profiles = profiles
+        self._by_name = {profile.name.lower(): profile for profile in profiles}
+        logging.info(f"Indexed {len(profiles)} Chrome profile shortcuts in '{shortcuts_path}'.")
+
+    def _parse_cached(self, path):
+        """Parse a shortcut, reusing the previous result if the file is unchanged."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return {}
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._parsed.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                fields = parse_lnk(f.read())
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not parse shortcut '{path}': {e}")
+            fields = {}
+        if not fields.get("target") and fields.get("relative_path"):
+            fields["target"] = os.path.normpath(os.path.join(os.path.dirname(path), fields["relative_path"]))
+        self._parsed[path] = (key, fields)
+        return fields
@@ -0,0 +1,257 @@
+import struct
+
+# Framed messages carry a 4-byte big-endian length header. Legacy text commands
+# never start with a NUL byte, so a leading 0x00 marks a framed client.
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 1024 * 1024
+
+
+class FrameError(Exception):
+    """Raised when a peer sends a malformed or oversized frame."""
+
+
+def is_framed(data):
+    """Return True if the received bytes start a length-prefixed frame."""
+    return data[:1] == b"\x00"
+
+
+def split_handshake(data):
+    """
+    Split the first message into (hwid, pending) where `pending` holds any
+    frames the client pipelined right behind its HWID.
+    """
+    index = data.find(b"\x00")
+    if index < 0:
+        return data.decode().strip(), b""
+    return data[:index].decode().strip(), data[index:]
+
+
+def encode_frame(payload):
+    """Encode a text or bytes payload as a single frame."""
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8', errors='replace')
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def split_request(payload):
+    """Split a framed request payload into (request_id, command)."""
+    text = payload.decode('utf-8', errors='replace')
+    request_id, _, command = text.partition(" ")
+    return request_id, command.strip()
+
+
+def encode_reply(request_id, reply):
+    """Encode a reply frame tagged with the request ID it answers."""
+    return encode_frame(f"{request_id} {reply}")
+
+
+class FrameDecoder:
+    """Incremental decoder that turns a byte stream into complete frames."""
+
+    def __init__(self, max_frame_size=MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Append received bytes and return the list of completed frame payloads."""
+        self._buffer += data
+        frames = []
+        offset = 0
+        header_size = FRAME_HEADER.size
+        while len(self._buffer) - offset >= header_size:
+            (length,) = FRAME_HEADER.unpack_from(self._buffer, offset)
+            if length > self.max_frame_size:
+                raise FrameError(f"Frame of {length} bytes exceeds limit of {self.max_frame_size} bytes")
+            end = offset + header_size + length
+            if len(self._buffer) < end:
+                break
+            frames.append(bytes(self._buffer[offset + header_size:end]))
+            offset = end
+        if offset:
+            del self._buffer[:offset]
+        return frames
+
+
+# Binary protocol, switched to by sending BINARY_HANDSHAKE as a text command after
+# the HWID and waiting for BINARY_ENABLED_REPLY. A request is an opcode, a pad ID
+# and a request ID (BINARY_REQUEST) followed by the opcode's packed arguments;
+# OP_TEXT carries any text command as a 2-byte length and UTF-8 bytes, and
+# OP_ANALOG_SAMPLES a 2-byte count of ANALOG_SAMPLE records. A reply is the
+# request ID, a status and a length-prefixed UTF-8 body (BINARY_REPLY).
+BINARY_HANDSHAKE = "binary"
+BINARY_ENABLED_REPLY = "Binary protocol enabled."
+BINARY_REQUEST = struct.Struct(">BBH")
+BINARY_REPLY = struct.Struct(">HBI")
+TEXT_LENGTH = struct.Struct(">H")
+# Milliseconds since the analog stream started, the stick axes lx, ly, rx, ry
+# scaled to -32767..32767 and the triggers lt, rt as 0-255
+ANALOG_SAMPLE = struct.Struct(">IhhhhBB")
+ANALOG_COUNT = struct.Struct(">H")
+MAX_ANALOG_SAMPLES = 4096  # per request
+STICK_SCALE = 32767.0
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_UNAVAILABLE = 2  # Server draining; retry elsewhere or later
+
+OP_ANALOG_SAMPLES = 0x20
+OP_TEXT = 0xFF
+
+# Opcodes of the commands that take no arguments. Numbers are part of the wire
+# format: add new ones, never renumber.
+OPCODES = {
+    0x01: "healthCheck",
+    0x02: "start_anti_afk",
+    0x03: "stop_anti_afk",
+    0x04: "start_movement",
+    0x05: "stop_movement",
+    0x06: "analog_stop",
+    0x10: "press_a",
+    0x11: "press_b",
+    0x12: "press_x",
+    0x13: "press_y",
+    0x14: "press_lb",
+    0x15: "press_rb",
+    0x16: "press_lt",
+    0x17: "press_rt",
+    0x18: "press_dpad_up",
+    0x19: "press_dpad_down",
+    0x1A: "press_dpad_left",
+    0x1B: "press_dpad_right",
+    0x1C: "press_start",
+    0x1D: "press_back",
+    0x1E: "press_ls",
+    0x1F: "press_rs",
+}
+COMMAND_OPCODES = {command: opcode for opcode, command in OPCODES.items()}
+
+
+def encode_binary_request(opcode, request_id, pad=0, text=None):
+    """Encode one binary request; `text` is the command of an OP_TEXT request."""
+    header = BINARY_REQUEST.pack(opcode, pad, request_id & 0xFFFF)
+    if opcode != OP_TEXT:
+        return header
+    payload = text.encode('utf-8', errors='replace')
+    return header + TEXT_LENGTH.pack(len(payload)) + payload
+
+
+def encode_analog_samples(request_id, samples, pad=0):
+    """
+    Encode an OP_ANALOG_SAMPLES request from [(ms, lx, ly, rx, ry, lt, rt)]
+    samples, with sticks from -1.0 to 1.0 and triggers from 0.0 to 1.0.
+    """
+    records = [
+        ANALOG_SAMPLE.pack(int(ms), *[int(round(v * STICK_SCALE)) for v in (lx, ly, rx, ry)],
+                           int(round(lt * 255)), int(round(rt * 255)))
+        for ms, lx, ly, rx, ry, lt, rt in samples
+    ]
+    return BINARY_REQUEST.pack(OP_ANALOG_SAMPLES, pad, request_id & 0xFFFF) + ANALOG_COUNT.pack(len(records)) + b"".join(records)
+
+
+def decode_analog_samples(data):
+    """
+    Unpack ANALOG_SAMPLE records into [(seconds, {axis: value})] with every axis
+    set. Raises FrameError on a partial record or more than MAX_ANALOG_SAMPLES.
+    """
+    count, remainder = divmod(len(data), ANALOG_SAMPLE.size)
+    if remainder:
+        raise FrameError(f"Analog samples end with a partial {remainder}-byte record")
+    if count > MAX_ANALOG_SAMPLES:
+        raise FrameError(f"Batch of {count} analog samples exceeds limit of {MAX_ANALOG_SAMPLES}")
+    samples = []
+    for ms, lx, ly, rx, ry, lt, rt in ANALOG_SAMPLE.iter_unpack(data):
+        samples.append((ms / 1000.0, {
+            "lx": max(-1.0, lx / STICK_SCALE), "ly": max(-1.0, ly / STICK_SCALE),
+            "rx": max(-1.0, rx / STICK_SCALE), "ry": max(-1.0, ry / STICK_SCALE),
+            "lt": lt / 255.0, "rt": rt / 255.0,
+        }))
+    return samples
+
+
+def encode_binary_reply(request_id, status, body=b""):
+    """Encode one binary reply. `body` may be text or bytes."""
+    if isinstance(body, str):
+        body = body.encode('utf-8', errors='replace')
+    return BINARY_REPLY.pack(request_id, status, len(body)) + body
+
+
+class BinaryRequestDecoder:
+    """
+    Incremental decoder that turns a byte stream into (opcode, pad, request_id,
+    argument) requests. The argument is the command of OP_TEXT, the decoded
+    samples of OP_ANALOG_SAMPLES and None otherwise.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Append received bytes and return the completed requests. Raises
+        FrameError on an unknown opcode or an oversized sample batch.
+        """
+        self._buffer += data
+        requests = []
+        offset = 0
+        buffer = self._buffer
+        header_size = BINARY_REQUEST.size
+        while len(buffer) - offset >= header_size:
+            opcode, pad, request_id = BINARY_REQUEST.unpack_from(buffer, offset)
+            if opcode == OP_TEXT:
+                if len(buffer) - offset < header_size + TEXT_LENGTH.size:
+                    break
+                (length,) = TEXT_LENGTH.unpack_from(buffer, offset + header_size)
+                start = offset + header_size + TEXT_LENGTH.size
+                if len(buffer) < start + length:
+                    break
+                text = bytes(buffer[start:start + length]).decode('utf-8', errors='replace').strip()
+                offset = start + length
+            elif opcode == OP_ANALOG_SAMPLES:
+                if len(buffer) - offset < header_size + ANALOG_COUNT.size:
+                    break
+                (count,) = ANALOG_COUNT.unpack_from(buffer, offset + header_size)
+                if count > MAX_ANALOG_SAMPLES:
+                    raise FrameError(f"Batch of {count} analog samples exceeds limit of {MAX_ANALOG_SAMPLES}")
+                start = offset + header_size + ANALOG_COUNT.size
+                end = start + count * ANALOG_SAMPLE.size
+                if len(buffer) < end:
+                    break
+                text = decode_analog_samples(bytes(buffer[start:end]))
+                offset = end
+            elif opcode in OPCODES:
+                text = None
+                offset += header_size
+            else:
+                # Argument layout unknown, so the stream cannot be resynchronised
+                raise FrameError(f"Unknown opcode 0x{opcode:02x}")
+            requests.append((opcode, pad, request_id, text))
+        if offset:
+            del buffer[:offset]
+        return requests
+
+
+class BinaryReplyDecoder:
+    """Client-side decoder that turns a byte stream into (request_id, status, body) replies."""
+
+    def __init__(self, max_body_size=MAX_FRAME_SIZE * 16):
+        self.max_body_size = max_body_size
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Append received bytes and return the completed replies."""
+        self._buffer += data
+        replies = []
+        offset = 0
+        header_size = BINARY_REPLY.size
+        while len(self._buffer) - offset >= header_size:
+            request_id, status, length = BINARY_REPLY.unpack_from(self._buffer, offset)
+            if length > self.max_body_size:
+                raise FrameError(f"Reply of {length} bytes exceeds limit of {self.max_body_size} bytes")
+            end = offset + header_size + length
+            if len(self._buffer) < end:
+                break
+            replies.append((request_id, status, bytes(self._buffer[offset + header_size:end]).decode('utf-8', errors='replace')))
+            offset = end
+        if offset:
+            del self._buffer[:offset]
+        return replies
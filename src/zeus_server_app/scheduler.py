@@ -0,0 +1,159 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+class ScheduledEvent:
+    """Handle for a callback queued on an InputScheduler."""
+
+    __slots__ = ("deadline", "callback", "args", "cancelled")
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the callback from running if it has not run yet."""
+        self.cancelled = True
+
+
+class InputScheduler:
+    """
+    Single thread that runs timed input events from a heap of monotonic
+    deadlines. Replaces per-loop threads and blocking sleeps: callers queue
+    press/release/axis events and return immediately.
+    """
+
+    # Sleep until this close to a deadline, then spin for the rest to bound jitter
+    SPIN_THRESHOLD = 0.001  # seconds
+
+    def __init__(self, name="input-scheduler"):
+        self.name = name
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self.running = False
+
+        # Lag (actual run time minus deadline) statistics
+        self.events_run = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        """Start the scheduler thread if it is not running."""
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logging.info("Input scheduler started.")
+
+    def stop(self, timeout=5.0):
+        """
+        Stop the scheduler thread. Pending events are discarded, and the
+        futures they would have completed fail so no caller waits forever.
+        """
+        with self._condition:
+            if not self.running:
+                return
+            self.running = False
+            discarded = [event for _, _, event in self._heap]
+            self._heap.clear()
+            self._condition.notify()
+        for event in discarded:
+            self._fail_futures(event)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        logging.info("Input scheduler stopped.")
+
+    def call_at(self, deadline, callback, *args):
+        """Run `callback(*args)` at the given time.monotonic() deadline."""
+        event = ScheduledEvent(deadline, callback, args)
+        with self._condition:
+            if self.running:
+                heapq.heappush(self._heap, (deadline, next(self._counter), event))
+                # Only wake the thread if the new event is now the earliest
+                if self._heap[0][2] is event:
+                    self._condition.notify()
+                return event
+        # Stopped, so the event would never run
+        event.cancelled = True
+        self._fail_futures(event)
+        return event
+
+    def call_later(self, delay, callback, *args):
+        """Run `callback(*args)` after `delay` seconds."""
+        return self.call_at(time.monotonic() + delay, callback, *args)
+
+    def call_soon(self, callback, *args):
+        """Run `callback(*args)` as soon as possible on the scheduler thread."""
+        return self.call_at(time.monotonic(), callback, *args)
+
+    @staticmethod
+    def _fail_futures(event):
+        """Fail the Futures among a discarded event's arguments."""
+        for arg in event.args:
+            if isinstance(arg, Future) and not arg.done():
+                arg.set_exception(RuntimeError("input scheduler stopped"))
+
+    def pending(self):
+        """Number of queued events, including cancelled ones not yet discarded."""
+        return len(self._heap)
+
+    def stats(self):
+        """Return timing jitter statistics in milliseconds."""
+        events = self.events_run
+        return {
+            "events": events,
+            "pending": self.pending(),
+            "mean_lag_ms": round(self.total_lag / events * 1000, 3) if events else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+        }
+
+    def _next_event(self):
+        """Block until the earliest event is due and return it, or None once stopped."""
+        with self._condition:
+            while self.running:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                deadline, _, event = self._heap[0]
+                if event.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining > self.SPIN_THRESHOLD:
+                    self._condition.wait(remaining - self.SPIN_THRESHOLD)
+                    continue
+                heapq.heappop(self._heap)
+                break
+            else:
+                return None
+
+        while time.monotonic() < event.deadline:
+            pass
+        return event
+
+    def _run(self):
+        while True:
+            event = self._next_event()
+            if event is None:
+                break
+            if event.cancelled:
+                continue
+            lag = time.monotonic() - event.deadline
+            self.events_run += 1
+            self.total_lag += lag
+            if lag > self.max_lag:
+                self.max_lag = lag
+            try:
+                event.callback(*event.args)
+            except Exception as e:
+                logging.error(f"Scheduled input event failed: {e}")
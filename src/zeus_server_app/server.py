@@ -1,122 +1,992 @@
+import os
 import socket
 import threading
 import logging
+import asyncio
+import json
+import select
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from zeus_server_app.gamepad_controller import GamepadController
+from zeus_server_app.analog_stream import parse_samples, parse_curve
+from zeus_server_app.fleet import GamepadFleet
+from zeus_server_app.gamepad_backend import get_backend
 from zeus_server_app.chrome_manager import ChromeManager
-from zeus_server_app.utils import tail_lines
+from zeus_server_app.protocol import (
+    FrameDecoder, FrameError, is_framed, split_handshake, split_request, encode_reply,
+    BINARY_HANDSHAKE, BINARY_ENABLED_REPLY, BinaryRequestDecoder, encode_binary_reply, OPCODES, OP_TEXT,
+    OP_ANALOG_SAMPLES,
+    STATUS_OK, STATUS_ERROR, STATUS_UNAVAILABLE,
+)
+from zeus_server_app.log_tail import LogTailer
+from zeus_server_app.log_pipeline import LogBroadcaster
+from zeus_server_app.metrics import ServerMetrics, MetricsHTTPServer
+
+
+class ErrorReply(str):
+    """
+    Reply text of a command that failed. Text clients receive it unchanged;
+    the binary protocol sends it with STATUS_ERROR.
+    """
+
 
 class CommandServer:
     """A server that handles client commands and enforces HWID checks."""
 
-    def __init__(self, hwid_manager, config_manager, host="0.0.0.0", port=9999):
+    # Available connection engines: one thread per client, or a single asyncio loop
+    ENGINES = ("threaded", "asyncio")
+
+    # Commands cheap enough to answer directly on the event loop
+    INLINE_COMMANDS = frozenset(["healthCheck"])
+
+    # Maximum framed commands queued per connection before reads pause
+    PIPELINE_DEPTH = 256
+
+    # Lines returned by tail_logs without an argument, and the upper bound
+    DEFAULT_TAIL_LINES = 100
+    MAX_TAIL_LINES = 10000
+
+    # follow_logs: records buffered per subscriber before the oldest are dropped,
+    # and how long a send to a stalled follower may block before it is disconnected
+    FOLLOW_MAX_PENDING = 1000
+    FOLLOW_SEND_TIMEOUT = 10.0  # seconds
+    FOLLOW_POLL_INTERVAL = 1.0  # seconds
+
+    # Connection limits; each can be overridden by the config key of the same name in lowercase
+    MAX_CONNECTIONS = 256
+    LISTEN_BACKLOG = 128
+    HANDSHAKE_TIMEOUT = 10.0  # seconds to send the HWID
+    IDLE_TIMEOUT = 600.0      # seconds without a command before disconnecting, 0 to disable
+
+    # TCP keepalive: first probe after this many idle seconds, then every interval
+    KEEPALIVE_IDLE = 60
+    KEEPALIVE_INTERVAL = 10
+    KEEPALIVE_COUNT = 5
+
+    CAPACITY_REPLY = "Server at capacity. Try again later."
+    DRAINING_REPLY = "Server shutting down. Try again later."
+    # Start of the ErrorReply to a gamepad command the controller could not run
+    FAILED_REPLY = "Failed to execute command"
+
+    # Seconds drain() waits for running commands before shutting down anyway
+    DRAIN_TIMEOUT = 30.0
+    # Seconds a client waits for a press to be released, on top of a macro's own length
+    INPUT_TIMEOUT = 10.0
+
+    def __init__(self, hwid_manager, config_manager, host="0.0.0.0", port=9999, engine="threaded", max_workers=8,
+                 gamepad_count=None, gamepad_backend=None, log_file='server.log', log_broadcaster=None,
+                 metrics_port=None, max_connections=None, listen_backlog=None, handshake_timeout=None,
+                 idle_timeout=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown server engine '{engine}'. Expected one of: {', '.join(self.ENGINES)}")
         self.hwid_manager = hwid_manager
         self.host = host
         self.port = port
+        self.engine = engine
+        self.max_workers = max_workers
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.is_running = True
         self.config_manager = config_manager
-        self.chrome_manager = ChromeManager(config_manager)  # Instantiate ChromeManager
-        self.gamepad_controller = GamepadController()
+        self.chrome_manager = ChromeManager(config_manager)  # Launches run on its background launcher
+        self.log_tailer = LogTailer.for_path(log_file)
+
+        # In-memory feed for follow_logs; setup_logging() provides one on its writer thread
+        if log_broadcaster is None:
+            log_broadcaster = LogBroadcaster()
+            logging.getLogger().addHandler(log_broadcaster)
+        self.log_broadcaster = log_broadcaster
+
+        # One virtual pad per bot account, all driven by a shared scheduler
+        if gamepad_count is None:
+            gamepad_count = config_manager.get_int('gamepad_count', 1)
+        if gamepad_backend is None or isinstance(gamepad_backend, str):
+            gamepad_backend = get_backend(gamepad_backend or config_manager.get_config('gamepad_backend'))
+        # Anti-AFK starts once the server is listening, so it does not delay startup
+        self.fleet = GamepadFleet(size=gamepad_count, backend=gamepad_backend, autostart=False)
+        self.gamepad_controller = self.fleet.get(0)  # Default pad for unaddressed commands
+
+        # Apply stored gamepad timings and follow later changes without polling the DB
+        for key in GamepadController.CONFIG_KEYS:
+            self.fleet.apply_config(key, config_manager.get_config(key))
+        config_manager.subscribe(self.fleet.apply_config, GamepadController.CONFIG_KEYS)
+
+        # Command latency and connection counters; optionally scraped over HTTP
+        self.metrics = ServerMetrics()
+        if metrics_port is None:
+            metrics_port = config_manager.get_int('metrics_port', 0)
+        self.metrics_port = metrics_port
+        self.metrics_http = None
+
+        # Connection limits and timeouts
+        self.max_connections = max_connections or config_manager.get_int('max_connections', self.MAX_CONNECTIONS)
+        self.listen_backlog = listen_backlog or config_manager.get_int('listen_backlog', self.LISTEN_BACKLOG)
+        if handshake_timeout is None:
+            handshake_timeout = config_manager.get_float('handshake_timeout', self.HANDSHAKE_TIMEOUT)
+        if idle_timeout is None:
+            idle_timeout = config_manager.get_float('idle_timeout', self.IDLE_TIMEOUT)
+        self.handshake_timeout = handshake_timeout or None
+        self.idle_timeout = idle_timeout or None
+        self._connections_lock = threading.Lock()
+
+        # Commands executing right now, so drain() can wait for them
+        self._in_flight = 0
+        self._in_flight_done = threading.Condition()
+        self._draining = False
+
+        # Command dispatch tables, shared by the text and binary protocols
+        self._commands, self._commands_with_argument = self._build_command_tables()
+        self._opcode_handlers = [None] * 256
+        for opcode, command in OPCODES.items():
+            self._opcode_handlers[opcode] = (command, self._commands[command])
+
+        # Event loop state (asyncio engine only)
+        self._loop = None
+        self._executor = None
+        self._async_server = None
+
+    def authorize(self, hwid):
+        """Validate the handshake HWID. Returns (authorized, reply)."""
+        logging.info(f"Received HWID: {hwid}")
+        authorized = self.hwid_manager.is_hwid_whitelisted(hwid)
+        self.metrics.handshake(authorized)
+        if not authorized:
+            logging.warning(f"Unauthorized HWID: {hwid}")
+            return False, "HWID not authorized."
+        logging.info(f"HWID authorized: {hwid}")
+        return True, "HWID authorized."
+
+    def _acquire_connection(self):
+        """Count a new client connection. Returns False if the server is at capacity."""
+        with self._connections_lock:
+            if self.metrics.connections_active >= self.max_connections:
+                self.metrics.connection_rejected()
+                return False
+            self.metrics.connection_opened()
+            return True
+
+    def _release_connection(self):
+        with self._connections_lock:
+            self.metrics.connection_closed()
+
+    def connection_status(self):
+        """Return the current connection count, limit and rejections."""
+        return {
+            "active": self.metrics.connections_active,
+            "max": self.max_connections,
+            "rejected": self.metrics.connections_rejected,
+        }
+
+    def _configure_client_socket(self, sock):
+        """Enable TCP keepalive so dead peers are detected even on idle connections."""
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.KEEPALIVE_IDLE)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.KEEPALIVE_INTERVAL)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.KEEPALIVE_COUNT)
+            elif hasattr(socket, "SIO_KEEPALIVE_VALS"):
+                sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, self.KEEPALIVE_IDLE * 1000, self.KEEPALIVE_INTERVAL * 1000))
+        except (OSError, AttributeError) as e:
+            logging.debug(f"Could not enable TCP keepalive: {e}")
+
+    def resolve_pad(self, data):
+        """
+        Split an optional `pad=<id>` prefix off a command.
+        Returns (controller, command); raises ValueError for a bad or unknown pad.
+        """
+        if not data.startswith("pad="):
+            return self.gamepad_controller, data
+        prefix, _, command = data.partition(" ")
+        try:
+            return self.fleet.get(int(prefix[len("pad="):])), command.strip()
+        except (ValueError, KeyError):
+            raise ValueError(f"Unknown pad '{prefix[len('pad='):]}'. Valid pads: 0-{len(self.fleet) - 1}.")
+
+    def process_command(self, data):
+        """Execute a single client command and return the reply text."""
+        if not self._begin_command():
+            return self.DRAINING_REPLY
+        try:
+            started = time.perf_counter()
+            reply = self._dispatch_command(data)
+            self._observe_command(data, reply, time.perf_counter() - started)
+            return reply
+        finally:
+            self._end_command()
+
+    def _begin_command(self):
+        """Count a command as in flight. Returns False once the server is draining."""
+        with self._in_flight_done:
+            if self._draining:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _end_command(self):
+        with self._in_flight_done:
+            self._in_flight -= 1
+            if not self._in_flight:
+                self._in_flight_done.notify_all()
+
+    def _observe_command(self, data, reply, seconds):
+        """
+        Record a command's latency under its name, without the pad prefix or
+        arguments. Names not in the dispatch tables are all recorded as
+        "unknown", so clients cannot create metric names.
+        """
+        if data.startswith("pad="):
+            data = data.partition(" ")[2]
+        name = data.partition(" ")[0]
+        if name not in self._commands and name not in self._commands_with_argument:
+            name = "unknown"
+        self.metrics.observe_command(name, seconds)
+
+    def _build_command_tables(self):
+        """
+        Map command names to handlers, built once so dispatch is a dict lookup.
+        Returns (commands taking no argument: handler(controller),
+                 commands taking one: handler(controller, argument)).
+        """
+        commands = {
+            "healthCheck": lambda controller: "alive",
+            "start_anti_afk": self._start_anti_afk,
+            "stop_anti_afk": self._stop_anti_afk,
+            "start_movement": self._start_movement,
+            "stop_movement": self._stop_movement,
+            "install_tampermonkey_script": self._install_tampermonkey_script,
+            "install_tampermonkey": self._install_tampermonkey,
+            "open_all_chrome_profiles": lambda controller: self._job_reply(self.chrome_manager.open_all_chrome_profiles()),
+            "profiles_status": self._profiles_status,
+            "profiles": lambda controller: json.dumps([p.to_dict() for p in self.chrome_manager.catalog.profiles()]),
+            "jobs": lambda controller: json.dumps([job.to_dict() for job in self.chrome_manager.launcher.jobs()]),
+            "metrics": lambda controller: self.metrics.render_json(self),
+            "connections": lambda controller: json.dumps(self.connection_status()),
+            "pads": lambda controller: json.dumps(self.fleet.status()),
+            "analog_stop": self._analog_stop,
+            "analog_stats": lambda controller: json.dumps(controller.analog.stats()),
+        }
+        for command in GamepadController.GAMEPAD_COMMANDS:
+            commands[command] = self._press_handler(command)
+
+        commands_with_argument = {
+            "open_profile": self._open_profiles,
+            "open_profiles": self._open_profiles,
+            "unwatch_profiles": self._unwatch_profiles,
+            "job": self._job_status,
+            "batch": self._run_macro,
+            "macro": self._run_macro,
+            "tail_logs": self._tail_logs,
+            "analog": self._analog_samples,
+            "analog_curve": self._analog_curve,
+            # Valid follow_logs requests are streamed by the connection handlers
+            "follow_logs": lambda controller, argument: ErrorReply("Usage: follow_logs [number of recent lines]"),
+        }
+        return commands, commands_with_argument
+
+    def _dispatch_command(self, data):
+        logging.info(f"Received command: {data}")
+
+        try:
+            controller, data = self.resolve_pad(data)
+        except ValueError as e:
+            return ErrorReply(e)
+
+        handler = self._commands.get(data)
+        if handler is not None:
+            return handler(controller)
+        name, _, argument = data.partition(" ")
+        handler = self._commands_with_argument.get(name)
+        if handler is not None:
+            return handler(controller, argument.strip())
+        return ErrorReply("unknown command")
+
+    @classmethod
+    def _press_handler(cls, command):
+        reply = f"Executed command: {command}"
+
+        def press(controller):
+            future = controller.execute_gamepad_command(command)
+            if future is None:
+                return ErrorReply(f"{cls.FAILED_REPLY}: {command}")
+            try:
+                future.result(timeout=cls.INPUT_TIMEOUT)
+            except (FutureTimeoutError, RuntimeError) as e:
+                return ErrorReply(f"{cls.FAILED_REPLY}: {command} ({e or 'timed out'})")
+            return reply
+        return press
+
+    @staticmethod
+    def _start_anti_afk(controller):
+        controller.start_anti_afk()
+        return "Anti-AFK started."
+
+    @staticmethod
+    def _stop_anti_afk(controller):
+        controller.stop_anti_afk()
+        return "Anti-AFK stopped."
+
+    @staticmethod
+    def _start_movement(controller):
+        controller.start_movement()
+        return "Movement started."
+
+    @staticmethod
+    def _stop_movement(controller):
+        controller.stop_movement()
+        return "Movement stopped."
+
+    @staticmethod
+    def _analog_samples(controller, argument):
+        try:
+            samples = parse_samples(argument)
+        except ValueError as e:
+            return ErrorReply(f"Invalid analog samples: {e}")
+        return json.dumps(controller.stream_analog(samples=samples))
+
+    @staticmethod
+    def _analog_curve(controller, argument):
+        try:
+            curve = parse_curve(argument)
+        except ValueError as e:
+            return ErrorReply(f"Invalid analog curve: {e}")
+        return json.dumps(controller.stream_analog(curve=curve))
+
+    @staticmethod
+    def _analog_stop(controller):
+        controller.analog.stop()
+        return json.dumps(controller.analog.stats())
+
+    def _install_tampermonkey_script(self, controller):
+        script_url = "https://github.com/redphx/better-xcloud/releases/latest/download/better-xcloud.user.js"
+        return self._job_reply(self.chrome_manager.install_tampermonkey_script_in_all_profiles(script_url))
+
+    def _install_tampermonkey(self, controller):
+        extension_url = "https://chrome.google.com/webstore/detail/tampermonkey/dhdgffkkebhmkfjojejmpbldmpobfkfo"
+        return self._job_reply(self.chrome_manager.install_extension_on_all_profiles(extension_url))
+
+    def _open_profiles(self, controller, argument):
+        selectors = argument.replace(",", " ").split()
+        if not selectors:
+            return ErrorReply("Usage: open_profiles <name|index|pattern> [...]")
+        job, unmatched = self.chrome_manager.open_profiles(selectors)
+        reply = self._job_reply(job)
+        if unmatched:
+            reply = type(reply)(f"{reply} No profile matches: {', '.join(unmatched)}.")
+        return reply
+
+    def _profiles_status(self, controller):
+        supervisor = self.chrome_manager.supervisor
+        return json.dumps({"last_poll_ms": supervisor.last_poll_ms, "profiles": supervisor.status()})
+
+    def _unwatch_profiles(self, controller, argument):
+        profiles, unmatched = self.chrome_manager.catalog.select(argument.replace(",", " ").split())
+        removed = [profile.name for profile in profiles if self.chrome_manager.supervisor.unwatch(profile.name)]
+        return f"Stopped supervising: {', '.join(removed) or 'none'}."
+
+    def _job_status(self, controller, argument):
+        try:
+            job = self.chrome_manager.launcher.get(int(argument))
+        except ValueError:
+            job = None
+        return json.dumps(job.to_dict()) if job else ErrorReply("Unknown job.")
+
+    @classmethod
+    def _run_macro(cls, controller, argument):
+        try:
+            steps = controller.parse_macro(argument)
+        except ValueError as e:
+            return ErrorReply(f"Invalid macro: {e}")
+        try:
+            result = controller.run_macro(steps).result(timeout=controller.MACRO_MAX_DURATION + cls.INPUT_TIMEOUT)
+        except (FutureTimeoutError, RuntimeError) as e:
+            return ErrorReply(f"{cls.FAILED_REPLY}: macro ({e or 'timed out'})")
+        return f"Executed macro: {json.dumps(result)}"
+
+    def _tail_logs(self, controller, argument):
+        try:
+            num_lines = int(argument or self.DEFAULT_TAIL_LINES)
+        except ValueError:
+            return ErrorReply("Usage: tail_logs [number of lines]")
+        num_lines = max(1, min(num_lines, self.MAX_TAIL_LINES))
+        try:
+            # Tail the last lines of the log file and its rotated segments
+            last_logs = self.log_tailer.tail(num_lines)
+            if not last_logs:
+                last_logs = "No logs found or log file empty.\n"
+            return last_logs
+        except Exception as e:
+            logging.error(f"Failed to tail logs: {e}")
+            return ErrorReply(f"Error reading logs: {e}")
+
+    def _job_reply(self, job):
+        """Reply for a command that queued a Chrome launch job."""
+        if job is None:
+            return ErrorReply("No Chrome profiles to open. Check the Chrome shortcuts path and the server log.")
+        return f"Started job {job.id} ({len(job.launches)} launches). Check progress with 'job {job.id}'."
+
+    async def process_command_async(self, data):
+        """
+        Event-loop variant of process_command. Gamepad presses are scheduled and
+        awaited without occupying a worker thread; other commands run on the pool.
+        """
+        if data in self.INLINE_COMMANDS:
+            return self.process_command(data)
+        if not self._begin_command():
+            return self.DRAINING_REPLY
+        try:
+            started = time.perf_counter()
+            try:
+                controller, command = self.resolve_pad(data)
+            except ValueError:
+                controller, command = None, None
+            if controller is not None and command in controller.get_supported_commands():
+                logging.info(f"Received command: {data}")
+                future = controller.execute_gamepad_command(command)
+                reply = await self._await_press(command, future)
+            else:
+                loop = asyncio.get_event_loop()
+                reply = await loop.run_in_executor(self._executor, self._dispatch_command, data)
+            # Includes time spent waiting for a worker thread
+            self._observe_command(data, reply, time.perf_counter() - started)
+            return reply
+        finally:
+            self._end_command()
+
+    def process_binary(self, opcode, pad_id, argument):
+        """Execute one binary protocol request. Returns (status, reply text)."""
+        if not 0 <= pad_id < len(self.fleet):
+            return STATUS_ERROR, f"Unknown pad '{pad_id}'. Valid pads: 0-{len(self.fleet) - 1}."
+        if opcode == OP_TEXT:
+            return self._binary_text_reply(self.process_command(f"pad={pad_id} {argument}" if pad_id else argument))
+        if not self._begin_command():
+            return STATUS_UNAVAILABLE, self.DRAINING_REPLY
+        try:
+            started = time.perf_counter()
+            if opcode == OP_ANALOG_SAMPLES:
+                # The push counts are the reply, so clients can see late and dropped samples
+                reply = json.dumps(self.fleet.controllers[pad_id].stream_analog(samples=argument))
+                self.metrics.observe_command("analog", time.perf_counter() - started)
+                return STATUS_OK, reply
+            command, handler = self._opcode_handlers[opcode]
+            logging.debug(f"Received binary command: {command}")
+            # Opcode commands only acknowledge, so their text replies are only sent on errors
+            status, reply = self._binary_text_reply(handler(self.fleet.controllers[pad_id]))
+            self.metrics.observe_command(command, time.perf_counter() - started)
+            return status, "" if status == STATUS_OK else reply
+        finally:
+            self._end_command()
+
+    async def process_binary_async(self, opcode, pad_id, argument):
+        """
+        Event-loop variant of process_binary. Presses are awaited without
+        occupying a worker thread; analog samples are only queued, so they run inline.
+        """
+        command = OPCODES.get(opcode)
+        if command == "healthCheck" or opcode == OP_ANALOG_SAMPLES or not 0 <= pad_id < len(self.fleet):
+            return self.process_binary(opcode, pad_id, argument)
+        if opcode == OP_TEXT:
+            return self._binary_text_reply(
+                await self.process_command_async(f"pad={pad_id} {argument}" if pad_id else argument))
+        if command not in GamepadController.GAMEPAD_COMMANDS:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, self.process_binary, opcode, pad_id, argument)
+        if not self._begin_command():
+            return STATUS_UNAVAILABLE, self.DRAINING_REPLY
+        try:
+            started = time.perf_counter()
+            logging.debug(f"Received binary command: {command}")
+            future = self.fleet.controllers[pad_id].execute_gamepad_command(command)
+            status, reply = self._binary_text_reply(await self._await_press(command, future))
+            self.metrics.observe_command(command, time.perf_counter() - started)
+            return status, "" if status == STATUS_OK else reply
+        finally:
+            self._end_command()
+
+    async def _await_press(self, command, future):
+        """Wait on the event loop for a press Future. Returns the reply text."""
+        if future is None:
+            return ErrorReply(f"{self.FAILED_REPLY}: {command}")
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(future), self.INPUT_TIMEOUT)
+        except (asyncio.TimeoutError, RuntimeError) as e:
+            return ErrorReply(f"{self.FAILED_REPLY}: {command} ({e or 'timed out'})")
+        return f"Executed command: {command}"
+
+    def _binary_text_reply(self, reply):
+        """Map a command's reply text to (status, reply) for the binary protocol."""
+        if reply == self.DRAINING_REPLY:
+            return STATUS_UNAVAILABLE, reply
+        return (STATUS_ERROR if isinstance(reply, ErrorReply) else STATUS_OK), reply
+
+    def parse_follow_logs(self, data):
+        """Return the backlog line count if `data` is a valid follow_logs request, else None."""
+        if data != "follow_logs" and not data.startswith("follow_logs "):
+            return None
+        try:
+            num_lines = int(data.partition(" ")[2] or 0)
+        except ValueError:
+            return None
+        return max(0, min(num_lines, self.log_broadcaster.capacity))
+
+    def _encode_log_batch(self, request_id, lines, dropped=0):
+        """Encode streamed log lines as one framed reply, or as raw text for legacy clients."""
+        if dropped:
+            lines = [f"[follow_logs] {dropped} log records dropped, client is reading too slowly"] + lines
+        text = "\n".join(lines) + "\n"
+        if request_id is None:
+            return text.encode('utf-8', errors='replace')
+        return encode_reply(request_id, text)
+
+    def _follow_logs(self, conn, addr, num_lines, request_id=None):
+        """
+        Stream new log records to a client until it disconnects (threaded engine).
+        The subscription buffer is bounded, so a slow client only loses records;
+        a client that stops reading altogether is disconnected after FOLLOW_SEND_TIMEOUT.
+        """
+        logging.info(f"Client {addr} is following logs")
+        subscription = self.log_broadcaster.subscribe(num_lines, max_pending=self.FOLLOW_MAX_PENDING)
+        conn.settimeout(self.FOLLOW_SEND_TIMEOUT)
+        try:
+            conn.sendall(self._encode_log_batch(request_id, ["Following logs."]))
+            while self.is_running:
+                lines, dropped = subscription.wait(self.FOLLOW_POLL_INTERVAL)
+                if lines or dropped:
+                    conn.sendall(self._encode_log_batch(request_id, lines, dropped))
+                elif select.select([conn], [], [], 0)[0] and not conn.recv(1024):
+                    break  # Client closed the connection; anything it sends is ignored
+        except socket.timeout:
+            logging.warning(f"Log follower {addr} stopped reading; disconnecting")
+        finally:
+            subscription.close()
+        logging.info(f"Client {addr} stopped following logs")
+
+    async def _follow_logs_async(self, reader, writer, addr, num_lines, request_id=None):
+        """Event-loop variant of _follow_logs."""
+        logging.info(f"Client {addr} is following logs")
+        loop = asyncio.get_event_loop()
+        ready = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        subscription = self.log_broadcaster.subscribe(num_lines, max_pending=self.FOLLOW_MAX_PENDING, on_ready=wake)
+        closed = loop.create_task(self._wait_closed(reader))
+        try:
+            writer.write(self._encode_log_batch(request_id, ["Following logs."]))
+            while self.is_running and not closed.done():
+                ready.clear()
+                lines, dropped = subscription.drain()
+                if lines or dropped:
+                    writer.write(self._encode_log_batch(request_id, lines, dropped))
+                    await asyncio.wait_for(writer.drain(), self.FOLLOW_SEND_TIMEOUT)
+                    continue
+                waiter = loop.create_task(ready.wait())
+                await asyncio.wait([waiter, closed], return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+        except asyncio.TimeoutError:
+            logging.warning(f"Log follower {addr} stopped reading; disconnecting")
+        finally:
+            subscription.close()
+            closed.cancel()
+        logging.info(f"Client {addr} stopped following logs")
+
+    @staticmethod
+    async def _wait_closed(reader):
+        """Discard client input until the connection is closed."""
+        while await reader.read(1024):
+            pass
 
     def handle_client(self, conn, addr):
         """Handle incoming client commands."""
         logging.info(f"Connected to {addr}")
         with conn:
             try:
+                self._configure_client_socket(conn)
+
                 # Receive the HWID from the client as the first message
-                hwid = conn.recv(1024).decode().strip()
-                logging.info(f"Received HWID: {hwid}")
+                conn.settimeout(self.handshake_timeout)
+                hwid, pending = split_handshake(conn.recv(1024))
+                conn.settimeout(self.idle_timeout)
 
                 # Validate the HWID
-                if not self.hwid_manager.is_hwid_whitelisted(hwid):
-                    conn.sendall("HWID not authorized.".encode())
-                    logging.warning(f"Unauthorized HWID: {hwid}")
+                authorized, reply = self.authorize(hwid)
+                conn.sendall(reply.encode())
+                if not authorized:
                     return
 
-                conn.sendall("HWID authorized.".encode())
-                logging.info(f"HWID authorized: {hwid}")
+                # Frames pipelined behind the HWID switch the connection to framed mode
+                decoder = FrameDecoder() if pending else None
+                if pending and self._process_frames(conn, addr, decoder, pending):
+                    return
 
                 # Process subsequent commands
                 while True:
-                    data = conn.recv(1024).decode().strip()
+                    data = conn.recv(65536 if decoder else 1024)
+                    if not data:
+                        break
+
+                    if decoder is None and is_framed(data):
+                        logging.info(f"Client {addr} switched to framed protocol")
+                        decoder = FrameDecoder()
+
+                    if decoder is not None:
+                        if self._process_frames(conn, addr, decoder, data):
+                            break
+                        continue
+
+                    data = data.decode().strip()
                     if not data:
                         break
 
-                    logging.info(f"Received command: {data}")
-
-                    if data == "healthCheck":
-                        conn.sendall("alive".encode())
-                    elif data in self.gamepad_controller.get_supported_commands():
-                        self.gamepad_controller.execute_gamepad_command(data)
-                        conn.sendall(f"Executed command: {data}".encode())
-                    elif data == "start_anti_afk":
-                        self.gamepad_controller.start_anti_afk()
-                        conn.sendall("Anti-AFK started.".encode())
-                    elif data == "stop_anti_afk":
-                        self.gamepad_controller.stop_anti_afk()
-                        conn.sendall("Anti-AFK stopped.".encode())
-                    elif data == "install_tampermonkey_script":
-                        script_url = "https://github.com/redphx/better-xcloud/releases/latest/download/better-xcloud.user.js"
-                        self.chrome_manager.install_tampermonkey_script_in_all_profiles(script_url)
-                        conn.sendall("Opened script URL in all Chrome profiles. Please install manually.".encode())
-                    elif data == "install_tampermonkey":
-                        extension_url = "https://chrome.google.com/webstore/detail/tampermonkey/dhdgffkkebhmkfjojejmpbldmpobfkfo"
-                        self.chrome_manager.install_extension_on_all_profiles(extension_url)
-                        conn.sendall("Opened extension page in all Chrome profiles. Please install manually.".encode())
-                    elif data == "open_all_chrome_profiles":
-                        self.chrome_manager.open_all_chrome_profiles()
-                        conn.sendall("Opened all Chrome profiles.".encode())
-                    elif data == "start_movement":
-                        self.gamepad_controller.start_movement()
-                        conn.sendall("Movement started.".encode())
-                    elif data == "stop_movement":
-                        self.gamepad_controller.stop_movement()
-                        conn.sendall("Movement stopped.".encode())
-                    elif data == "tail_logs":
-                        try:
-                            # Tail the last 100 lines of the log file
-                            last_logs = tail_lines('server.log', num_lines=100)
-                            if not last_logs:
-                                last_logs = "No logs found or log file empty.\n"
-                            conn.sendall(last_logs.encode('utf-8', errors='replace'))
-                        except Exception as e:
-                            logging.error(f"Failed to tail logs: {e}")
-                            error_msg = f"Error reading logs: {e}"
-                            conn.sendall(error_msg.encode('utf-8'))
-                    else:
-                        conn.sendall("unknown command".encode())
+                    if data == BINARY_HANDSHAKE:
+                        conn.sendall(BINARY_ENABLED_REPLY.encode())
+                        self._serve_binary(conn, addr)
+                        break
 
+                    num_lines = self.parse_follow_logs(data)
+                    if num_lines is not None:
+                        self._follow_logs(conn, addr, num_lines)
+                        break
+
+                    reply = self.process_command(data)
+                    conn.sendall(reply.encode('utf-8', errors='replace'))
+
+            except socket.timeout:
+                logging.info(f"Client {addr} timed out")
             except Exception as e:
                 logging.error(f"Error handling client {addr}: {e}")
+            finally:
+                self._release_connection()
+
+    def _serve_binary(self, conn, addr):
+        """Serve a connection that switched to the binary protocol until it closes."""
+        logging.info(f"Client {addr} switched to binary protocol")
+        decoder = BinaryRequestDecoder()
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                return
+            try:
+                requests = decoder.feed(data)
+            except FrameError as e:
+                logging.warning(f"Closing {addr}: {e}")
+                return
+            if requests:
+                conn.sendall(b"".join(
+                    encode_binary_reply(request_id, *self.process_binary(opcode, pad_id, argument))
+                    for opcode, pad_id, request_id, argument in requests
+                ))
+
+    async def _serve_binary_async(self, reader, writer, addr):
+        """Event-loop variant of _serve_binary."""
+        logging.info(f"Client {addr} switched to binary protocol")
+        decoder = BinaryRequestDecoder()
+        while True:
+            data = await asyncio.wait_for(reader.read(65536), self.idle_timeout)
+            if not data:
+                return
+            try:
+                requests = decoder.feed(data)
+            except FrameError as e:
+                logging.warning(f"Closing {addr}: {e}")
+                return
+            for opcode, pad_id, request_id, argument in requests:
+                status, reply = await self.process_binary_async(opcode, pad_id, argument)
+                writer.write(encode_binary_reply(request_id, status, reply))
+            await writer.drain()
+
+    def _process_frames(self, conn, addr, decoder, data):
+        """
+        Run every complete frame in `data` in order and send the replies in one write.
+        Returns True once the connection has been handed over to follow_logs and ended.
+        """
+        replies = []
+        for payload in decoder.feed(data):
+            request_id, command = split_request(payload)
+            num_lines = self.parse_follow_logs(command)
+            if num_lines is not None:
+                conn.sendall(b"".join(replies))
+                self._follow_logs(conn, addr, num_lines, request_id)
+                return True
+            replies.append(encode_reply(request_id, self.process_command(command)))
+        if replies:
+            conn.sendall(b"".join(replies))
+        return False
+
+    async def handle_client_async(self, reader, writer):
+        """Handle a client on the event loop, offloading blocking commands to the worker pool."""
+        addr = writer.get_extra_info('peername')
+        if not self._acquire_connection():
+            self._reject_async(writer, addr)
+            return
+        logging.info(f"Connected to {addr}")
+        loop = asyncio.get_event_loop()
+        queue = None
+        worker = None
+        try:
+            sock = writer.get_extra_info('socket')
+            if sock is not None:
+                self._configure_client_socket(sock)
+
+            # Receive the HWID from the client as the first message
+            hwid, pending = split_handshake(await asyncio.wait_for(reader.read(1024), self.handshake_timeout))
+
+            # The whitelist lookup touches SQLite, keep it off the loop
+            authorized, reply = await loop.run_in_executor(self._executor, self.authorize, hwid)
+            writer.write(reply.encode())
+            await writer.drain()
+            if not authorized:
+                return
+
+            decoder = None
+            data = pending
+
+            # Process subsequent commands
+            while True:
+                if not data:
+                    data = await asyncio.wait_for(reader.read(65536 if decoder else 1024), self.idle_timeout)
+                    if not data:
+                        break
+
+                if decoder is None and is_framed(data):
+                    logging.info(f"Client {addr} switched to framed protocol")
+                    decoder = FrameDecoder()
+                    queue = asyncio.Queue(maxsize=self.PIPELINE_DEPTH)
+                    worker = loop.create_task(self._run_pipeline(queue, writer))
+
+                if decoder is not None:
+                    following = False
+                    for payload in decoder.feed(data):
+                        request_id, command = split_request(payload)
+                        num_lines = self.parse_follow_logs(command)
+                        if num_lines is not None:
+                            # Replies to commands queued before it keep flowing alongside the stream
+                            await self._follow_logs_async(reader, writer, addr, num_lines, request_id)
+                            following = True
+                            break
+                        if command in self.INLINE_COMMANDS:
+                            # Answer immediately, possibly ahead of queued gamepad commands
+                            writer.write(encode_reply(request_id, self.process_command(command)))
+                        else:
+                            await queue.put((request_id, command))
+                    if following:
+                        break
+                    await writer.drain()
+                    data = b""
+                    continue
+
+                command = data.decode().strip()
+                data = b""
+                if not command:
+                    break
+
+                if command == BINARY_HANDSHAKE:
+                    writer.write(BINARY_ENABLED_REPLY.encode())
+                    await writer.drain()
+                    await self._serve_binary_async(reader, writer, addr)
+                    break
+
+                num_lines = self.parse_follow_logs(command)
+                if num_lines is not None:
+                    await self._follow_logs_async(reader, writer, addr, num_lines)
+                    break
+
+                reply = await self.process_command_async(command)
+                writer.write(reply.encode('utf-8', errors='replace'))
+                await writer.drain()
+
+        except asyncio.TimeoutError:
+            logging.info(f"Client {addr} timed out")
+        except asyncio.CancelledError:
+            pass  # Server shutting down
+        except Exception as e:
+            logging.error(f"Error handling client {addr}: {e}")
+        finally:
+            try:
+                if worker is not None and self.is_running:
+                    # Let commands the client already sent finish before closing
+                    await queue.put(None)
+                    await worker
+                elif worker is not None:
+                    worker.cancel()
+            finally:
+                writer.close()
+                self._release_connection()
+
+    def _reject_async(self, writer, addr):
+        """Refuse a connection over the limit without reading its handshake."""
+        logging.warning(f"Rejected {addr}: at capacity ({self.max_connections} connections)")
+        writer.write(self.CAPACITY_REPLY.encode())
+        writer.close()
+
+    async def _run_pipeline(self, queue, writer):
+        """Execute queued framed commands one at a time, in the order they were received."""
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            request_id, command = item
+            try:
+                reply = await self.process_command_async(command)
+                writer.write(encode_reply(request_id, reply))
+                await writer.drain()
+            except Exception as e:
+                logging.error(f"Error running pipelined command '{command}': {e}")
 
     def start(self):
         """Start the server."""
         try:
+            if os.name != 'nt':
+                # Rebind right after a restart despite connections in TIME_WAIT (on Windows this would allow port hijacking)
+                self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(5)
-            logging.info(f"Server listening on {self.host}:{self.port}")
+            self.server_socket.listen(self.listen_backlog)
+            logging.info(f"Server listening on {self.host}:{self.port} ({self.engine} engine)")
+            self.fleet.start()
 
-            while self.is_running:
+            if self.metrics_port:
+                self.metrics_http = MetricsHTTPServer(self, self.host, self.metrics_port)
+                self.metrics_http.start()
+
+            if self.engine == "asyncio":
+                self._serve_asyncio()
+            else:
+                self._serve_threaded()
+        except Exception as e:
+            logging.error(f"Server encountered an error: {e}")
+        finally:
+            if not self._draining:
+                self.shutdown()  # drain() shuts down once running commands finish
+
+    def _serve_threaded(self):
+        """Accept loop that spawns one thread per client."""
+        while self.is_running:
+            try:
                 conn, addr = self.server_socket.accept()
+            except OSError:
+                if not self.is_running or self._draining:
+                    break  # Listening socket closed by shutdown() or drain()
+                raise
+            if not self._acquire_connection():
+                self._reject(conn, addr)
+                continue
+            try:
                 client_thread = threading.Thread(target=self.handle_client, args=(conn, addr), daemon=True)
                 client_thread.start()
-        except Exception as e:
-            logging.error(f"Server encountered an error: {e}")
+            except RuntimeError as e:
+                # Out of threads; refuse this client instead of stopping the accept loop
+                self._release_connection()
+                logging.error(f"Could not start a thread for {addr}: {e}")
+                self._reject(conn, addr)
+
+    def _reject(self, conn, addr):
+        """Refuse a connection over the limit without reading its handshake."""
+        logging.warning(f"Rejected {addr}: at capacity ({self.max_connections} connections)")
+        try:
+            conn.setblocking(False)
+            conn.send(self.CAPACITY_REPLY.encode())
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def _serve_asyncio(self):
+        """Serve every client from a single event loop thread."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._loop = loop
+        server = loop.run_until_complete(asyncio.start_server(self.handle_client_async, sock=self.server_socket))
+        self._async_server = server
+        try:
+            if self.is_running:
+                loop.run_forever()
         finally:
-            self.shutdown()
+            self._loop = None
+            self._async_server = None
+            server.close()
+            self._cancel_tasks(loop)
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+            self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _cancel_tasks(loop):
+        """Cancel the client handlers still running on `loop` and let them clean up."""
+        all_tasks = getattr(asyncio, "all_tasks", None) or asyncio.Task.all_tasks
+        tasks = [task for task in all_tasks(loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    def drain(self, timeout=None):
+        """
+        Stop accepting clients and commands, wait up to `timeout` seconds
+        (default drain_timeout) for commands already running to finish, then
+        shut down. Commands sent meanwhile get DRAINING_REPLY.
+        """
+        if timeout is None:
+            timeout = self.config_manager.get_float('drain_timeout', self.DRAIN_TIMEOUT)
+        with self._in_flight_done:
+            self._draining = True
+            in_flight = self._in_flight
+        logging.info(f"Draining server: waiting for {in_flight} running command(s).")
+        self._stop_listening()
+
+        started = time.perf_counter()
+        with self._in_flight_done:
+            drained = self._in_flight_done.wait_for(lambda: not self._in_flight, timeout)
+            in_flight = self._in_flight
+        if drained:
+            logging.info(f"Server drained in {time.perf_counter() - started:.2f} s.")
+        else:
+            logging.warning(f"Drain timed out after {timeout} s with {in_flight} command(s) still running.")
+        self.shutdown()
+
+    def _stop_listening(self):
+        """Close the listening socket so new clients are refused while connected ones finish."""
+        loop, server = self._loop, self._async_server
+        if loop is not None and server is not None:
+            try:
+                loop.call_soon_threadsafe(server.close)
+            except RuntimeError:
+                pass  # Loop already closed
+            return
+        self._close_listening_socket()
+
+    def _close_listening_socket(self):
+        try:
+            # Wakes a thread blocked in accept(), which close() alone does not do on Linux
+            self.server_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Not listening
+        self.server_socket.close()
 
     def shutdown(self):
         """Shutdown the server gracefully."""
         logging.info("Shutting down server...")
-        self.gamepad_controller.running = False
-
-        # Stop Anti-AFK if running
-        if self.gamepad_controller.anti_afk_enabled:
-            self.gamepad_controller.stop_anti_afk()
 
-        # Stop Movement Loop if running
-        if self.gamepad_controller.movement_enabled:
-            self.gamepad_controller.stop_movement()
+        # Stop Anti-AFK, Movement on every pad and the shared input scheduler
+        self.fleet.shutdown()
+        self.chrome_manager.supervisor.stop()
 
         self.is_running = False
-        self.server_socket.close()
+
+        if self.metrics_http is not None:
+            self.metrics_http.stop()
+            self.metrics_http = None
+
+        # Wake the event loop so it closes the listening socket itself (asyncio engine only)
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+                return
+            except RuntimeError:
+                pass  # Loop already closed
+
+        self._close_listening_socket()
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import weakref
+import logging
+import threading
+from contextlib import contextmanager
+
+class _ThreadConnection:
+    """Holds one thread's connection in its thread-local; closing it when the thread exits."""
+
+    __slots__ = ("conn", "generation", "__weakref__")
+
+    def __init__(self, conn, generation):
+        self.conn = conn
+        self.generation = generation
+
+
+class Database:
+    """
+    Thread-safe SQLite access shared by the managers.
+
+    Every thread gets its own connection, closed when the thread exits (client
+    threads come and go with their sockets). The database runs in WAL mode so
+    readers never wait for a writer, and writes use BEGIN IMMEDIATE so
+    concurrent writers queue on busy_timeout instead of failing with
+    "database is locked".
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path="hwids.db", busy_timeout=5.0, cached_statements=128):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._generation = 0
+
+    @classmethod
+    def for_path(cls, db_path="hwids.db"):
+        """Return the shared Database for `db_path`, creating it on first use."""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            database = cls._instances.get(key)
+            if database is None:
+                database = cls._instances[key] = cls(db_path)
+            return database
+
+    def connection(self):
+        """Return this thread's connection, opening it on first use."""
+        local = self._local
+        holder = getattr(local, "holder", None)
+        if holder is not None and holder.generation == self._generation:
+            return holder.conn
+
+        # isolation_level=None: autocommit unless a transaction() is open
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        with self._connections_lock:
+            self._connections.append(conn)
+            holder = _ThreadConnection(conn, self._generation)
+        # The thread-local drops the holder when the thread exits
+        weakref.finalize(holder, self._release, conn)
+        local.holder = holder
+        local.depth = 0
+        return conn
+
+    def _release(self, conn):
+        """Close the connection of a thread that has exited."""
+        with self._connections_lock:
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                return  # Already closed by close()
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logging.warning(f"Failed to close database connection: {e}")
+
+    def query_one(self, sql, params=()):
+        """Run a read query and return the first row or None."""
+        return self.connection().execute(sql, params).fetchone()
+
+    def query_all(self, sql, params=()):
+        """Run a read query and return all rows."""
+        return self.connection().execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into a single commit. Nested calls join the outer
+        transaction, so callers can batch several manager writes together.
+        """
+        conn = self.connection()
+        local = self._local
+        if local.depth:
+            local.depth += 1
+            try:
+                yield conn
+            finally:
+                local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            local.depth = 0
+
+    def execute(self, sql, params=()):
+        """Run a single write statement in its own (or the current) transaction. Returns the cursor."""
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        """Run a write statement for many parameter sets with a single commit."""
+        with self.transaction() as conn:
+            return conn.executemany(sql, seq_of_params)
+
+    def close(self):
+        """Close every connection opened by this database. Threads reconnect on next use."""
+        with self._connections_lock:
+            self._generation += 1
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to close database connection: {e}")
@@ -1,27 +1,15 @@
 import logging
 import time
 import os
-import platform
-import subprocess
-import requests
-import zipfile
 from colorama import init, Fore, Style
 import sys
-import os
-import subprocess
 import socket
+import threading
+from zeus_server_app.log_pipeline import setup_logging  # Re-exported for existing callers
+from zeus_server_app.log_tail import LogTailer
 
 
 
-def setup_logging():
-    """Set up logging configuration."""
-    logging.basicConfig(
-        filename='server.log',
-        level=logging.INFO,
-        format='[%(asctime)s] %(levelname)s: %(message)s'
-    )
-
-
 def log_info(message):
     """Log informational messages."""
     logging.info(message)
@@ -52,6 +40,7 @@ def get_local_ip():
 
 def get_public_ip():
     """Get the public IPv4 address using multiple services."""
+    import requests  # Deferred: only the menu needs it, and it is slow to import
     services = [
         'https://api.ipify.org',
         'https://ifconfig.me/ip',
@@ -69,125 +58,205 @@ def get_public_ip():
     return None
 
 
-def display_menu(server, config_manager, chrome_manager):
-    """Display the menu-driven interface."""
-    init(autoreset=True)
-    while True:
-        # Clear the screen for better readability
-        if os.name == 'nt':  # For Windows
-            os.system('cls')
-        else:
-            os.system('clear')
+class AddressCache:
+    """
+    Public and local IP addresses of this machine, looked up on a background
+    thread and cached for `ttl` seconds so the menu never waits on the network.
+    """
 
-        # Get the public and local IP addresses
-        public_ip = get_public_ip()
-        local_ip = get_local_ip()
+    def __init__(self, ttl=600.0):
+        self.ttl = ttl
+        self.public_ip = None
+        self.local_ip = None
+        self.updated = None  # monotonic time of the last completed lookup
+        self._lock = threading.Lock()
+        self._thread = None
 
-        # Display the header and IP addresses
-        print_header(public_ip, local_ip)
+    @property
+    def refreshing(self):
+        return self._thread is not None and self._thread.is_alive()
 
-        # Display the menu options
-        print_options()
-        choice = input(f"{Fore.GREEN}Enter your choice: {Style.RESET_ALL}")
-        if choice == '9':
-            print("Exiting...")
-            server.shutdown()
-            break
-        perform_action(server, config_manager, chrome_manager, choice)
-        
-    """Display the menu-driven interface."""
+    def get(self):
+        """Return (public_ip, local_ip) immediately, starting a refresh if the cache is stale."""
+        if self.updated is None or time.monotonic() - self.updated >= self.ttl:
+            self.refresh()
+        return self.public_ip, self.local_ip
+
+    def refresh(self):
+        """Look the addresses up again in the background, unless a lookup is already running."""
+        with self._lock:
+            if self.refreshing:
+                return
+            self._thread = threading.Thread(target=self._lookup, name="ip-lookup", daemon=True)
+            self._thread.start()
+
+    def _lookup(self):
+        self.local_ip = get_local_ip()
+        self.public_ip = get_public_ip()
+        self.updated = time.monotonic()
+
+
+# ANSI control sequences for redrawing the menu in place
+CURSOR_HOME = "\x1b[H"
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[2K"
+
+
+def move_cursor(row, column=1):
+    return f"\x1b[{row};{column}H"
+
+
+class ServerStats:
+    """Computes the menu's live status line from the server's metrics."""
+
+    def __init__(self, server):
+        self.server = server
+        self._last_sample = (time.monotonic(), self._commands_total())
+
+    def _commands_total(self):
+        return sum(histogram.count for histogram in list(self.server.metrics.commands.values()))
+
+    def line(self):
+        now = time.monotonic()
+        total = self._commands_total()
+        last_time, last_total = self._last_sample
+        self._last_sample = (now, total)
+        elapsed = now - last_time
+        rate = (total - last_total) / elapsed if elapsed > 0 else 0.0
+
+        modes = {}
+        for mode in self.server.fleet.status().values():
+            modes[mode] = modes.get(mode, 0) + 1
+        pads = ", ".join(f"{count} {mode}" for mode, count in sorted(modes.items()))
+        return (f"Connections: {Fore.GREEN}{self.server.metrics.connections_active}/{self.server.max_connections}"
+                f"{Style.RESET_ALL}  Commands/s: {Fore.GREEN}{rate:.1f}{Style.RESET_ALL}  Pads: {pads}")
+
+
+def display_menu(server, config_manager, chrome_manager, refresh_interval=1.0):
+    """
+    Display the menu-driven interface. The screen is redrawn with ANSI
+    sequences, and the status lines keep updating while waiting for a choice.
+    """
     init(autoreset=True)
+    addresses = AddressCache(ttl=config_manager.get_float('public_ip_ttl', 600.0))
+    addresses.refresh()
+    stats = ServerStats(server)
+
+    def status_lines():
+        return [stats.line()] + header_lines(addresses)
+
     while True:
-        if os.name == 'nt':  # For Windows
-           os.system('cls')
-        else:
-            os.system('clear')
-        print_options()
-        choice = input(f"{Fore.GREEN}Enter your choice: {Style.RESET_ALL}")
+        screen = [f"{Fore.CYAN}[Zeus Server Script CoDBo6]{Style.RESET_ALL}"] + status_lines() + [""] + option_lines()
+        sys.stdout.write(CURSOR_HOME + CLEAR_SCREEN + "\n".join(screen) + "\n")
+        sys.stdout.flush()
+
+        choice = read_choice("Enter your choice: ", len(screen) + 1, status_lines, first_row=2, interval=refresh_interval)
         if choice == '9':
             print("Exiting...")
             server.shutdown()
             break
+        if choice.lower() == 'r':
+            addresses.refresh()
+            continue
         perform_action(server, config_manager, chrome_manager, choice)
 
 
-def tail_lines(file_path, num_lines=100, chunk_size=4096):
+def read_choice(prompt, prompt_row, status_lines, first_row, interval=1.0):
     """
-    Return the last `num_lines` lines from the file at `file_path`.
-    Reads the file from the end in chunks to avoid loading it all into memory.
+    Prompt with `prompt` on row `prompt_row` and read one line of input while redrawing `status_lines()` at `first_row`
+    every `interval` seconds. Falls back to a plain input() when stdin is not
+    an interactive console.
     """
-    if not os.path.isfile(file_path):
-        logging.warning(f"File '{file_path}' does not exist.")
-        return ""
-
-    lines = []
-    end_char_found = 0  # Count of newline chars found
-    with open(file_path, 'rb') as f:
-        # Move to end of file
-        f.seek(0, os.SEEK_END)
-        file_size = f.tell()
-
-        if file_size == 0:
-            # Empty file
-            return ""
-
-        # Start reading from the end
-        offset = 0
-        chunk_data = b''
-
-        while end_char_found <= num_lines and offset < file_size:
-            # Move backward by chunk_size or till start of file
-            read_size = min(chunk_size, file_size - offset)
-            f.seek(file_size - offset - read_size)
-            chunk = f.read(read_size)
+    if not sys.stdin.isatty():
+        return input(f"{Fore.GREEN}{prompt}{Style.RESET_ALL}").strip()
+    sys.stdout.write(f"{Fore.GREEN}{prompt}{Style.RESET_ALL}")
+    sys.stdout.flush()
+
+    if os.name == 'nt':
+        import msvcrt
+        typed = []
+        deadline = time.monotonic() + interval
+        while True:
+            while msvcrt.kbhit():
+                char = msvcrt.getwch()
+                if char in ('\r', '\n'):
+                    sys.stdout.write("\n")
+                    return "".join(typed).strip()
+                if char == '\x03':
+                    raise KeyboardInterrupt
+                if char == '\b':
+                    if typed:
+                        typed.pop()
+                        sys.stdout.write("\b \b")
+                elif char.isprintable():
+                    typed.append(char)
+                    sys.stdout.write(char)
+                sys.stdout.flush()
+            if time.monotonic() >= deadline:
+                # The console has no cursor save/restore; return to the end of the typed text instead
+                _redraw_status(status_lines(), first_row,
+                               move_cursor(prompt_row, len(prompt) + len(typed) + 1))
+                deadline = time.monotonic() + interval
+            time.sleep(0.02)
+
+    import select
+    while True:
+        ready, _, _ = select.select([sys.stdin], [], [], interval)
+        if ready:
+            return sys.stdin.readline().strip()
+        # Save and restore the cursor so text typed so far stays where it is
+        sys.stdout.write("\x1b7")
+        _redraw_status(status_lines(), first_row, "\x1b8")
 
-            # Prepend the chunk_data (reading backwards)
-            chunk_data = chunk + chunk_data
 
-            end_char_found = chunk_data.count(b'\n')
-            offset += read_size
+def _redraw_status(lines, first_row, restore):
+    """Rewrite the status lines in place, then put the cursor back with `restore`."""
+    output = "".join(move_cursor(first_row + offset) + CLEAR_LINE + line for offset, line in enumerate(lines))
+    sys.stdout.write(output + restore)
+    sys.stdout.flush()
 
-            # If we've got more than needed lines or reached start of file
-            if end_char_found >= num_lines or offset >= file_size:
-                break
 
-        # Convert to string now
-        text = chunk_data.decode('utf-8', errors='replace')
+def tail_lines(file_path, num_lines=100):
+    """
+    Return the last `num_lines` lines from the log at `file_path`, including
+    its rotated segments. Uses the shared LogTailer of the path, so repeated
+    calls only index what was appended since the last one.
+    """
+    if not os.path.isfile(file_path):
+        logging.warning(f"File '{file_path}' does not exist.")
+        return ""
+    return LogTailer.for_path(file_path).tail(num_lines)
+
+
+def option_lines():
+    """Return the menu options."""
+    return [
+        f"{Fore.BLUE}Select an option:{Style.RESET_ALL}",
+        f"{Fore.YELLOW}1. Add HWID{Style.RESET_ALL}",
+        f"{Fore.YELLOW}2. Delete HWID{Style.RESET_ALL}",
+        f"{Fore.YELLOW}3. Set Chrome Shortcuts Path{Style.RESET_ALL}",
+        f"{Fore.YELLOW}4. Open all chrome profiles{Style.RESET_ALL}",
+        f"{Fore.YELLOW}5. Install Tampermonkey extension: profiles{Style.RESET_ALL}",
+        f"{Fore.YELLOW}6. Install Better xCloud script for Tampermoney{Style.RESET_ALL}",
+        f"{Fore.YELLOW}7. Tail Logs{Style.RESET_ALL}",
+        f"{Fore.YELLOW}8. Open selected chrome profiles{Style.RESET_ALL}",
+        f"{Fore.YELLOW}R. Refresh IP addresses{Style.RESET_ALL}",
+        f"{Fore.YELLOW}9. Exit{Style.RESET_ALL}",
+    ]
 
-        # Split lines
-        all_lines = text.splitlines()
 
-        # If file has fewer lines than num_lines, just return them all
-        if len(all_lines) <= num_lines:
-            return '\n'.join(all_lines) + '\n'
-        else:
-            # Return only the last num_lines lines
-            return '\n'.join(all_lines[-num_lines:]) + '\n'
-
-
-def print_options():
-    """Print the menu options."""
-    print(f"{Fore.BLUE}Select an option:{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}1. Add HWID{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}2. Delete HWID{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}3. Set Chrome Shortcuts Path{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}4. Open all chrome profiles{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}5. Install Tampermonkey extension: profiles{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}6. Install Better xCloud script for Tampermoney{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}7. Tail Logs{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}9. Exit{Style.RESET_ALL}")
-
-
-def print_header(public_ip, local_ip):
-    """Print the header with IP addresses."""
-    print(f"{Fore.CYAN}[Zeus Server Script CoDBo6]{Style.RESET_ALL}")
+def header_lines(addresses):
+    """Return the IP address lines of the header, without waiting for a lookup."""
+    public_ip, local_ip = addresses.get()
     if public_ip:
-        print(f"The lobby manager can connect to this with Public IP: {Fore.GREEN}{public_ip}{Style.RESET_ALL}")
+        public_line = f"The lobby manager can connect to this with Public IP: {Fore.GREEN}{public_ip}{Style.RESET_ALL}"
+    elif addresses.refreshing:
+        public_line = f"{Fore.YELLOW}Looking up public IP address...{Style.RESET_ALL}"
     else:
-        print(f"{Fore.RED}Unable to retrieve public IP address.{Style.RESET_ALL}")
-        print("Please ensure the server has internet access.")
-
-    print(f"The lobby manager can connect to this with Local IP: {Fore.YELLOW}{local_ip}{Style.RESET_ALL}")
+        public_line = (f"{Fore.RED}Unable to retrieve public IP address.{Style.RESET_ALL} "
+                       "Please ensure the server has internet access.")
+    local_line = f"The lobby manager can connect to this with Local IP: {Fore.YELLOW}{local_ip or '...'}{Style.RESET_ALL}"
+    return [public_line, local_line]
 
 
 def perform_action(server, config_manager, chrome_manager, choice): 
@@ -202,23 +271,66 @@ def perform_action(server, config_manager, chrome_manager, choice):
     elif choice == '3':
         set_chrome_shortcuts_path(config_manager)
     elif choice == '4':
-        chrome_manager.open_all_chrome_profiles()
-        print("All Chrome profiles have been opened.")
+        if wait_for_launch_job(chrome_manager.open_all_chrome_profiles()):
+            print("All Chrome profiles have been opened.")
         input("Press Enter to continue...")
     elif choice == '5':
         extension_url = "https://chrome.google.com/webstore/detail/tampermonkey/dhdgffkkebhmkfjojejmpbldmpobfkfo"
-        chrome_manager.install_extension_on_all_profiles(extension_url)
-        print("Opened extension page in all Chrome profiles. Please install manually.")
+        if wait_for_launch_job(chrome_manager.install_extension_on_all_profiles(extension_url)):
+            print("Opened extension page in all Chrome profiles. Please install manually.")
     elif choice == '6':
         script_url = "https://github.com/redphx/better-xcloud/releases/latest/download/better-xcloud.user.js"
-        chrome_manager.install_tampermonkey_script_in_all_profiles(script_url)
-        print("Opened script URL in all Chrome profiles. Please install via Tampermonkey.")
+        if wait_for_launch_job(chrome_manager.install_tampermonkey_script_in_all_profiles(script_url)):
+            print("Opened script URL in all Chrome profiles. Please install via Tampermonkey.")
         input("Press Enter to continue...")
     elif choice == '7':
-        tail_logs()
+        tail_logs(server.log_broadcaster)
+    elif choice == '8':
+        open_selected_profiles(chrome_manager)
     else:
         print("Invalid choice. Please try again.")
 
+def open_selected_profiles(chrome_manager):
+    """Open a subset of the Chrome profiles chosen by name, number or pattern."""
+    profiles = chrome_manager.catalog.profiles()
+    if not profiles:
+        print(f"{Fore.RED}No Chrome profiles found. Check the Chrome shortcuts path.{Style.RESET_ALL}")
+        input("Press Enter to continue...")
+        return
+
+    print(f"{Fore.BLUE}Chrome profiles:{Style.RESET_ALL}")
+    for profile in profiles:
+        print(f"{profile.index}. {profile.name}")
+    print("Enter '-' to go back.")
+    selection = input("Profiles to open (names, numbers or patterns such as bot0*): ").strip()
+    if selection in ('', '-'):
+        return
+
+    job, unmatched = chrome_manager.open_profiles(selection.replace(",", " ").split())
+    if unmatched:
+        print(f"{Fore.YELLOW}No profile matches: {', '.join(unmatched)}{Style.RESET_ALL}")
+    if job is not None and wait_for_launch_job(job):
+        print("Selected Chrome profiles have been opened.")
+    input("Press Enter to continue...")
+
+
+def wait_for_launch_job(job):
+    """Show the progress of a Chrome launch job until it finishes. Returns False if nothing was launched."""
+    if job is None:
+        print(f"{Fore.RED}No Chrome profiles to open. Check the Chrome shortcuts path.{Style.RESET_ALL}")
+        return False
+    print(f"Launching {len(job.launches)} Chrome windows (job {job.id})...")
+    reported = 0
+    while not job.done.wait(0.5) or reported < len(job.results):
+        for result in job.results[reported:]:
+            if result["ok"]:
+                print(f"  {result['profile']}: ready in {result['launch_ms']:.0f} ms")
+            else:
+                print(f"  {Fore.RED}{result['profile']}: {result['error']}{Style.RESET_ALL}")
+        reported = len(job.results)
+    return True
+
+
 def set_chrome_shortcuts_path(config_manager):
     """Set or update the Chrome shortcuts location or path."""
     existing_path = config_manager.get_config('chrome_shortcuts_path')
@@ -265,178 +377,57 @@ def delete_hwid(hwid_manager):
         print(f"{Fore.RED}Invalid input. Please enter a valid number.{Style.RESET_ALL}")
 
 
-def tail_logs():
-    """Tail the server logs."""
+def tail_logs(broadcaster=None):
+    """Tail the server logs, from the in-process log feed when one is given."""
+    if broadcaster is not None:
+        follow_log_feed(broadcaster)
+        return
     log_file = 'server.log'
     if not os.path.exists(log_file):
         print("Log file does not exist.")
         return
     print(f"Tailing logs from {log_file}. Press Ctrl+C to exit.")
+    f = None
     try:
-        with open(log_file, 'r') as f:
-            # Move to the end of the file
-            f.seek(0, os.SEEK_END)
-            while True:
-                line = f.readline()
-                if not line:
-                    time.sleep(0.5)
-                    continue
+        f = open(log_file, 'r')
+        # Move to the end of the file
+        f.seek(0, os.SEEK_END)
+        while True:
+            line = f.readline()
+            if line:
                 print(line, end='')
+                continue
+            time.sleep(0.5)
+            # Reopen once the log has been rotated away under us
+            try:
+                rotated = os.stat(log_file).st_ino != os.fstat(f.fileno()).st_ino
+            except OSError:
+                rotated = False
+            if rotated:
+                f.close()
+                f = open(log_file, 'r')
     except KeyboardInterrupt:
         print("\nExiting log tail.")
+    finally:
+        if f is not None:
+            f.close()
 
 
-def setup_chrome_driver():
-    """Set up ChromeDriver using webdriver-manager."""
-    try:
-        log_info("Setting up ChromeDriver...")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service)
-        log_success("ChromeDriver setup complete.")
-        return driver
-    except Exception as e:
-        log_error(f"Failed to set up ChromeDriver: {e}")
-        raise
-
-
-
-
-
-    """Set up ChromeDriver using webdriver-manager."""
-    try:
-        log_info("Setting up ChromeDriver...")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service)
-        log_success("ChromeDriver setup complete.")
-        return driver
-    except Exception as e:
-        log_error(f"Failed to set up ChromeDriver: {e}")
-        raise
-    """Download the ChromeDriver that matches the installed Google Chrome version."""
-    try:
-        log_info("Determining the correct ChromeDriver version...")
-
-        # Extract the full prefix of the Chrome version (e.g., '72.0.3626')
-        version_prefix = ".".join(chrome_version.split(".")[:3])
-        url = f"https://chromedriver.storage.googleapis.com/LATEST_RELEASE_{version_prefix}"
-        
-        log_info(f"Fetching the latest ChromeDriver version for Chrome {version_prefix}...")
-        response = requests.get(url)
-        if response.status_code != 200 or "Error" in response.text:
-            raise Exception(f"Failed to retrieve the latest ChromeDriver version for Chrome {version_prefix}")
-        
-        latest_driver_version = response.text.strip()
-
-        # Detect the system platform and architecture
-        system = platform.system().lower()
-        arch = platform.machine().lower()
-        
-        # Map OS and architecture to ChromeDriver download filenames
-        if system == "windows":
-            if "arm" in arch or "aarch64" in arch:
-                system = "win_arm64"
-            else:
-                system = "win32"
-        elif system == "linux":
-            if "arm" in arch or "aarch64" in arch:
-                system = "linux_arm64"
-            else:
-                system = "linux64"
-        elif system == "darwin":  # macOS
-            if "arm" in arch or "aarch64" in arch:
-                system = "mac_arm64"
-            else:
-                system = "mac64"
-        else:
-            raise Exception("Unsupported Operating System for ChromeDriver")
-
-        driver_download_url = f"https://chromedriver.storage.googleapis.com/{latest_driver_version}/chromedriver_{system}.zip"
-        log_info(f"Downloading ChromeDriver from: {driver_download_url}")
-
-        # Download and save ChromeDriver
-        response = requests.get(driver_download_url, stream=True)
-        if response.status_code != 200:
-            raise Exception(f"Failed to download ChromeDriver from {driver_download_url}")
-        
-        zip_path = "chromedriver.zip"
-        with open(zip_path, "wb") as file:
-            file.write(response.content)
-
-        # Extract the downloaded zip
-        log_info("Extracting ChromeDriver...")
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall("chromedriver")
-
-        # Clean up
-        os.remove(zip_path)
-        chromedriver_path = os.path.abspath("chromedriver/chromedriver")
-        log_success(f"ChromeDriver downloaded and available at: {chromedriver_path}")
-        return chromedriver_path
-    except Exception as e:
-        log_error(f"Failed to download ChromeDriver: {e}")
-        raise
-
-    """Download the ChromeDriver that matches the installed Google Chrome version."""
+def follow_log_feed(broadcaster, backlog=20):
+    """Print records from a LogBroadcaster as they are logged, until Ctrl+C."""
+    print("Following server logs. Press Ctrl+C to exit.")
+    subscription = broadcaster.subscribe(backlog)
     try:
-        log_info("Determining the correct ChromeDriver version...")
-        major_version = chrome_version.split(".")[0]
-        url = f"https://chromedriver.storage.googleapis.com/LATEST_RELEASE_{major_version}"
-        print(url)
-        
-        log_info(f"Fetching the latest ChromeDriver version for Chrome {major_version}...")
-        response = requests.get(url)
-        if response.status_code != 200 or "Error" in response.text:
-            raise Exception(f"Failed to retrieve the latest ChromeDriver version for Chrome {major_version}")
-        
-        latest_driver_version = response.text.strip()
-
-        system = platform.system().lower()
-        arch = platform.machine().lower()
-        
-        # Map OS and architecture to ChromeDriver download filenames
-        if system == "windows":
-            if "arm" in arch or "aarch64" in arch:
-                system = "win_arm64"
-            else:
-                system = "win32"
-        elif system == "linux":
-            if "arm" in arch or "aarch64" in arch:
-                system = "linux_arm64"
-            else:
-                system = "linux64"
-        elif system == "darwin":  # macOS
-            if "arm" in arch or "aarch64" in arch:
-                system = "mac_arm64"
-            else:
-                system = "mac64"
-        else:
-            raise Exception("Unsupported Operating System for ChromeDriver")
-
-        driver_download_url = f"https://chromedriver.storage.googleapis.com/{latest_driver_version}/chromedriver_{system}.zip"
-        log_info(f"Downloading ChromeDriver from: {driver_download_url}")
-
-        # Download and save ChromeDriver
-        response = requests.get(driver_download_url, stream=True)
-        if response.status_code != 200:
-            raise Exception(f"Failed to download ChromeDriver from {driver_download_url}")
-        
-        zip_path = "chromedriver.zip"
-        with open(zip_path, "wb") as file:
-            file.write(response.content)
-
-        # Extract the downloaded zip
-        log_info("Extracting ChromeDriver...")
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall("chromedriver")
-
-        # Clean up
-        os.remove(zip_path)
-        chromedriver_path = os.path.abspath("chromedriver/chromedriver")
-        log_success(f"ChromeDriver downloaded and available at: {chromedriver_path}")
-        return chromedriver_path
-    except Exception as e:
-        log_error(f"Failed to download ChromeDriver: {e}")
-        raise
+        while True:
+            lines, dropped = subscription.wait(0.5)
+            if dropped:
+                print(f"... {dropped} log records skipped ...")
+            for line in lines:
+                print(line)
+    except KeyboardInterrupt:
+        print("\nExiting log tail.")
+    finally:
+        subscription.close()
 
 
 def check_vigem_bus_driver():
@@ -446,8 +437,9 @@ def check_vigem_bus_driver():
         return False
 
     try:
-        # Attempt to create a gamepad instance
-        from zeus_server_app.server import CommandServer
+        # Attempt to load the vgamepad driver bindings
+        from zeus_server_app.gamepad_backend import VGamepadBackend
+        VGamepadBackend().check()
         logging.info("ViGEmBus driver is installed and operational.")
         return True
     except Exception as e:
@@ -471,6 +463,7 @@ def download_and_install_vigem_bus():
             logging.error("ViGEmBus installer not found in package.")
             sys.exit(1)
 
+        import subprocess
         print("Launching ViGEmBus installer...")
         logging.info(f"Launching ViGEmBus installer from {installer_path}")
         subprocess.run([installer_path], check=True)
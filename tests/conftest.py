@@ -0,0 +1,102 @@
+import pytest
+
+from zeus_server_app.gamepad_backend import RecordingBackend
+from zeus_server_app.gamepad_controller import GamepadController
+
+
+@pytest.fixture
+def controller():
+    """A controller on a recording pad, idle until a test drives it."""
+    controller = GamepadController(backend=RecordingBackend(), autostart=False)
+    yield controller
+    controller.shutdown()
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A CommandServer with two recording pads that is never started; tests call its command methods."""
+    from zeus_server_app.config_manager import ConfigManager
+    from zeus_server_app.hwid_manager import HWIDManager
+    from zeus_server_app.log_pipeline import LogBroadcaster
+    from zeus_server_app.server import CommandServer
+
+    db_path = str(tmp_path / "test.db")
+    server = CommandServer(HWIDManager(db_path), ConfigManager(db_path), gamepad_count=2,
+                           gamepad_backend=RecordingBackend(), log_file=str(tmp_path / "server.log"),
+                           log_broadcaster=LogBroadcaster())
+    yield server
+    server.shutdown()
+
+
+HWID = "test-hwid"
+
+
+@pytest.fixture
+def live_server(tmp_path):
+    """
+    Factory that starts CommandServers on a free local port with two recording
+    pads and HWID whitelisted. `start(engine, **options)` returns (server, port).
+    """
+    import threading
+    import time
+    from zeus_server_app.config_manager import ConfigManager
+    from zeus_server_app.hwid_manager import HWIDManager
+    from zeus_server_app.log_pipeline import LogBroadcaster
+    from zeus_server_app.server import CommandServer
+
+    started = []
+
+    def start(engine="threaded", **options):
+        db_path = str(tmp_path / f"live{len(started)}.db")
+        hwid_manager = HWIDManager(db_path)
+        hwid_manager.add_hwid(HWID)
+        options.setdefault("log_broadcaster", LogBroadcaster())
+        server = CommandServer(hwid_manager, ConfigManager(db_path), host="127.0.0.1", port=0, engine=engine,
+                               gamepad_count=2, gamepad_backend=RecordingBackend(),
+                               log_file=str(tmp_path / "server.log"), **options)
+        thread = threading.Thread(target=server.start, daemon=True)
+        started.append((server, thread))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while server.server_socket.getsockname()[1] == 0 or (engine == "asyncio" and server._async_server is None):
+            assert time.monotonic() < deadline, "server did not start listening"
+            time.sleep(0.01)
+        return server, server.server_socket.getsockname()[1]
+
+    yield start
+    for server, thread in started:
+        if server.is_running:
+            server.shutdown()
+        thread.join(timeout=5)
+
+
+@pytest.fixture
+def connect():
+    """
+    Factory for client connections, closed after the test. With `hwid`,
+    `connect(port)` also sends it and returns after the reply.
+    """
+    import socket
+    import time
+
+    clients = []
+
+    def connect(port, hwid=HWID, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                client = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+                break
+            except ConnectionRefusedError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
+        clients.append(client)
+        if hwid is not None:
+            client.sendall(hwid.encode())
+            assert client.recv(1024) == b"HWID authorized."
+        return client
+
+    yield connect
+    for client in clients:
+        client.close()
@@ -0,0 +1,103 @@
+"""
+Regenerate the .lnk fixtures in shortcuts/ with `python make_shortcuts.py`.
+
+The files follow the Shell Link layout of [MS-SHLLINK] as written by
+Windows for a Chrome profile shortcut: a header, an item ID list, a
+LinkInfo block with a local base path, then the counted strings.
+"""
+import os
+import struct
+
+LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+HAS_LINK_TARGET_ID_LIST = 0x01
+HAS_LINK_INFO = 0x02
+HAS_RELATIVE_PATH = 0x08
+HAS_WORKING_DIR = 0x10
+HAS_ARGUMENTS = 0x20
+HAS_ICON_LOCATION = 0x40
+IS_UNICODE = 0x80
+
+CHROME = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+CHROME_DIR = "C:\\Program Files\\Google\\Chrome\\Application"
+
+
+def header(flags):
+    return (struct.pack("<I", 0x4C) + LINK_CLSID + struct.pack("<II", flags, 0x20)
+            + bytes(24)  # Creation, access and write times
+            + struct.pack("<IiI", 0, 0, 1)  # File size, icon index, SW_SHOWNORMAL
+            + bytes(12))  # Hotkey and reserved fields
+
+
+def id_list():
+    # One root item (My Computer), then the terminal ID
+    item = struct.pack("<H", 20) + bytes.fromhex("1f50e04fd020ea3a6910a2d808002b30309d")
+    items = item + b"\x00\x00"
+    return struct.pack("<H", len(items)) + items
+
+
+def link_info(path, unicode_path=False):
+    volume_id = struct.pack("<IIII", 17, 3, 0x1234ABCD, 16) + b"\x00"
+    base_path = path.encode("cp1252", errors="replace") + b"\x00"
+    suffix = b"\x00"
+    header_size = 0x24 if unicode_path else 0x1C
+    volume_offset = header_size
+    base_offset = volume_offset + len(volume_id)
+    suffix_offset = base_offset + len(base_path)
+    body = volume_id + base_path + suffix
+    fields = [1, volume_offset, base_offset, 0, suffix_offset]
+    if unicode_path:
+        base_offset_w = header_size + len(body)
+        base_path_w = path.encode("utf-16-le") + b"\x00\x00"
+        fields += [base_offset_w, base_offset_w + len(base_path_w)]
+        body += base_path_w + b"\x00\x00"
+    info = struct.pack("<I", header_size) + struct.pack(f"<{len(fields)}I", *fields) + body
+    return struct.pack("<I", len(info) + 4) + info
+
+
+def string_data(value):
+    return struct.pack("<H", len(value)) + value.encode("utf-16-le")
+
+
+def shortcut(target=CHROME, arguments=None, relative_path="..\\..\\..\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
+             unicode_path=False, with_link_info=True):
+    flags = HAS_LINK_TARGET_ID_LIST | HAS_RELATIVE_PATH | HAS_WORKING_DIR | HAS_ICON_LOCATION | IS_UNICODE
+    if with_link_info:
+        flags |= HAS_LINK_INFO
+    if arguments is not None:
+        flags |= HAS_ARGUMENTS
+    data = header(flags) + id_list()
+    if with_link_info:
+        data += link_info(target, unicode_path)
+    data += string_data(relative_path) + string_data(CHROME_DIR)
+    if arguments is not None:
+        data += string_data(arguments)
+    data += string_data(CHROME)
+    return data + bytes(4)  # Empty extra data block terminator
+
+
+FIXTURES = {
+    "bot01.lnk": shortcut(arguments='--profile-directory="Profile 3"'),
+    "bot02.lnk": shortcut(arguments="--user-data-dir=D:\\bots\\02 --profile-directory=Default"),
+    "no profile.lnk": shortcut(),
+    "unicode.lnk": shortcut(target="C:\\Users\\Zoë\\Chrome\\chrome.exe", unicode_path=True,
+                            arguments='--profile-directory="Профиль 1"'),
+    "relative only.lnk": shortcut(with_link_info=False, relative_path="Chrome\\chrome.exe",
+                                  arguments="--profile-directory=Profile 9"),
+}
+
+
+def main():
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shortcuts")
+    os.makedirs(directory, exist_ok=True)
+    for name, data in FIXTURES.items():
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(data)
+    # Cut off inside the arguments string, as when a copy is interrupted
+    with open(os.path.join(directory, "truncated.lnk"), "wb") as f:
+        f.write(FIXTURES["bot01.lnk"][:-140])
+    with open(os.path.join(directory, "not a shortcut.lnk"), "wb") as f:
+        f.write(b"[InternetShortcut]\r\nURL=https://www.xbox.com/play\r\n")
+
+
+if __name__ == "__main__":
+    main()
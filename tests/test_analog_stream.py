@@ -0,0 +1,149 @@
+import types
+
+import pytest
+
+from zeus_server_app import analog_stream
+from zeus_server_app.analog_stream import AnalogStream, parse_curve, parse_samples
+from zeus_server_app.gamepad_backend import RecordingPad
+from zeus_server_app.pad_state import PadState
+
+
+class Event:
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class ManualScheduler:
+    """Collects timed events; tests run the ones due on a fake clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    def call_at(self, deadline, callback, *args):
+        event = Event(deadline, callback, args)
+        self.events.append(event)
+        return event
+
+    def pending(self):
+        return [event for event in self.events if not event.cancelled]
+
+    def run_due(self):
+        due = [event for event in self.pending() if event.deadline <= self.clock.now]
+        self.events = [event for event in self.pending() if event.deadline > self.clock.now]
+        for event in due:
+            event.callback(*event.args)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=100.0)
+    monkeypatch.setattr(analog_stream, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def stream(clock):
+    # The pad flushes on its own scheduler; the tests read its model
+    pad = PadState(RecordingPad(), ManualScheduler(clock))
+    return AnalogStream(pad, ManualScheduler(clock), tick=0.01, max_buffered=8)
+
+
+def advance(stream, clock, seconds):
+    clock.now += seconds
+    stream.scheduler.run_due()
+
+
+def test_parse_samples_and_curve():
+    assert parse_samples("0:lx=0.5,ly=-1 16:rt=1") == [(0.0, {"lx": 0.5, "ly": -1.0}), (0.016, {"rt": 1.0})]
+    assert parse_curve("lx=1@250,0@0") == {"lx": [(0.0, 0.0), (0.25, 1.0)]}
+    with pytest.raises(ValueError, match="must be between 0 and 1"):
+        parse_samples("0:lt=-0.5")
+    with pytest.raises(ValueError, match="unknown axis"):
+        parse_curve("zz=0@0")
+
+
+def test_out_of_order_samples_are_dropped(stream):
+    stream.push([(0.1, {"lx": 0.5})])
+    result = stream.push([(0.05, {"lx": 0.2, "ly": 0.2})])
+
+    assert (result["accepted"], result["dropped"], result["buffered"]) == (0, 2, 1)
+    assert stream.stats()["dropped"] == 2
+
+
+def test_samples_beyond_the_buffer_are_dropped(stream):
+    result = stream.push([(index * 0.01, {"lx": 0.1, "ly": 0.1}) for index in range(5)])
+
+    assert (result["accepted"], result["dropped"], result["buffered"]) == (8, 2, 8)
+
+
+def test_late_samples_are_counted_and_applied(stream, clock):
+    stream.push([(0.0, {"lx": 0.0})])
+    clock.now += 0.5
+    result = stream.push([(0.1, {"lx": 0.3}), (0.495, {"ly": 0.4})])
+
+    assert result["late"] == 1  # 0.1 s is more than a tick behind the stream clock; 0.495 s is not
+    advance(stream, clock, 0.0)
+    assert stream.pad.left_stick == (0.3, 0.4)
+
+
+def test_superseded_values_are_skipped(stream, clock):
+    stream.push([(0.0, {"lx": 0.1}), (0.002, {"lx": 0.2}), (0.004, {"lx": 0.3})])
+    advance(stream, clock, 0.005)
+
+    assert stream.pad.left_stick == (0.3, 0.0)
+    stats = stream.stats()
+    assert (stats["applied"], stats["skipped"], stats["buffered"]) == (1, 2, 0)
+
+
+def test_curve_is_interpolated(stream, clock):
+    stream.curve(parse_curve("lx=0@0,1@100 rt=0@0,1@100"))
+    advance(stream, clock, 0.05)
+
+    assert stream.pad.left_stick[0] == pytest.approx(0.5)
+    assert stream.pad.right_trigger in (127, 128)  # 0.5 * 255
+
+    for _ in range(6):
+        advance(stream, clock, 0.01)
+    assert stream.pad.left_stick[0] == 1.0
+    assert stream.stats()["buffered"] == 0
+
+
+def test_tick_runs_only_while_keyframes_are_buffered(stream, clock):
+    stream.push([(0.0, {"lx": 0.5}), (0.02, {"lx": 0.6}), (0.2, {"lx": 0.7})])
+    assert len(stream.scheduler.pending()) == 1
+
+    advance(stream, clock, 0.0)
+    assert [event.deadline for event in stream.scheduler.pending()] == [pytest.approx(100.01)]
+
+    advance(stream, clock, 0.05)  # Fell behind: skips the missed ticks instead of bursting
+    (event,) = stream.scheduler.pending()
+    assert clock.now < event.deadline <= clock.now + stream.tick
+    assert stream.stats()["ticks_missed"] >= 3
+
+    advance(stream, clock, 0.2)
+    stats = stream.stats()
+    assert (stats["ticks"], stats["buffered"], stream.pad.left_stick) == (3, 0, (0.7, 0.0))
+    assert stream.scheduler.pending() == []
+
+
+def test_stop_cancels_the_tick_and_centers_the_pad(stream, clock):
+    stream.push([(0.0, {"lx": 0.5, "rt": 1.0}), (1.0, {"lx": -0.5})])
+    advance(stream, clock, 0.0)
+    assert stream.pad.left_stick == (0.5, 0.0)
+
+    stream.stop()
+
+    assert stream.scheduler.pending() == []
+    assert (stream.pad.left_stick, stream.pad.right_trigger) == ((0.0, 0.0), 0)
+    assert stream.stats()["active"] is False
+
+    # The next push starts a new stream clock
+    clock.now += 5.0
+    assert stream.push([(0.0, {"lx": 0.1})])["late"] == 0
@@ -0,0 +1,65 @@
+from zeus_server_app.browser_supervisor import BrowserSupervisor, DEFAULT_FAMILY, process_family, split_command_line
+
+
+def test_split_command_line_keeps_quoted_spaces():
+    argv = split_command_line(r'"C:\Program Files\Chrome\chrome.exe" --profile-directory="Profile 3" --user-data-dir=C:\bots\a')
+    assert argv == [r"C:\Program Files\Chrome\chrome.exe", "--profile-directory=Profile 3", r"--user-data-dir=C:\bots\a"]
+
+
+def test_split_command_line_backslashes_before_quotes():
+    assert split_command_line(r'a\\"b c" d\"e') == [r"a\b c", 'd"e']
+
+
+def test_process_family():
+    assert process_family(["chrome", "--user-data-dir=/data/a/", "--profile-directory=Profile 1"]) == "/data/a"
+    assert process_family(["chrome", "--profile-directory=Profile 3"]) == DEFAULT_FAMILY
+
+
+class FakeProcesses:
+    def __init__(self):
+        self.processes = []
+
+    def __call__(self):
+        return list(self.processes)
+
+
+def make_supervisor(processes, restarts):
+    supervisor = BrowserSupervisor(restarts.append, start_grace=0, backoff_base=0, list_processes=processes)
+    supervisor.running = True  # Poll by hand instead of on the background thread
+    return supervisor
+
+
+def test_profiles_sharing_a_user_data_dir_are_one_family():
+    processes, restarts = FakeProcesses(), []
+    # The browser names only the first profile it was started with
+    processes.processes = [(10, ["chrome", "--user-data-dir=/data/a", "--profile-directory=Profile 1"], 100),
+                           (11, ["chrome", "--type=renderer", "--user-data-dir=/data/a"], 50)]
+    supervisor = make_supervisor(processes, restarts)
+    supervisor.watch("bot1", '--user-data-dir=/data/a --profile-directory="Profile 1"')
+    supervisor.watch("bot2", '--user-data-dir="/data/a" --profile-directory="Profile 2"')
+
+    supervisor.poll()
+    supervisor.poll()
+
+    status = supervisor.status()
+    assert status["bot1"]["status"] == status["bot2"]["status"] == "running"
+    assert status["bot2"]["pid"] == 10
+    assert restarts == []
+
+
+def test_family_that_exits_is_relaunched_once_per_profile():
+    processes, restarts = FakeProcesses(), []
+    processes.processes = [(10, ["chrome", "--user-data-dir=/data/a"], 100)]
+    supervisor = make_supervisor(processes, restarts)
+    supervisor.watch("bot1", "--user-data-dir=/data/a")
+    supervisor.watch("bot2", "--user-data-dir=/data/a")
+    supervisor.poll()
+
+    processes.processes = []
+    supervisor.poll()  # Both crashed
+    processes.processes = [(20, ["chrome", "--user-data-dir=/data/a"], 100)]
+    supervisor.poll()  # The family is back, but each crashed window still needs its relaunch
+    supervisor.poll()
+
+    assert sorted(restarts) == ["bot1", "bot2"]
+    assert {entry["status"] for entry in supervisor.status().values()} == {"running"}
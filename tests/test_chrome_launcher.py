@@ -0,0 +1,116 @@
+import time
+
+from zeus_server_app.chrome_launcher import ChromeLauncher
+
+
+class FakeProcess:
+    """A `cmd /c start` wrapper that exits with `returncode` right away."""
+
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+
+class FakeChrome:
+    """
+    Chrome processes that appear `delay` seconds after their launch command
+    ran: a renderer per launch, and one browser per user data dir family.
+    """
+
+    def __init__(self, delay, families=None):
+        self.delay = delay
+        self.families = families or {}
+        self.started = {}
+
+    def popen(self, command):
+        self.started[command[-1]] = time.monotonic()
+        return FakeProcess(1 if command[-1] == "fail" else 0)
+
+    def list_processes(self):
+        now = time.monotonic()
+        processes, browsers = [], set()
+        for pid, (name, started) in enumerate(self.started.items(), start=100):
+            if now - started < self.delay:
+                continue
+            family = self.families.get(name, name)
+            if family not in browsers:
+                browsers.add(family)
+                processes.append((pid * 10, ["chrome", f"--user-data-dir={family}"], 0))
+            processes.append((pid, ["chrome", "--type=renderer", f"--user-data-dir={family}"], 0))
+        return processes
+
+
+def run_job(launcher, names, families):
+    job = launcher.submit("test", [(name, ["cmd", "/c", "start", name]) for name in names],
+                          browser_family=families.get)
+    assert job.done.wait(5)
+    return {result["profile"]: result for result in job.results}
+
+
+def test_launch_is_ready_once_its_browser_runs():
+    chrome = FakeChrome(delay=0.2)
+    launcher = ChromeLauncher(stagger=0, popen=chrome.popen, list_processes=chrome.list_processes)
+    launcher.LIST_INTERVAL = 0.02
+
+    results = run_job(launcher, ["bot1", "bot2"], {"bot1": "bot1", "bot2": "bot2"})
+
+    assert results["bot1"]["ok"] and results["bot2"]["ok"]
+    assert results["bot1"]["launch_ms"] >= 200
+
+
+def test_launch_without_a_browser_times_out():
+    chrome = FakeChrome(delay=60)
+    launcher = ChromeLauncher(browser_timeout=0.1, popen=chrome.popen, list_processes=chrome.list_processes)
+    launcher.LIST_INTERVAL = 0.02
+
+    results = run_job(launcher, ["bot1"], {"bot1": "bot1"})
+
+    assert results["bot1"] == {"profile": "bot1", "ok": False, "launch_ms": results["bot1"]["launch_ms"],
+                               "error": "No new browser process after 0.1 s"}
+
+
+def test_unknown_profiles_and_failed_spawns():
+    chrome = FakeChrome(delay=60)
+    launcher = ChromeLauncher(stagger=0, popen=chrome.popen, list_processes=chrome.list_processes)
+
+    results = run_job(launcher, ["extensions page", "fail"], {"fail": "fail"})
+
+    assert results["extensions page"]["ok"]  # No family to wait for: ready at the hand-off
+    assert results["fail"]["error"] == "Exited with code 1"
+
+
+def test_waves_wait_for_the_browsers():
+    chrome = FakeChrome(delay=0.15)
+    launcher = ChromeLauncher(concurrency=1, stagger=0, popen=chrome.popen, list_processes=chrome.list_processes)
+    launcher.LIST_INTERVAL = 0.02
+
+    run_job(launcher, ["bot1", "bot2"], {"bot1": "bot1", "bot2": "bot2"})
+
+    assert chrome.started["bot2"] - chrome.started["bot1"] >= 0.15
+
+
+def test_profiles_sharing_a_browser_each_wait_for_their_window():
+    families = {"bot1": "", "bot2": ""}  # --profile-directory profiles of the default user data dir
+    chrome = FakeChrome(delay=0.15, families=families)
+    launcher = ChromeLauncher(concurrency=1, stagger=0, popen=chrome.popen, list_processes=chrome.list_processes)
+    launcher.LIST_INTERVAL = 0.02
+
+    results = run_job(launcher, ["bot1", "bot2"], families)
+
+    assert results["bot2"]["ok"]
+    assert results["bot2"]["launch_ms"] >= 150  # The browser of bot1 was already running
+    assert chrome.started["bot2"] - chrome.started["bot1"] >= 0.15
+
+
+def test_processes_running_before_the_job_do_not_count():
+    chrome = FakeChrome(delay=0.0)
+    chrome.started["bot1"] = 0.0  # Already open before the job
+    launcher = ChromeLauncher(browser_timeout=0.1, popen=lambda command: FakeProcess(),
+                              list_processes=chrome.list_processes)
+    launcher.LIST_INTERVAL = 0.02
+
+    results = run_job(launcher, ["bot1"], {"bot1": "bot1"})
+
+    assert results["bot1"]["error"] == "No new browser process after 0.1 s"
@@ -0,0 +1,23 @@
+from zeus_server_app.config_manager import ConfigManager
+
+
+def test_miss_does_not_hide_a_later_write(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "test.db")
+    reader, writer = ConfigManager(db_path), ConfigManager(db_path)
+    clock = [100.0]
+    monkeypatch.setattr("zeus_server_app.config_manager.time.monotonic", lambda: clock[0])
+
+    assert reader.get_config("stagger", "1.0") == "1.0"
+    writer.set_config("stagger", "2.5")
+    assert reader.get_config("stagger", "1.0") == "1.0"  # Miss still trusted
+
+    clock[0] += ConfigManager.MISS_TTL
+    assert reader.get_config("stagger", "1.0") == "2.5"
+
+
+def test_local_write_clears_a_miss(tmp_path):
+    config = ConfigManager(str(tmp_path / "test.db"))
+
+    assert config.get_int("concurrency") is None
+    config.set_config("concurrency", "6")
+    assert config.get_int("concurrency") == 6
@@ -0,0 +1,98 @@
+import logging
+import time
+
+import pytest
+
+from zeus_server_app.protocol import FrameDecoder, encode_frame
+
+ENGINES = ["threaded", "asyncio"]
+
+
+def log(server, message):
+    server.log_broadcaster.handle(logging.makeLogRecord({"msg": message, "levelno": logging.INFO,
+                                                         "levelname": "INFO"}))
+
+
+def read_until(client, text, timeout=5.0):
+    """Read from `client` until `text` has been received; returns everything read."""
+    client.settimeout(timeout)
+    data = b""
+    deadline = time.monotonic() + timeout
+    while text.encode() not in data:
+        assert time.monotonic() < deadline, f"{text!r} not received, got {data!r}"
+        chunk = client.recv(65536)
+        assert chunk, f"connection closed before {text!r}, got {data!r}"
+        data += chunk
+    return data.decode()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture(params=ENGINES)
+def follow_server(request, live_server):
+    server, port = live_server(request.param)
+    server.FOLLOW_POLL_INTERVAL = 0.05
+    return server, port
+
+
+def test_backlog_then_live_records(follow_server, connect):
+    server, port = follow_server
+    for index in range(3):
+        log(server, f"old {index}")
+    client = connect(port)
+
+    client.sendall(b"follow_logs 2")
+    received = read_until(client, "old 2")
+    assert "Following logs." in received and "old 1" in received and "old 0" not in received
+
+    log(server, "live record")
+    assert "live record" in read_until(client, "live record")
+
+
+def test_slow_reader_is_told_about_dropped_records(follow_server, connect):
+    server, port = follow_server
+    server.FOLLOW_MAX_PENDING = 3
+    for index in range(10):
+        log(server, f"record {index}")
+    client = connect(port)
+
+    client.sendall(b"follow_logs 10")
+    received = read_until(client, "record 9")
+
+    assert "[follow_logs] 7 log records dropped, client is reading too slowly" in received
+    assert "record 6" not in received and "record 7" in received
+
+
+def test_disconnect_unsubscribes(follow_server, connect):
+    server, port = follow_server
+    client = connect(port)
+    client.sendall(b"follow_logs")
+    read_until(client, "Following logs.")
+    assert server.log_broadcaster.subscriber_count == 1
+
+    client.close()
+    wait_for(lambda: server.log_broadcaster.subscriber_count == 0)
+    wait_for(lambda: server.connection_status()["active"] == 0)
+
+
+def test_framed_follow_logs_tags_each_batch(follow_server, connect):
+    server, port = follow_server
+    client = connect(port)
+    client.sendall(encode_frame("1 healthCheck") + encode_frame("2 follow_logs"))
+    decoder = FrameDecoder()
+    frames = []
+    deadline = time.monotonic() + 5
+    while len(frames) < 2:
+        assert time.monotonic() < deadline
+        frames += decoder.feed(client.recv(65536))
+    assert frames[:2] == [b"1 alive", b"2 Following logs.\n"]
+
+    log(server, "framed record")
+    while not any(b"framed record" in frame for frame in frames):
+        frames += decoder.feed(client.recv(65536))
+    assert frames[-1].startswith(b"2 ")
@@ -0,0 +1,51 @@
+import time
+
+
+def _fast_loops(controller):
+    controller.MOVEMENT_TICK = 0.0005
+    controller.min_movement_duration = controller.max_movement_duration = 0.001
+    controller.min_break_duration = controller.max_break_duration = 0.0
+    controller.right_bumper_duration = controller.left_bumper_duration = 0.0
+    controller.delay_between_buttons = controller.anti_afk_interval = 0.0
+
+
+def test_movement_restarts_after_racing_stops(controller):
+    _fast_loops(controller)
+    for i in range(400):
+        controller.start_movement()
+        time.sleep(0.0001 * (i % 5))  # Let stops land at different points of a step
+        controller.stop_movement()
+
+    controller.start_movement()
+    assert controller.movement_enabled
+    time.sleep(0.02)
+    assert controller.mode == "movement"
+    assert not controller._movement_event.cancelled
+
+
+def test_anti_afk_restarts_after_racing_stops(controller):
+    _fast_loops(controller)
+    for i in range(400):
+        controller.start_anti_afk()
+        time.sleep(0.0001 * (i % 5))
+        controller.stop_anti_afk()
+
+    controller.start_anti_afk()
+    time.sleep(0.02)
+    assert controller.anti_afk_enabled
+    assert controller.mode == "anti_afk"
+    assert not controller._anti_afk_event.cancelled
+
+
+def test_restart_leaves_a_single_loop(controller):
+    _fast_loops(controller)
+    controller.min_break_duration = controller.max_break_duration = 10.0
+    controller.start_movement()
+    time.sleep(0.01)  # First phase done, the loop is in its break
+    controller.stop_movement()
+    controller.start_movement()
+    time.sleep(0.01)
+
+    pending = [event for _, _, event in controller.scheduler._heap
+               if not event.cancelled and getattr(event.callback, "__name__", "") == "_movement_phase"]
+    assert len(pending) == 1
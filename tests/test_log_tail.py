@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from zeus_server_app.log_tail import LogTailer
+
+
+def write(path, lines, mode="a"):
+    with open(path, mode) as f:
+        f.write("".join(f"{line}\n" for line in lines))
+
+
+@pytest.mark.parametrize("count", [1, 3, 4, 5, 8, 9, 19, 20, 50])
+def test_tail_across_stride_boundaries(tmp_path, count):
+    log_file = str(tmp_path / "server.log")
+    write(log_file, [f"line {i}" for i in range(20)])
+
+    lines = LogTailer(log_file, stride=4, chunk_size=7).tail(count).splitlines()
+
+    assert lines == [f"line {i}" for i in range(max(0, 20 - count), 20)]
+
+
+def test_appends_between_calls_extend_the_index(tmp_path):
+    log_file = str(tmp_path / "server.log")
+    tailer = LogTailer(log_file, stride=4)
+    write(log_file, [f"line {i}" for i in range(10)])
+    assert tailer.tail(2) == "line 8\nline 9\n"
+
+    write(log_file, [f"line {i}" for i in range(10, 13)])
+    assert tailer.tail(4) == "line 9\nline 10\nline 11\nline 12\n"
+    (index,) = tailer._indexes.values()
+    assert (index.lines, index.size) == (13, os.path.getsize(log_file))
+
+
+def test_partial_last_line(tmp_path):
+    log_file = str(tmp_path / "server.log")
+    tailer = LogTailer(log_file, stride=2)
+    with open(log_file, "w") as f:
+        f.write("one\ntwo\nthr")
+    assert tailer.tail(2) == "two\nthr\n"
+
+    with open(log_file, "a") as f:
+        f.write("ee\nfour\n")
+    assert tailer.tail(3) == "two\nthree\nfour\n"
+
+
+def test_tail_spans_rotated_segments(tmp_path):
+    log_file = str(tmp_path / "server.log")
+    tailer = LogTailer(log_file, stride=2)
+    write(log_file, ["old 1", "old 2", "old 3"])
+    assert tailer.tail(1) == "old 3\n"
+
+    # Rotate as RotatingFileHandler does: rename, then start a new file
+    os.rename(log_file, log_file + ".1")
+    os.utime(log_file + ".1", (1, 1))
+    write(log_file, ["new 1", "new 2"], mode="w")
+
+    assert tailer.tail(4) == "old 2\nold 3\nnew 1\nnew 2\n"
+    assert tailer.tail(10) == "old 1\nold 2\nold 3\nnew 1\nnew 2\n"
+
+    # The renamed segment keeps its index; deleted segments are forgotten
+    os.remove(log_file + ".1")
+    assert tailer.tail(10) == "new 1\nnew 2\n"
+    assert len(tailer._indexes) == 1
+
+
+def test_for_path_shares_one_tailer(tmp_path):
+    log_file = str(tmp_path / "server.log")
+    assert LogTailer.for_path(str(tmp_path / "." / "server.log")) is LogTailer.for_path(log_file)
+
+
+def test_tail_lines_reuses_one_tailer_per_path(tmp_path):
+    tail_lines = pytest.importorskip("zeus_server_app.utils", reason="the menu needs colorama").tail_lines
+    log_file = str(tmp_path / "server.log")
+    write(log_file, ["a", "b"])
+
+    assert tail_lines(log_file, 1) == "b\n"
+    tailer = LogTailer.for_path(log_file)
+    indexed = dict(tailer._indexes)
+
+    write(log_file, ["c"])
+    assert tail_lines(log_file, 2) == "b\nc\n"
+    assert tailer._indexes.keys() == indexed.keys()
@@ -0,0 +1,45 @@
+import pytest
+
+from zeus_server_app.gamepad_controller import GamepadController, MacroStep
+
+
+def test_compact_macro(controller):
+    steps = controller.parse_macro("dpad_down:100:50*2 wait:500 press_a")
+    assert steps == [
+        MacroStep("dpad_down", 0.1, 0.05),
+        MacroStep("dpad_down", 0.1, 0.05),
+        MacroStep(None, 0.5, 0.0),
+        MacroStep("a", GamepadController.MACRO_DEFAULT_HOLD, GamepadController.MACRO_DEFAULT_GAP),
+    ]
+
+
+def test_json_macro(controller):
+    steps = controller.parse_macro('[{"button": "rb", "hold_ms": 400, "gap_ms": 0, "repeat": 2}, {"wait_ms": 250}]')
+    assert steps == [MacroStep("rb", 0.4, 0.0), MacroStep("rb", 0.4, 0.0), MacroStep(None, 0.25, 0.0)]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "no steps"),
+    ("jump", "unknown button"),
+    ("a:x", "invalid timing"),
+    ("a:-5", "must not be negative"),
+    ("a*0", "repeat must be at least 1"),
+    ("wait", "invalid wait step"),
+    ("[1, 2]", "invalid step"),
+    ('[{"hold_ms": 100}]', "needs 'button' or 'wait_ms'"),
+    ("a*100000000", "more than 256 steps"),
+    ("a*200 b*57", "more than 256 steps"),
+    ("wait:61000", "limit is 60s"),
+])
+def test_invalid_macros(controller, text, message):
+    with pytest.raises(ValueError, match=message):
+        controller.parse_macro(text)
+
+
+def test_macro_presses_reach_the_driver(controller):
+    result = controller.run_macro(controller.parse_macro("a:30:0*3")).result(timeout=5)
+
+    assert [step["step"] for step in result["steps"]] == ["a", "a", "a"]
+    presses = [report.buttons for report in controller.gamepad.snapshot()]
+    a = int(GamepadController.MACRO_BUTTONS["a"])
+    assert presses == [a, 0, a, 0, a, 0]
@@ -0,0 +1,113 @@
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from zeus_server_app import __main__ as cli
+from zeus_server_app.__main__ import gamepad_count, load_settings, parse_args, run_headless, server_engine
+from zeus_server_app.config_manager import ConfigManager
+from zeus_server_app.gamepad_backend import RecordingBackend
+from zeus_server_app.hwid_manager import HWIDManager
+from zeus_server_app.log_pipeline import LogBroadcaster, setup_logging
+from zeus_server_app.server import CommandServer
+
+
+def test_engine_typo_in_config_file_exits_with_a_message(tmp_path):
+    config_file = tmp_path / "server.ini"
+    config_file.write_text("[server]\nengine = asyncoi\n")
+    settings = load_settings(parse_args(["--config", str(config_file)]))
+
+    with pytest.raises(ValueError, match="Unknown server engine 'asyncoi'. Expected one of: threaded, asyncio"):
+        server_engine(settings, ConfigManager(str(tmp_path / "test.db")))
+
+
+def test_engine_falls_back_to_the_database(tmp_path):
+    config = ConfigManager(str(tmp_path / "test.db"))
+    settings = load_settings(parse_args([]))
+    assert server_engine(settings, config) == "threaded"
+
+    config.set_config("server_engine", "asyncio")
+    assert server_engine(settings, config) == "asyncio"
+
+
+def test_gamepad_count_is_checked(tmp_path):
+    config = ConfigManager(str(tmp_path / "test.db"))
+    assert gamepad_count(load_settings(parse_args([])), config) == 1
+    assert gamepad_count(load_settings(parse_args(["--gamepads", "4"])), config) == 4
+
+    with pytest.raises(ValueError, match="Gamepad count must be between 1 and 64, got 0"):
+        gamepad_count(load_settings(parse_args(["--gamepads", "0"])), config)
+
+    config_file = tmp_path / "server.ini"
+    config_file.write_text("[server]\ngamepad_count = 100\n")
+    with pytest.raises(ValueError, match="got 100"):
+        gamepad_count(load_settings(parse_args(["--config", str(config_file)])), config)
+
+
+def test_main_reports_bad_settings_as_usage_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "setup_logging", lambda log_file: None)
+    monkeypatch.setattr(sys, "argv", ["zeus_server_app", "--db", str(tmp_path / "test.db"), "--gamepads", "0"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    assert exit_info.value.code == 2
+    assert "error: Gamepad count must be between 1 and 64, got 0." in capsys.readouterr().err
+
+
+def test_sigterm_drains_running_commands(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    hwid_manager = HWIDManager(db_path)
+    hwid_manager.add_hwid("test-hwid")
+    server = CommandServer(hwid_manager, ConfigManager(db_path), host="127.0.0.1", port=0,
+                           gamepad_count=1, gamepad_backend=RecordingBackend(),
+                           log_file=str(tmp_path / "server.log"), log_broadcaster=LogBroadcaster())
+    replies = []
+
+    def client():
+        while server.server_socket.getsockname()[1] == 0:
+            time.sleep(0.01)
+        port = server.server_socket.getsockname()[1]
+        for _ in range(100):
+            try:
+                conn = socket.create_connection(("127.0.0.1", port), timeout=5)
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.01)
+        with conn:
+            conn.sendall(b"test-hwid")
+            conn.recv(1024)
+            conn.sendall(b"macro a:300")
+            time.sleep(0.1)  # The macro is running
+            os.kill(os.getpid(), signal.SIGTERM)
+            replies.append(conn.recv(1024))
+
+    handlers = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+    thread = threading.Thread(target=client)
+    thread.start()
+    try:
+        assert run_headless(server, threading.Thread(target=server.start, daemon=True), drain_timeout=5)
+    finally:
+        signal.signal(signal.SIGINT, handlers[0])
+        signal.signal(signal.SIGTERM, handlers[1])
+    thread.join(5)
+
+    assert replies and replies[0].startswith(b"Executed macro: ")
+    assert not server.is_running
+
+
+def test_pipeline_stop_is_idempotent(tmp_path):
+    log_file = tmp_path / "server.log"
+    pipeline = setup_logging(str(log_file))
+    logging.info("before stop")
+
+    pipeline.stop()
+    pipeline.stop()
+
+    assert log_file.read_text().count("before stop") == 1
+    assert pipeline.queue_handler not in logging.getLogger().handlers
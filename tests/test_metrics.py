@@ -0,0 +1,47 @@
+import json
+
+from zeus_server_app.metrics import Histogram, escape_label
+
+
+def test_quantile_stays_finite():
+    histogram = Histogram()
+    histogram.observe(0.002)
+    histogram.observe(500.0)
+
+    assert histogram.quantile(0.5) == 0.0025
+    assert histogram.quantile(0.99) == histogram.bounds[-1]
+
+
+def test_escape_label():
+    assert escape_label('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+
+def test_only_known_commands_are_recorded(server):
+    server.process_command("healthCheck")
+    server.process_command("pad=1 tail_logs 5")
+    server.process_command('bogus"name\n')
+    server.process_command("pad=7 press_a")
+    server.process_command("pad=1")
+
+    assert sorted(server.metrics.commands) == ["healthCheck", "press_a", "tail_logs", "unknown"]
+    assert server.metrics.commands["unknown"].count == 2
+
+
+def test_slow_commands_render_as_valid_json(server):
+    server.metrics.observe_command("macro", 70.0)
+
+    snapshot = json.loads(server.metrics.render_json(server))
+    assert snapshot["commands"]["macro"]["p99_ms"] == 120000.0
+    assert "Infinity" not in server.metrics.render_json(server)
+
+
+def test_snapshot_does_not_keep_per_caller_state(server):
+    server.fleet.controllers[0].pad.set_left_trigger(10)
+    server.fleet.controllers[0].pad.flush()
+
+    first = server.metrics.snapshot(server)
+    server.metrics.render_prometheus(server)
+    second = server.metrics.snapshot(server)
+
+    assert first["pad_reports_sent"] == second["pad_reports_sent"] >= 1
+    assert "pad_reports_per_sec" not in second
@@ -0,0 +1,76 @@
+from zeus_server_app.gamepad_backend import RecordingPad, XUSB_BUTTON
+from zeus_server_app.pad_state import PadState
+
+A = XUSB_BUTTON.XUSB_GAMEPAD_A
+
+
+class ManualScheduler:
+    """Collects scheduled callbacks so tests decide when the tick runs."""
+
+    def __init__(self):
+        self.events = []
+
+    def call_at(self, deadline, callback, *args):
+        self.events.append((callback, args))
+
+    def run(self):
+        events, self.events = self.events, []
+        for callback, args in events:
+            callback(*args)
+
+
+def make_pad():
+    gamepad = RecordingPad()
+    scheduler = ManualScheduler()
+    return gamepad, scheduler, PadState(gamepad, scheduler)
+
+
+def test_changes_within_a_tick_are_sent_as_one_report():
+    gamepad, scheduler, pad = make_pad()
+    pad.set_left_stick(0.1, 0.2)
+    pad.set_left_stick(0.5, -0.5)
+    pad.set_right_trigger(200)
+    pad.press_button(A)
+    assert len(scheduler.events) == 1  # One flush queued for all four changes
+
+    scheduler.run()
+
+    reports = gamepad.snapshot()
+    assert len(reports) == 1
+    assert (reports[0].buttons, reports[0].right_trigger, reports[0].left_x, reports[0].left_y) == (int(A), 200, 0.5, -0.5)
+    assert pad.stats() == {"changes_requested": 4, "reports_sent": 1}
+
+
+def test_tap_within_a_tick_is_not_lost():
+    gamepad, scheduler, pad = make_pad()
+    pad.press_button(A)
+    pad.release_button(A)
+    scheduler.run()
+
+    assert [report.buttons for report in gamepad.snapshot()] == [int(A), 0]
+
+
+def test_release_and_press_within_a_tick_are_not_merged():
+    gamepad, scheduler, pad = make_pad()
+    pad.press_button(A)
+    scheduler.run()
+    pad.release_button(A)
+    pad.press_button(A)
+    scheduler.run()
+    pad.release_button(A)
+    scheduler.run()
+
+    assert [report.buttons for report in gamepad.snapshot()] == [int(A), 0, int(A), 0]
+
+
+def test_reset_only_reports_changed_fields():
+    gamepad, scheduler, pad = make_pad()
+    pad.reset()
+    scheduler.run()
+    assert gamepad.snapshot() == []
+
+    pad.set_left_trigger(255)
+    scheduler.run()
+    pad.reset()
+    scheduler.run()
+    assert [report.left_trigger for report in gamepad.snapshot()] == [255, 0]
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import pytest
+
+from zeus_server_app.config_manager import ConfigManager
+from zeus_server_app.profile_catalog import ProfileCatalog, parse_lnk, profile_dir_from_arguments
+
+SHORTCUTS = os.path.join(os.path.dirname(__file__), "fixtures", "shortcuts")
+CHROME = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+
+
+def read_shortcut(name):
+    with open(os.path.join(SHORTCUTS, name), "rb") as f:
+        return f.read()
+
+
+def test_parse_shortcut_with_profile():
+    fields = parse_lnk(read_shortcut("bot01.lnk"))
+
+    assert fields["target"] == CHROME
+    assert fields["arguments"] == '--profile-directory="Profile 3"'
+    assert fields["working_dir"] == "C:\\Program Files\\Google\\Chrome\\Application"
+    assert profile_dir_from_arguments(fields["arguments"]) == "Profile 3"
+
+
+def test_parse_shortcut_without_arguments():
+    fields = parse_lnk(read_shortcut("no profile.lnk"))
+
+    assert fields["target"] == CHROME
+    assert fields["arguments"] == ""
+    assert profile_dir_from_arguments(fields["arguments"]) is None
+
+
+def test_parse_unicode_shortcut():
+    fields = parse_lnk(read_shortcut("unicode.lnk"))
+
+    assert fields["target"] == "C:\\Users\\Zoë\\Chrome\\chrome.exe"
+    assert profile_dir_from_arguments(fields["arguments"]) == "Профиль 1"
+
+
+def test_parse_shortcut_without_link_info():
+    fields = parse_lnk(read_shortcut("relative only.lnk"))
+
+    assert fields["target"] is None
+    assert fields["relative_path"] == "Chrome\\chrome.exe"
+
+
+@pytest.mark.parametrize("data", [
+    read_shortcut("truncated.lnk"),
+    read_shortcut("bot01.lnk")[:100],
+    read_shortcut("not a shortcut.lnk"),
+    b"",
+])
+def test_corrupt_shortcuts_are_rejected(data):
+    with pytest.raises(ValueError):
+        parse_lnk(data)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    shortcuts = tmp_path / "shortcuts"
+    shutil.copytree(SHORTCUTS, str(shortcuts))
+    config_manager = ConfigManager(str(tmp_path / "test.db"))
+    config_manager.set_config("chrome_shortcuts_path", str(shortcuts))
+    return ProfileCatalog(config_manager), shortcuts
+
+
+def test_catalog_indexes_every_shortcut(catalog):
+    catalog, shortcuts = catalog
+    profiles = catalog.profiles()
+
+    assert [profile.name for profile in profiles] == [
+        "bot01", "bot02", "no profile", "not a shortcut", "relative only", "truncated", "unicode"]
+    by_name = {profile.name: profile for profile in profiles}
+    assert by_name["bot02"].profile_dir == "Default"
+    assert by_name["truncated"].exe_path is None
+    # Without a LinkInfo block the target is resolved against the shortcut's folder
+    assert by_name["relative only"].exe_path == os.path.normpath(os.path.join(str(shortcuts), "Chrome\\chrome.exe"))
+
+
+def test_catalog_selectors(catalog):
+    catalog, shortcuts = catalog
+
+    profiles, unmatched = catalog.select(["bot0*", "6", "BOT01.lnk", "missing"])
+
+    assert [profile.name for profile in profiles] == ["bot01", "bot02", "unicode"]
+    assert unmatched == ["missing"]
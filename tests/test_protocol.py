@@ -0,0 +1,114 @@
+import pytest
+
+import struct
+
+from zeus_server_app.protocol import (
+    ANALOG_SAMPLE, BINARY_REQUEST, MAX_ANALOG_SAMPLES, OP_ANALOG_SAMPLES, BinaryReplyDecoder,
+    BinaryRequestDecoder, FrameDecoder, FrameError, OP_TEXT, OPCODES, STATUS_ERROR, STATUS_OK,
+    decode_analog_samples, encode_analog_samples, encode_binary_reply, encode_binary_request, encode_frame,
+    encode_reply, is_framed, split_handshake, split_request,
+)
+
+
+def test_frames_split_across_reads():
+    data = encode_frame("1 press_a") + encode_frame("2 healthCheck") + encode_frame("")
+    decoder = FrameDecoder()
+
+    frames = []
+    for index in range(0, len(data), 3):
+        frames += decoder.feed(data[index:index + 3])
+
+    assert frames == [b"1 press_a", b"2 healthCheck", b""]
+
+
+def test_oversized_frame_is_rejected():
+    with pytest.raises(FrameError):
+        FrameDecoder(max_frame_size=8).feed(encode_frame("1 too long for the limit"))
+
+
+def test_handshake_with_pipelined_frames():
+    frames = encode_frame("1 press_a")
+    hwid, pending = split_handshake(b"HWID-1234" + frames)
+
+    assert hwid == "HWID-1234"
+    assert is_framed(pending)
+    assert FrameDecoder().feed(pending) == [b"1 press_a"]
+    assert split_handshake(b"HWID-1234\n") == ("HWID-1234", b"")
+    assert not is_framed(b"press_a")
+
+
+def test_request_and_reply_payloads():
+    assert split_request("17 macro a b ".encode()) == ("17", "macro a b")
+    assert FrameDecoder().feed(encode_reply("17", "Executed command: press_a")) == [b"17 Executed command: press_a"]
+
+
+def test_binary_requests_split_across_reads():
+    data = (encode_binary_request(0x10, 1, pad=3)
+            + encode_binary_request(OP_TEXT, 2, text="pads")
+            + encode_binary_request(0x01, 70000))
+    decoder = BinaryRequestDecoder()
+
+    requests = []
+    for index in range(len(data)):
+        requests += decoder.feed(data[index:index + 1])
+
+    assert requests == [(0x10, 3, 1, None), (OP_TEXT, 0, 2, "pads"), (0x01, 0, 70000 & 0xFFFF, None)]
+
+
+def test_binary_text_request_waits_for_its_body():
+    data = encode_binary_request(OP_TEXT, 5, text="macro a b")
+    decoder = BinaryRequestDecoder()
+    assert decoder.feed(data[:-1]) == []
+    assert decoder.feed(data[-1:]) == [(OP_TEXT, 0, 5, "macro a b")]
+
+
+def test_analog_samples_round_trip():
+    data = encode_analog_samples(9, [(0, 0.5, -1.0, 0.0, 1.0, 0.0, 1.0), (16, -0.25, 0.0, 0.0, 0.0, 0.5, 0.0)], pad=2)
+    ((opcode, pad, request_id, samples),) = BinaryRequestDecoder().feed(data)
+
+    assert (opcode, pad, request_id) == (OP_ANALOG_SAMPLES, 2, 9)
+    assert [at for at, values in samples] == [0.0, 0.016]
+    assert samples[0][1] == pytest.approx({"lx": 0.5, "ly": -1.0, "rx": 0.0, "ry": 1.0, "lt": 0.0, "rt": 1.0}, abs=1e-4)
+    assert samples[1][1]["lt"] == pytest.approx(0.5, abs=0.01)
+
+
+def test_analog_batch_waits_for_its_last_sample():
+    data = encode_analog_samples(1, [(ms, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0) for ms in range(3)])
+    decoder = BinaryRequestDecoder()
+
+    assert decoder.feed(data[:-1]) == []
+    ((_, _, _, samples),) = decoder.feed(data[-1:])
+    assert len(samples) == 3
+
+
+def test_analog_batch_over_the_limit_is_rejected():
+    header = BINARY_REQUEST.pack(OP_ANALOG_SAMPLES, 0, 1) + struct.pack(">H", MAX_ANALOG_SAMPLES + 1)
+    with pytest.raises(FrameError, match="exceeds limit"):
+        BinaryRequestDecoder().feed(header)  # Rejected from the count, before the samples arrive
+
+    with pytest.raises(FrameError, match="exceeds limit"):
+        decode_analog_samples(bytes(ANALOG_SAMPLE.size * (MAX_ANALOG_SAMPLES + 1)))
+    assert len(decode_analog_samples(bytes(ANALOG_SAMPLE.size * MAX_ANALOG_SAMPLES))) == MAX_ANALOG_SAMPLES
+
+
+def test_truncated_analog_payload_is_rejected():
+    with pytest.raises(FrameError, match="partial"):
+        decode_analog_samples(bytes(ANALOG_SAMPLE.size + 3))
+
+
+def test_unknown_opcode_is_rejected():
+    unused = next(opcode for opcode in range(256) if opcode not in OPCODES and opcode not in (OP_TEXT, 0x20))
+    with pytest.raises(FrameError):
+        BinaryRequestDecoder().feed(bytes([unused, 0, 0, 1]))
+
+
+def test_binary_replies_round_trip():
+    data = encode_binary_reply(1, STATUS_OK) + encode_binary_reply(2, STATUS_ERROR, "unknown command")
+    decoder = BinaryReplyDecoder()
+    assert decoder.feed(data[:9]) == [(1, STATUS_OK, "")]
+    assert decoder.feed(data[9:]) == [(2, STATUS_ERROR, "unknown command")]
+
+
+def test_oversized_binary_reply_is_rejected():
+    with pytest.raises(FrameError):
+        BinaryReplyDecoder(max_body_size=4).feed(encode_binary_reply(1, STATUS_OK, "too long"))
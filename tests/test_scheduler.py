@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from zeus_server_app.scheduler import InputScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = InputScheduler()
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+def test_events_run_in_deadline_order(scheduler):
+    ran = []
+    done = threading.Event()
+    now = time.monotonic()
+    scheduler.call_at(now + 0.02, ran.append, "second")
+    scheduler.call_at(now + 0.01, ran.append, "first")
+    scheduler.call_at(now + 0.03, done.set)
+
+    assert done.wait(2)
+    assert ran == ["first", "second"]
+
+
+def test_cancelled_event_does_not_run(scheduler):
+    ran = []
+    done = threading.Event()
+    scheduler.call_later(0.01, ran.append, "cancelled").cancel()
+    scheduler.call_later(0.02, done.set)
+
+    assert done.wait(2)
+    assert ran == []
+
+
+def test_stop_fails_the_futures_of_discarded_events(scheduler):
+    future = Future()
+    scheduler.call_later(60, lambda value, future: future.set_result(value), 1, future)
+
+    scheduler.stop()
+
+    with pytest.raises(RuntimeError, match="scheduler stopped"):
+        future.result(timeout=1)
+
+
+def test_events_queued_after_stop_fail_their_futures(scheduler):
+    scheduler.stop()
+    future = Future()
+    scheduler.call_soon(lambda future: future.set_result(None), future)
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=1)
+
+
+def test_waiting_macro_is_released_when_the_scheduler_stops(server):
+    replies = []
+    client = threading.Thread(target=lambda: replies.append(server.process_command("macro a:5000")))
+    client.start()
+    time.sleep(0.1)
+
+    server.fleet.scheduler.stop()
+    client.join(2)
+
+    assert not client.is_alive()
+    assert replies == ["Failed to execute command: macro (input scheduler stopped)"]
@@ -0,0 +1,48 @@
+from zeus_server_app.gamepad_controller import GamepadController
+import asyncio
+
+from zeus_server_app.protocol import COMMAND_OPCODES, OP_TEXT, STATUS_ERROR, STATUS_OK
+
+
+def test_every_gamepad_command_has_a_controller_method():
+    for command in GamepadController.GAMEPAD_COMMANDS:
+        assert callable(getattr(GamepadController, command, None)), command
+
+
+def test_press_trigger(server):
+    assert server.process_command("pad=1 press_rt") == "Executed command: press_rt"
+
+    reports = server.fleet.get(1).gamepad.snapshot()
+    assert [report.right_trigger for report in reports] == [255, 0]
+
+
+def test_binary_trigger_opcodes(server):
+    assert server.process_binary(COMMAND_OPCODES["press_lt"], 0, None) == (STATUS_OK, "")
+
+    reports = server.fleet.get(0).gamepad.snapshot()
+    assert [report.left_trigger for report in reports] == [255, 0]
+
+
+def test_failed_press_is_an_error(server, monkeypatch):
+    monkeypatch.setattr(server.fleet.get(0), "execute_gamepad_command", lambda command: None)
+
+    assert server.process_command("press_a") == "Failed to execute command: press_a"
+    assert server.process_binary(COMMAND_OPCODES["press_a"], 0, None) == (
+        STATUS_ERROR, "Failed to execute command: press_a")
+
+
+def test_invalid_macro_is_an_error_in_the_binary_protocol(server):
+    text_reply = server.process_command('macro [{"hold_ms": 100}]')
+    assert text_reply.startswith("Invalid macro: ")
+
+    status, reply = server.process_binary(OP_TEXT, 1, 'macro [{"hold_ms": 100}]')
+    assert (status, reply) == (STATUS_ERROR, text_reply)
+    assert asyncio.run(server.process_binary_async(OP_TEXT, 1, 'macro [{"hold_ms": 100}]')) == (STATUS_ERROR, text_reply)
+
+
+def test_bad_pad_and_argument_replies_are_errors(server):
+    assert server.process_binary(OP_TEXT, 0, "pad=9 press_a")[0] == STATUS_ERROR
+    assert server.process_binary(OP_TEXT, 0, "tail_logs many")[0] == STATUS_ERROR
+    assert server.process_binary(OP_TEXT, 0, "job 42")[0] == STATUS_ERROR
+    assert server.process_binary(OP_TEXT, 0, "analog 0:lx=2")[0] == STATUS_ERROR
+    assert server.process_binary(OP_TEXT, 0, "pads")[0] == STATUS_OK
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+ENGINES = ["threaded", "asyncio"]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def read_until_closed(client):
+    data = b""
+    while True:
+        chunk = client.recv(1024)
+        if not chunk:
+            return data
+        data += chunk
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_connections_over_the_limit_are_rejected(live_server, connect, engine):
+    server, port = live_server(engine, max_connections=2)
+    clients = [connect(port), connect(port)]
+
+    rejected = connect(port, hwid=None)
+    assert read_until_closed(rejected) == server.CAPACITY_REPLY.encode()
+    assert server.connection_status() == {"active": 2, "max": 2, "rejected": 1}
+    assert server.metrics.snapshot(server)["connections_rejected"] == 1
+
+    # A slot frees up once a client leaves
+    clients.pop().close()
+    wait_for(lambda: server.connection_status()["active"] == 1)
+    connect(port)
+    assert server.connection_status() == {"active": 2, "max": 2, "rejected": 1}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_client_without_a_handshake_is_closed(live_server, connect, engine):
+    server, port = live_server(engine, handshake_timeout=0.2)
+    client = connect(port, hwid=None)
+
+    started = time.monotonic()
+    assert read_until_closed(client) == b""
+    assert time.monotonic() - started < 3
+    wait_for(lambda: server.connection_status()["active"] == 0)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_idle_client_is_closed(live_server, connect, engine):
+    server, port = live_server(engine, idle_timeout=0.3)
+    client = connect(port)
+    client.sendall(b"healthCheck")
+    assert client.recv(1024) == b"alive"
+
+    started = time.monotonic()
+    assert read_until_closed(client) == b""
+    assert 0.2 < time.monotonic() - started < 3
+    wait_for(lambda: server.connection_status()["active"] == 0)
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from zeus_server_app.protocol import (
+    BINARY_ENABLED_REPLY, COMMAND_OPCODES, OP_TEXT, STATUS_ERROR, STATUS_OK, BinaryReplyDecoder, FrameDecoder,
+    encode_binary_request, encode_frame,
+)
+
+ENGINES = ["threaded", "asyncio"]
+
+
+@pytest.fixture(params=ENGINES)
+def engine_server(request, live_server):
+    return live_server(request.param)
+
+
+def receive(client, decoder, count, timeout=5.0):
+    """Read until `decoder` has produced `count` items."""
+    items = []
+    deadline = time.monotonic() + timeout
+    while len(items) < count:
+        assert time.monotonic() < deadline, f"got {items!r}"
+        items += decoder.feed(client.recv(65536))
+    return items
+
+
+def test_unknown_hwid_is_refused(engine_server, connect):
+    server, port = engine_server
+    client = connect(port, hwid=None)
+    client.sendall(b"not-whitelisted")
+
+    assert client.recv(1024) == b"HWID not authorized."
+    assert client.recv(1024) == b""
+    assert server.metrics.handshakes_rejected == 1
+
+
+def test_text_commands(engine_server, connect):
+    server, port = engine_server
+    client = connect(port)
+
+    for command, reply in [(b"healthCheck", b"alive"),
+                           (b"pad=1 press_rt", b"Executed command: press_rt"),
+                           (b"pad=5 press_a", b"Unknown pad '5'. Valid pads: 0-1."),
+                           (b"bogus", b"unknown command")]:
+        client.sendall(command)
+        assert client.recv(65536) == reply
+
+    # The running fleet may have sent neutral reports before the press
+    assert [report.right_trigger for report in server.fleet.get(1).gamepad.snapshot()][-2:] == [255, 0]
+
+
+def test_framed_commands_pipelined_behind_the_handshake(engine_server, connect):
+    server, port = engine_server
+    client = connect(port, hwid=None)
+    client.sendall(b"test-hwid" + b"".join(encode_frame(f"{request_id} {command}") for request_id, command in [
+        ("a1", "press_a"), ("a2", "pad=1 press_b"), ("a3", "healthCheck"), ("a4", "bogus"), ("a5", "press_x"),
+    ]))
+
+    assert client.recv(len(b"HWID authorized.")) == b"HWID authorized."
+    replies = dict(frame.decode().split(" ", 1) for frame in receive(client, FrameDecoder(), 5))
+    assert replies == {
+        "a1": "Executed command: press_a",
+        "a2": "Executed command: press_b",
+        "a3": "alive",
+        "a4": "unknown command",
+        "a5": "Executed command: press_x",
+    }
+
+
+def test_framed_replies_keep_request_order(engine_server, connect):
+    server, port = engine_server
+    client = connect(port)
+    commands = ["press_a", "pads", "press_b", "connections", "press_y"]
+    client.sendall(b"".join(encode_frame(f"{index} {command}") for index, command in enumerate(commands)))
+
+    frames = receive(client, FrameDecoder(), len(commands))
+    assert [frame.split(b" ", 1)[0] for frame in frames] == [b"0", b"1", b"2", b"3", b"4"]
+
+
+def test_binary_protocol(engine_server, connect):
+    server, port = engine_server
+    client = connect(port)
+    client.sendall(b"binary")
+    assert client.recv(len(BINARY_ENABLED_REPLY)) == BINARY_ENABLED_REPLY.encode()
+
+    client.sendall(encode_binary_request(COMMAND_OPCODES["press_a"], 1, pad=1)
+                   + encode_binary_request(OP_TEXT, 2, text="healthCheck")
+                   + encode_binary_request(OP_TEXT, 3, text='macro [{"hold_ms": 100}]')
+                   + encode_binary_request(COMMAND_OPCODES["press_b"], 4, pad=9))
+
+    replies = receive(client, BinaryReplyDecoder(), 4)
+    assert replies[:2] == [(1, STATUS_OK, ""), (2, STATUS_OK, "alive")]
+    assert replies[2][:2] == (3, STATUS_ERROR) and replies[2][2].startswith("Invalid macro: ")
+    assert replies[3] == (4, STATUS_ERROR, "Unknown pad '9'. Valid pads: 0-1.")
@@ -0,0 +1,30 @@
+import threading
+
+from zeus_server_app.storage import Database
+
+
+def test_exited_threads_release_their_connections(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.execute("CREATE TABLE config (key TEXT PRIMARY KEY, value TEXT)")
+
+    def query():
+        db.query_one("SELECT value FROM config WHERE key = ?", ("stagger",))
+
+    for _ in range(200):
+        thread = threading.Thread(target=query)
+        thread.start()
+        thread.join()
+
+    assert len(db._connections) <= 2  # This thread's, and at most one thread still finishing
+    db.close()
+
+
+def test_close_reopens_on_next_use(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.execute("CREATE TABLE t (v INTEGER)")
+    db.close()
+
+    db.execute("INSERT INTO t VALUES (1)")
+    assert db.query_one("SELECT v FROM t") == (1,)
+    assert len(db._connections) == 1
+    db.close()